@@ -0,0 +1,120 @@
+"""bench_ping
+
+Benchmark for the url checks of ping (PingEngine/t_probe_url) using a
+local stand-in server (see test/standin_server.py) instead of the
+internet, such that results are reproducible without network access.
+
+Run from the project folder:
+
+    python3 -m bench.bench_ping
+
+Each case checks the same number of urls with the given server
+behaviour and reports the throughput (urls per second, concurrent
+checks as done by ping), the latency of single checks (median and 95th
+percentile in milliseconds), the connections opened, and the body
+bytes sent by the server.
+
+Real servers may be recorded once and replayed offline:
+
+    python3 -m bench.bench_ping --record recording.json < urls.txt
+    python3 -m bench.bench_ping --replay recording.json
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from lib import PingEngine, HttpPool, t_probe_url
+from test.standin_server import StandinServer, Recording
+
+_N_URLS = 200
+_N_WORKERS = 16
+_N_PER_HOST = 8
+
+_LT_CASES = [
+    ('ok', '/page/{0}'),
+    ('HEAD not supported', '/page/{0}?nohead=1'),
+    ('redirect (2)', '/page/{0}?redirect=2'),
+    ('not found', '/page/{0}?status=404'),
+    ('slow (50 ms)', '/page/{0}?delay=0.05'),
+    ('large body', '/page/{0}?size=5000000'),
+    ('large body, no HEAD/Range', '/page/{0}?nohead=1&norange=1&size=5000000'),
+    ('connection reset', '/page/{0}?reset=1'),
+]
+
+
+def t_measure(o_server, ls_urls: list) -> tuple:
+    """
+    return (urls per second, median latency, 95th percentile latency,
+    connections, bytes sent) for checking the given urls
+    """
+    o_server.reset_counts()
+    o_engine = PingEngine(
+        _N_WORKERS, _N_PER_HOST, 5.0, 5.0, n_retries=0, n_host_failures=0)
+    f_start = time.perf_counter()
+    for _ in o_engine.it_probe_all(ls_urls):
+        pass
+    f_rate = len(ls_urls) / (time.perf_counter() - f_start)
+    n_connects = o_server.n_connects
+    n_bytes = o_server.n_bytes_sent
+
+    o_pool = HttpPool()
+    lf_latency = []
+    for s_url in ls_urls[:50]:
+        f_start = time.perf_counter()
+        t_probe_url(s_url, 5.0, 5.0, o_pool=o_pool)
+        lf_latency.append((time.perf_counter() - f_start) * 1000.0)
+    o_pool.close_all()
+    lf_latency.sort()
+    return (
+        f_rate, statistics.median(lf_latency),
+        lf_latency[int(len(lf_latency) * 0.95) - 1], n_connects, n_bytes)
+
+
+def print_result(s_label: str, t_result: tuple) -> None:
+    """
+    output a line of results
+    """
+    print('{0:<28}{1:>10.1f}{2:>10.2f}{3:>10.2f}{4:>8}{5:>12}'.format(
+        s_label, *t_result))
+
+
+def main() -> None:
+    """
+    run all cases (or the replay) and output results
+    """
+    o_parser = argparse.ArgumentParser(description=__doc__.split('\n')[2])
+    o_parser.add_argument(
+        '--record', metavar='FILE',
+        help='record the urls read from stdin into FILE')
+    o_parser.add_argument(
+        '--replay', metavar='FILE', help='check the urls recorded in FILE')
+    args = o_parser.parse_args()
+
+    if args.record:
+        o_recording = Recording()
+        o_recording.record(
+            [s_line.strip() for s_line in sys.stdin if s_line.strip()])
+        o_recording.save(args.record)
+        print('{0} urls recorded'.format(len(o_recording.ls_urls)))
+        return
+
+    print('{0:<28}{1:>10}{2:>10}{3:>10}{4:>8}{5:>12}'.format(
+        'case', 'urls/s', 'p50 [ms]', 'p95 [ms]', 'conns', 'bytes'))
+    if args.replay:
+        o_recording = Recording.o_load(args.replay)
+        with StandinServer(o_recording) as o_server:
+            print_result('replay', t_measure(o_server, [
+                o_server.s_url_for(s_url) for s_url in o_recording.ls_urls]))
+        return
+
+    with StandinServer() as o_server:
+        for s_label, s_path in _LT_CASES:
+            print_result(s_label, t_measure(o_server, [
+                o_server.s_url(s_path.format(i_url))
+                for i_url in range(_N_URLS)]))
+
+
+if __name__ == "__main__":
+    main()
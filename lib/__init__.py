@@ -6,10 +6,31 @@ from .metadata_check_tools import s_check_for_valid_file
 from .metadata_check_tools import s_url_is_alive
 from .metadata_check_tools import s_trim
 from .metadata_check_tools import s_check_url
-from .metadata_check_tools import s_check_date
+from .metadata_check_tools import b_is_valid_domain
+from .metadata_date_tools import s_check_date, s_format_date
+from .metadata_date_tools import s_format_day, s_format_month
+from .metadata_date_tools import ls_format_dates
 from .metadata_check_tools import s_make_filename
 from .metadata_check_tools import b_files_exist
 from .metadata_check_tools import b_is_valid_path
 from .metadata_check_tools import s_fix_url_for_html
 from .metadata_check_tools import s_make_backup_filename
+from .metadata_http_tools import t_probe_url, b_is_dead
+from .metadata_http_tools import I_STATUS_UNKNOWN_HOST
+from .metadata_export_tools import b_write_gzip, LS_EXPORT_FORMATS
 from .class_tagstring import *
+from .class_archiveindex import ArchiveIndex
+from .class_atomicfile import AtomicFile
+from .class_htmltemplate import HtmlTemplate
+from .class_fragmentcache import FragmentCache
+from .class_listsinks import List1Sink, List2Sink, List3Sink, n_scan
+from .class_listsinks import List1YearSink
+from .class_searchindex import SearchIndex
+from .class_publishmanifest import PublishManifest
+from .class_archivemanifest import ArchiveManifest
+from .class_dnscache import DnsCache
+from .class_httppool import HttpPool
+from .class_pingengine import PingEngine, I_STATUS_SKIPPED
+from .class_urlstatus import UrlStatusCache
+from .class_pingscheduler import PingScheduler
+from .class_pingqueue import PingQueue
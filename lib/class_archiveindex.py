@@ -0,0 +1,122 @@
+""" class_archiveindex
+
+    implements an index of the file names in the archive folder such
+    that checking the reference copies of all records needs a single
+    read of the folder instead of one glob per record (the folder may
+    be a slow network or cloud mount).
+
+    Names are kept sorted per folder; exact names are found by binary
+    search, patterns (*, ?, [...]) by binary search for the part in
+    front of the first wildcard and matching the names in that range,
+    with the same results as glob.
+
+    The names may be given in advance (see ArchiveManifest) such that
+    the archive folder is not read at all.
+"""
+
+import bisect
+import glob
+import os
+from fnmatch import fnmatchcase
+
+
+def s_literal_prefix(s_pattern: str) -> str:
+    """
+    return the part of a glob pattern in front of the first wildcard
+
+    >>> s_literal_prefix('2020*_?.pdf')
+    '2020'
+
+    """
+    for i_pos, s_char in enumerate(s_pattern):
+        if s_char in '*?[':
+            return s_pattern[:i_pos]
+    return s_pattern
+
+
+class ArchiveIndex:
+    """ Sorted names per folder below the archive folder.
+
+        _s_root             archive folder
+
+        _dls_names          sorted names per folder (relative to the
+                            archive folder), read when first needed
+
+        _n_scans            number of folders read so far
+
+        _b_complete         all folders are given in _dls_names, i.e.
+                            folders not given do not exist
+    """
+
+    def __init__(self, s_root: str, dls_names=None):
+        """
+        initialize index for the given folder, empty or with the
+        sorted names for all folders (relative to s_root)
+        """
+        self._s_root = s_root
+        self._b_complete = dls_names is not None
+        self._dls_names = dict() if dls_names is None else dls_names
+        self._n_scans = 0
+
+    def n_get_scans(self) -> int:
+        """
+        return the number of folders read so far
+        """
+        return self._n_scans
+
+    def ls_get_names(self, s_folder='') -> list:
+        """
+        return the sorted names in the given folder (relative to the
+        archive folder), or an empty list if it cannot be read
+        """
+        ls_names = self._dls_names.get(s_folder)
+        if ls_names is None and self._b_complete:
+            return []
+        if ls_names is None:
+            self._n_scans += 1
+            try:
+                with os.scandir(
+                        os.path.join(self._s_root, s_folder)) as o_entries:
+                    ls_names = sorted(o_entry.name for o_entry in o_entries)
+            except OSError:
+                ls_names = []
+            self._dls_names[s_folder] = ls_names
+        return ls_names
+
+    def b_files_exist(self, s_file: str) -> bool:
+        """
+        Given a filename or a search pattern relative to the archive
+        folder, check if the file exists or if there are files
+        matching the pattern (see b_files_exist)
+        """
+        s_folder, s_name = os.path.split(s_file)
+        if glob.has_magic(s_folder):
+            return len(glob.glob(os.path.join(self._s_root, s_file))) > 0
+        if not s_name:
+            if self._b_complete:
+                return s_folder.strip('/') in self._dls_names
+            return os.path.isdir(os.path.join(self._s_root, s_folder))
+
+        ls_names = self.ls_get_names(s_folder)
+        if not glob.has_magic(s_name):
+            i_pos = bisect.bisect_left(ls_names, s_name)
+            return i_pos < len(ls_names) and ls_names[i_pos] == s_name
+
+        # glob does not match hidden files with wildcards
+
+        s_prefix = s_literal_prefix(s_name)
+        b_hidden = s_name.startswith('.')
+        for i_pos in range(
+                bisect.bisect_left(ls_names, s_prefix), len(ls_names)):
+            s_candidate = ls_names[i_pos]
+            if not s_candidate.startswith(s_prefix):
+                break
+            if (b_hidden or not s_candidate.startswith('.')) \
+                    and fnmatchcase(s_candidate, s_name):
+                return True
+        return False
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
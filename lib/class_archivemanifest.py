@@ -0,0 +1,283 @@
+""" class_archivemanifest
+
+    implements a manifest of the archive folder (including subfolders)
+    stored in the database: path, size, modification time, access
+    rights and (optionally, see metadata_hash_tools) a content hash of
+    each entry.
+
+    The manifest is refreshed incrementally: a folder whose modification
+    time did not change since it was read last is not read again (its
+    subfolders are still visited, as changes in a subfolder do not
+    change the modification time of its parent). Entries of folders
+    read again are compared with the manifest by their stat results;
+    changed entries lose their content hash. A full refresh reads all
+    folders again, which also detects files rewritten in place.
+
+    The table is not touched by load, i.e. the manifest survives
+    reloading the metadata.
+"""
+
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .class_archiveindex import ArchiveIndex
+from .metadata_params import ConfigParams as CP
+
+# seconds a folder must have been unchanged when it was read such that
+# changes within the same tick of the file system clock are not missed
+
+_F_RACY_SECONDS = 2.0
+
+# number of entries whose stat is read concurrently (the archive folder
+# may be a network or cloud mount with a high latency per syscall)
+
+_N_STAT_WORKERS = 8
+
+
+def s_join(s_folder: str, s_name: str) -> str:
+    """
+    return the manifest path of a name in a folder
+
+    >>> s_join('', 'a.pdf'), s_join('2020', 'a.pdf')
+    ('a.pdf', '2020/a.pdf')
+
+    """
+    return s_folder + '/' + s_name if s_folder else s_name
+
+
+def _t_stat(o_entry, b_dir: bool) -> tuple:
+    """
+    return (size, mtime_ns, mode, uid, gid) of a folder entry with a
+    single stat; (0, 0, 0, -1, -1) if it cannot be read
+    """
+    try:
+        o_stat = o_entry.stat()
+    except OSError:
+        return (0, 0, 0, -1, -1)
+    return (
+        0 if b_dir else o_stat.st_size, o_stat.st_mtime_ns,
+        o_stat.st_mode, o_stat.st_uid, o_stat.st_gid)
+
+
+class ArchiveManifest:
+    """ Entries of the archive folder as stored in the database.
+
+        _o_dbconn           database connection
+
+        _s_root             archive folder
+
+        _dt_entries         per path: (folder, is_dir, size, mtime_ns,
+                            mode, uid, gid, hash, scanned) where folder
+                            is the path of the parent folder (None for
+                            the archive folder itself, path '') and
+                            scanned the time the folder was read last
+
+        _dss_children       per folder: paths of its entries
+    """
+
+    def __init__(self, o_dbconn, s_root: str):
+        """ create table if necessary and load all entries """
+        self._o_dbconn = o_dbconn
+        self._s_root = s_root
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.ARCHIVE_TABLE + ' ('
+            'path TEXT PRIMARY KEY NOT NULL, '
+            'folder TEXT, '
+            'is_dir INT NOT NULL, '
+            'size INT, '
+            'mtime_ns INT, '
+            'mode INT, '
+            'uid INT, '
+            'gid INT, '
+            'hash TEXT, '
+            'scanned REAL);')
+        self._o_dbconn.commit()
+        self._dt_entries = {
+            t_row[0]: t_row[1:] for t_row in self._o_dbconn.execute(
+                'SELECT path, folder, is_dir, size, mtime_ns, mode, uid, '
+                'gid, hash, scanned FROM ' + CP.ARCHIVE_TABLE + ';')}
+        self._dss_children = dict()
+        for s_path, t_entry in self._dt_entries.items():
+            if t_entry[1]:
+                self._dss_children.setdefault(s_path, set())
+            if t_entry[0] is not None:
+                self._dss_children.setdefault(t_entry[0], set()).add(s_path)
+
+    def refresh(self, b_full=False, n_workers=_N_STAT_WORKERS) -> tuple:
+        """
+        update the manifest from the archive folder, reading only
+        folders changed since the last refresh unless b_full; the
+        entries of a folder are stat'ed by n_workers threads;
+        returns (number of folders read, number of entries changed)
+        """
+        with ThreadPoolExecutor(max_workers=n_workers) as o_pool:
+            return self._t_refresh(b_full, o_pool)
+
+    def _t_refresh(self, b_full: bool, o_pool) -> tuple:
+        """
+        update the manifest (see refresh) using the given thread pool
+        """
+        f_now = time.time()
+        n_read = 0
+        n_changed = 0
+        ls_removed = []
+        ss_write = set()
+
+        ls_folders = ['']
+        while ls_folders:
+            s_folder = ls_folders.pop()
+            try:
+                o_stat = os.stat(os.path.join(self._s_root, s_folder))
+            except OSError:
+                o_stat = None
+            if o_stat is None or not stat.S_ISDIR(o_stat.st_mode):
+                if s_folder == '':
+                    ls_removed.extend(self._ls_remove_tree(s_folder))
+                continue
+
+            t_entry = self._dt_entries.get(s_folder)
+            if not b_full and t_entry is not None \
+                    and t_entry[3] == o_stat.st_mtime_ns \
+                    and t_entry[8] - o_stat.st_mtime > _F_RACY_SECONDS:
+                ls_folders.extend(
+                    s_path for s_path in self._dss_children.get(
+                        s_folder, ()) if self._dt_entries[s_path][1])
+                continue
+
+            n_read += 1
+            ss_found = set()
+            lt_stat = []
+            try:
+                with os.scandir(
+                        os.path.join(self._s_root, s_folder)) as o_entries:
+                    for o_entry in o_entries:
+                        s_path = s_join(s_folder, o_entry.name)
+                        ss_found.add(s_path)
+                        b_dir = o_entry.is_dir(follow_symlinks=False)
+                        t_old = self._dt_entries.get(s_path)
+                        if b_dir:
+                            ls_folders.append(s_path)
+                            if t_old is not None and t_old[1]:
+                                continue
+                        elif t_old is not None and t_old[1]:
+                            ls_removed.extend(self._ls_remove_tree(s_path))
+                        lt_stat.append((s_path, b_dir, o_entry))
+            except OSError:
+                pass
+
+            # one stat per entry, concurrently, merged in folder order
+
+            for (s_path, b_dir, _), t_stat in zip(lt_stat, o_pool.map(
+                    lambda t_item: _t_stat(t_item[2], t_item[1]), lt_stat)):
+                if self._b_update(s_path, s_folder, b_dir, t_stat, f_now):
+                    n_changed += 1
+                    ss_write.add(s_path)
+
+            for s_path in self._dss_children.get(s_folder, set()) - ss_found:
+                ls_removed.extend(self._ls_remove_tree(s_path))
+                n_changed += 1
+            self._dss_children[s_folder] = ss_found
+
+            t_old = self._dt_entries.get(s_folder)
+            self._dt_entries[s_folder] = (
+                None if s_folder == '' else t_old[0],
+                1, 0, o_stat.st_mtime_ns, o_stat.st_mode, o_stat.st_uid,
+                o_stat.st_gid, None, f_now)
+            ss_write.add(s_folder)
+
+        with self._o_dbconn:
+            self._o_dbconn.executemany(
+                'DELETE FROM ' + CP.ARCHIVE_TABLE + ' WHERE path = ?;',
+                ((s_path,) for s_path in ls_removed))
+            self._o_dbconn.executemany(
+                'INSERT OR REPLACE INTO ' + CP.ARCHIVE_TABLE
+                + ' (path, folder, is_dir, size, mtime_ns, mode, uid, gid, '
+                'hash, scanned) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);',
+                ((s_path,) + self._dt_entries[s_path]
+                 for s_path in ss_write if s_path in self._dt_entries))
+        return (n_read, n_changed)
+
+    def _b_update(
+            self, s_path: str, s_folder: str, b_dir: bool, t_stat: tuple,
+            f_now: float) -> bool:
+        """
+        update entry from its stat result (see _t_stat); returns True
+        if changed
+        """
+        t_old = self._dt_entries.get(s_path)
+        if t_old is not None and t_old[1] == int(b_dir) \
+                and t_old[2:7] == t_stat:
+            return False
+        self._dt_entries[s_path] = \
+            (s_folder, int(b_dir)) + t_stat + (None, 0.0 if b_dir else f_now)
+        return True
+
+    def _ls_remove_tree(self, s_path: str) -> list:
+        """
+        remove entry and all entries below it; returns their paths
+        """
+        ls_removed = []
+        ls_paths = [s_path]
+        while ls_paths:
+            s_next = ls_paths.pop()
+            t_entry = self._dt_entries.pop(s_next, None)
+            if t_entry is None:
+                continue
+            ls_removed.append(s_next)
+            ls_paths.extend(self._dss_children.pop(s_next, ()))
+        return ls_removed
+
+    def t_get_entry(self, s_path: str) -> tuple:
+        """
+        return (is_dir, size, mtime_ns, hash) for the given path
+        relative to the archive folder, or None if not found
+        """
+        t_entry = self._dt_entries.get(s_path.strip('/'))
+        if t_entry is None:
+            return None
+        return (bool(t_entry[1]), t_entry[2], t_entry[3], t_entry[7])
+
+    def set_hashes(self, lt_hashes: list) -> int:
+        """
+        store content hashes from (path, hash, (size, mtime_ns)) where
+        size and mtime_ns are the stat of the file when it was hashed;
+        hashes of files changed since the manifest was refreshed are
+        ignored; returns the number of hashes stored
+        """
+        lt_update = []
+        for s_path, s_hash, t_stat in lt_hashes:
+            t_entry = self._dt_entries.get(s_path)
+            if t_entry is None or t_entry[2:4] != tuple(t_stat):
+                continue
+            self._dt_entries[s_path] = t_entry[:7] + (s_hash,) + t_entry[8:]
+            lt_update.append((s_hash, s_path))
+        with self._o_dbconn:
+            self._o_dbconn.executemany(
+                'UPDATE ' + CP.ARCHIVE_TABLE + ' SET hash = ? WHERE path = ?;',
+                lt_update)
+        return len(lt_update)
+
+    def ls_get_files(self) -> list:
+        """
+        return the paths of all files (not folders), sorted
+        """
+        return sorted(
+            s_path for s_path, t_entry in self._dt_entries.items()
+            if not t_entry[1])
+
+    def o_get_index(self) -> ArchiveIndex:
+        """
+        return an index of the names per folder (see ArchiveIndex)
+        which does not read the archive folder again
+        """
+        return ArchiveIndex(self._s_root, {
+            s_folder: sorted(
+                s_path.rsplit('/', 1)[-1] for s_path in ss_paths)
+            for s_folder, ss_paths in self._dss_children.items()})
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
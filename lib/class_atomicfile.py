@@ -0,0 +1,104 @@
+""" class_atomicfile
+
+    implements the writing of an output file (e.g. a listing) such
+    that a reader of the file, e.g. a program uploading it, never sees
+    a partially written file: the content is written to a temporary
+    file in the same folder which replaces the file by a rename when
+    complete. If the content did not change, the temporary file is
+    removed and the file is not touched (its modification time is
+    kept).
+
+    The temporary file is written to disk (fsync) before the rename,
+    such that a crash does not leave an empty or partial file. It is
+    created with the permissions of a new file (as by open, i.e. the
+    umask applies), or gets those of the file it replaces.
+"""
+
+import filecmp
+import os
+import secrets
+
+# attempts to find an unused name for the temporary file
+
+_N_TEMP_ATTEMPTS = 100
+
+
+class AtomicFile:
+    """ Output file, to be used as context manager:
+
+            with AtomicFile(s_filename) as o_file:
+                o_file.write(b_data)
+
+        _s_filename         output file
+
+        _s_temp             temporary file while writing
+
+        _b_written          the output file was replaced (i.e. not
+                            unchanged)
+    """
+
+    def __init__(self, s_filename: str):
+        """ initialize output to the given file """
+        self._s_filename = s_filename
+        self._s_temp = None
+        self._o_file = None
+        self._b_written = False
+
+    def __enter__(self):
+        """
+        return temporary file opened for binary writing
+        """
+        s_prefix = os.path.join(
+            os.path.dirname(self._s_filename),
+            '.' + os.path.basename(self._s_filename) + '.')
+        for i_attempt in range(_N_TEMP_ATTEMPTS):
+            self._s_temp = s_prefix + secrets.token_hex(4) + '.tmp'
+            try:
+                i_handle = os.open(
+                    self._s_temp,
+                    os.O_WRONLY | os.O_CREAT | os.O_EXCL
+                    | getattr(os, 'O_BINARY', 0), 0o666)
+                break
+            except FileExistsError:
+                if i_attempt == _N_TEMP_ATTEMPTS - 1:
+                    raise
+        self._o_file = os.fdopen(i_handle, 'wb')
+        return self._o_file
+
+    def __exit__(self, o_type, o_value, o_traceback):
+        """
+        replace output file by temporary file unless an exception was
+        raised or the content did not change
+        """
+        try:
+            if o_type is None:
+                self._o_file.flush()
+                os.fsync(self._o_file.fileno())
+        finally:
+            self._o_file.close()
+        try:
+            if o_type is not None or (
+                    os.path.exists(self._s_filename)
+                    and filecmp.cmp(
+                        self._s_temp, self._s_filename, shallow=False)):
+                os.remove(self._s_temp)
+                return False
+            try:
+                os.chmod(
+                    self._s_temp, os.stat(self._s_filename).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+            os.replace(self._s_temp, self._s_filename)
+        except OSError:
+            if os.path.exists(self._s_temp):
+                os.remove(self._s_temp)
+            raise
+        self._b_written = True
+        return False
+
+    def b_get_written(self) -> bool:
+        """
+        true if the output file was written, false if its content
+        did not change
+        """
+        return self._b_written
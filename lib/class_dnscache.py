@@ -0,0 +1,113 @@
+""" class_dnscache
+
+    implements a cache for host name resolution such that checking
+    many urls of the same host needs a single DNS lookup; failed
+    lookups are cached as well (for a shorter time) such that the
+    urls of a host without DNS entry fail immediately.
+"""
+
+import socket
+import threading
+import time
+
+
+class DnsCache:
+    """ Cache of host name resolutions.
+
+        _f_ttl              seconds a resolution is kept
+
+        _f_negative_ttl     seconds a failed resolution is kept
+
+        _d_entries          per (host, port): (time of lookup, list of
+                            addresses as returned by getaddrinfo, or
+                            the exception raised)
+
+        _d_locks            per (host, port): lock held while resolving
+                            such that concurrent threads wait for the
+                            result of a single lookup
+
+        _o_lock             protects _d_entries and _d_locks
+
+        _n_lookups          number of lookups done so far
+    """
+
+    def __init__(self, f_ttl=300.0, f_negative_ttl=60.0):
+        """ initialize empty cache """
+        self._f_ttl = f_ttl
+        self._f_negative_ttl = f_negative_ttl
+        self._d_entries = dict()
+        self._d_locks = dict()
+        self._o_lock = threading.Lock()
+        self._n_lookups = 0
+
+    def n_get_lookups(self) -> int:
+        """
+        return the number of lookups done so far
+        """
+        return self._n_lookups
+
+    def _t_get_entry(self, t_key: tuple):
+        """ return valid cache entry or None """
+        with self._o_lock:
+            t_entry = self._d_entries.get(t_key)
+        if t_entry is None:
+            return None
+        f_ttl = self._f_negative_ttl \
+            if isinstance(t_entry[1], Exception) else self._f_ttl
+        if time.monotonic() - t_entry[0] >= f_ttl:
+            return None
+        return t_entry
+
+    def l_resolve(self, s_host: str, i_port: int) -> list:
+        """
+        return the addresses for host and port as getaddrinfo does
+        (for TCP connections); raises socket.gaierror (again) if the
+        host could not be resolved
+        """
+        t_key = (s_host.lower(), i_port)
+        t_entry = self._t_get_entry(t_key)
+        if t_entry is None:
+            with self._o_lock:
+                o_key_lock = self._d_locks.setdefault(
+                    t_key, threading.Lock())
+            with o_key_lock:
+                t_entry = self._t_get_entry(t_key)
+                if t_entry is None:
+                    try:
+                        x_result = socket.getaddrinfo(
+                            s_host, i_port, 0, socket.SOCK_STREAM)
+                    except socket.gaierror as o_error:
+                        x_result = o_error
+                    t_entry = (time.monotonic(), x_result)
+                    with self._o_lock:
+                        self._d_entries[t_key] = t_entry
+                        self._n_lookups += 1
+
+        if isinstance(t_entry[1], Exception):
+            raise t_entry[1]
+        return t_entry[1]
+
+    def o_create_connection(
+            self, t_address: tuple, f_timeout=None, t_source=None):
+        """
+        replacement for socket.create_connection using this cache;
+        tries all addresses of the host until a connection succeeds
+        """
+        o_last_error = None
+        for i_family, i_type, i_proto, _, t_sockaddr in \
+                self.l_resolve(t_address[0], t_address[1]):
+            o_socket = None
+            try:
+                o_socket = socket.socket(i_family, i_type, i_proto)
+                o_socket.settimeout(f_timeout)
+                if t_source:
+                    o_socket.bind(t_source)
+                o_socket.connect(t_sockaddr)
+                return o_socket
+            except OSError as o_error:
+                o_last_error = o_error
+                if o_socket is not None:
+                    o_socket.close()
+        if o_last_error is None:
+            raise OSError('getaddrinfo returns an empty list')
+        raise o_last_error
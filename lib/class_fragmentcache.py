@@ -0,0 +1,96 @@
+""" class_fragmentcache
+
+    implements a cache of rendered parts of a listing (e.g. the
+    section of a region in list2) stored in the database such that
+    only parts whose records changed are rendered again.
+
+    A fragment is stored per listing and key with a hash of all data
+    it is rendered from; it is used as long as the hash matches.
+    Fragments not used by the latest rendering of a listing are
+    removed when the cache is saved.
+
+    The table is not touched by load, i.e. the fragments survive
+    reloading the metadata.
+"""
+
+from .metadata_params import ConfigParams as CP
+
+
+class FragmentCache:
+    """ Rendered fragments of a listing.
+
+        _o_dbconn           database connection
+
+        _s_list             name of the listing
+
+        _dt_stored          per key: (hash, fragment) as read from
+                            the database
+
+        _dt_used            per key: (hash, fragment) used by the
+                            current rendering
+
+        _n_hits             number of fragments taken from the cache
+
+        _n_misses           number of fragments rendered
+    """
+
+    def __init__(self, o_dbconn, s_list: str):
+        """ create table if necessary and load fragments of listing """
+        self._o_dbconn = o_dbconn
+        self._s_list = s_list
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.FRAGMENT_TABLE + ' ('
+            'list TEXT NOT NULL, '
+            'key TEXT NOT NULL, '
+            'hash TEXT NOT NULL, '
+            'fragment TEXT NOT NULL, '
+            'PRIMARY KEY (list, key));')
+        self._o_dbconn.commit()
+        self._dt_stored = {
+            t_row[0]: t_row[1:] for t_row in self._o_dbconn.execute(
+                'SELECT key, hash, fragment FROM ' + CP.FRAGMENT_TABLE
+                + ' WHERE list = ?;', (s_list,))}
+        self._dt_used = dict()
+        self._n_hits = 0
+        self._n_misses = 0
+
+    def s_get_fragment(self, s_key: str, s_hash: str, f_render) -> str:
+        """
+        return the fragment for the given key if stored with the
+        given hash, else the fragment returned by f_render()
+        """
+        t_stored = self._dt_stored.get(s_key)
+        if t_stored is not None and t_stored[0] == s_hash:
+            self._n_hits += 1
+            s_fragment = t_stored[1]
+        else:
+            self._n_misses += 1
+            s_fragment = f_render()
+        self._dt_used[s_key] = (s_hash, s_fragment)
+        return s_fragment
+
+    def t_get_counts(self) -> tuple:
+        """
+        return (fragments taken from the cache, fragments rendered)
+        """
+        return (self._n_hits, self._n_misses)
+
+    def save(self):
+        """
+        store the fragments used by the current rendering, remove
+        all others of the listing
+        """
+        with self._o_dbconn:
+            self._o_dbconn.executemany(
+                'DELETE FROM ' + CP.FRAGMENT_TABLE
+                + ' WHERE list = ? AND key = ?;',
+                ((self._s_list, s_key) for s_key in self._dt_stored
+                 if s_key not in self._dt_used))
+            self._o_dbconn.executemany(
+                'INSERT OR REPLACE INTO ' + CP.FRAGMENT_TABLE
+                + ' (list, key, hash, fragment) VALUES (?, ?, ?, ?);',
+                ((self._s_list, s_key) + t_used
+                 for s_key, t_used in self._dt_used.items()
+                 if self._dt_stored.get(s_key) != t_used))
+        self._dt_stored = self._dt_used
+        self._dt_used = dict()
@@ -0,0 +1,125 @@
+""" class_htmltemplate
+
+    implements the HTML templates of the list tools (see htm/): a
+    template is compiled once into literal segments and named
+    placeholders <{name}>, and rendered by a single writelines.
+
+    A placeholder standing alone on a line is replaced by its value
+    including the line break (the value supplies its own line breaks,
+    e.g. the generated body); other placeholders are replaced within
+    their line. Trailing white space is removed from all lines of the
+    template.
+
+    Templates are read as UTF-8. Compiled templates are cached per
+    filename (shared by threads) and compiled again when the
+    modification time of the file changes. Output files are
+    replaced atomically and only if their content changes (see
+    AtomicFile).
+"""
+
+import os
+import re
+import threading
+
+from .class_atomicfile import AtomicFile
+
+# placeholders in a template
+
+_O_PLACEHOLDER = re.compile(r'<\{(\w+)\}>')
+
+
+class HtmlTemplate:
+    """ Compiled template.
+
+        _lx_segments        literal strings and placeholders, the
+                            latter as (name,)
+
+        _do_cache           per filename: (modification time, compiled
+                            template)
+
+        _o_lock             protects _do_cache
+    """
+
+    _do_cache = dict()
+    _o_lock = threading.Lock()
+
+    def __init__(self, s_text: str):
+        """ compile template from its text """
+        self._lx_segments = []
+        ls_literal = []
+        for s_line in s_text.splitlines():
+            s_line = s_line.rstrip()
+            o_match = _O_PLACEHOLDER.fullmatch(s_line)
+            if o_match is not None:
+                self._add_literal(ls_literal)
+                self._lx_segments.append((o_match.group(1),))
+                continue
+            i_pos = 0
+            for o_match in _O_PLACEHOLDER.finditer(s_line):
+                ls_literal.append(s_line[i_pos:o_match.start()])
+                self._add_literal(ls_literal)
+                self._lx_segments.append((o_match.group(1),))
+                i_pos = o_match.end()
+            ls_literal.append(s_line[i_pos:] + '\n')
+        self._add_literal(ls_literal)
+
+    def _add_literal(self, ls_literal: list):
+        """ add collected literal text as a single segment """
+        s_literal = ''.join(ls_literal)
+        if s_literal:
+            self._lx_segments.append(s_literal)
+        ls_literal.clear()
+
+    @classmethod
+    def o_load(cls, s_filename: str):
+        """
+        return the compiled template from the given file (cached
+        while the file is not modified)
+        """
+        with cls._o_lock:
+            i_mtime = os.stat(s_filename).st_mtime_ns
+            t_cached = cls._do_cache.get(s_filename)
+            if t_cached is not None and t_cached[0] == i_mtime:
+                return t_cached[1]
+            with open(s_filename, 'r', encoding='utf-8') as o_file:
+                o_template = cls(o_file.read())
+            cls._do_cache[s_filename] = (i_mtime, o_template)
+            return o_template
+
+    def ls_get_names(self) -> list:
+        """
+        return the names of the placeholders in order of appearance
+        """
+        return [
+            x_segment[0] for x_segment in self._lx_segments
+            if isinstance(x_segment, tuple)]
+
+    def ls_render(self, dx_values: dict) -> list:
+        """
+        return the output as list of strings; values are strings or
+        lists of strings, each placeholder must have a value
+        """
+        ls_output = []
+        for x_segment in self._lx_segments:
+            if isinstance(x_segment, str):
+                ls_output.append(x_segment)
+                continue
+            x_value = dx_values[x_segment[0]]
+            if isinstance(x_value, str):
+                ls_output.append(x_value)
+            else:
+                ls_output.extend(x_value)
+        return ls_output
+
+    def b_write(self, s_filename: str, dx_values: dict) -> bool:
+        """
+        render the template with the given values to a file; a file
+        with the same content is not written again (such that its
+        modification time is kept); returns True if written
+        """
+        o_atomic = AtomicFile(s_filename)
+        with o_atomic as o_file:
+            o_file.writelines(
+                s_output.encode('utf-8')
+                for s_output in self.ls_render(dx_values))
+        return o_atomic.b_get_written()
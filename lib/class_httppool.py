@@ -0,0 +1,155 @@
+""" class_httppool
+
+    implements a pool of persistent (keep-alive) HTTP(S) connections
+    per host such that checking many urls of the same host does not
+    need a new connection (DNS lookup, TCP and TLS handshake) for
+    each url.
+
+    A connection is returned to the pool only if the response was read
+    completely; idle connections closed by the server are detected
+    before reuse where possible. As a server may still close an idle
+    connection at any time, a request failing on a reused connection
+    should be repeated once on a new connection (see b_reused).
+
+    Host names are resolved using a DnsCache shared by all connections
+    of the pool.
+"""
+
+import http.client
+import select
+import threading
+import time
+
+from .class_dnscache import DnsCache
+
+
+def t_pool_key(o_url) -> tuple:
+    """
+    return the key for connections to the host of the given
+    (split) url: (scheme, host, port)
+    """
+    i_port = o_url.port
+    if i_port is None:
+        i_port = 443 if o_url.scheme == 'https' else 80
+    return (o_url.scheme, o_url.hostname.lower(), i_port)
+
+
+def _b_is_idle(o_connection) -> bool:
+    """
+    true if connection is open and nothing is waiting to be read,
+    i.e. the server did not close it
+    """
+    if o_connection.sock is None:
+        return False
+    try:
+        ls_ready = select.select([o_connection.sock], [], [], 0)[0]
+    except (OSError, ValueError):
+        return False
+    return not ls_ready
+
+
+class HttpPool:
+    """ Pool of idle HTTP(S) connections.
+
+        _n_max_idle         maximum number of idle connections per host
+
+        _f_max_age          idle connections older than this number of
+                            seconds are closed instead of being reused
+
+        _dl_idle            idle connections per key (see t_pool_key):
+                            list of (connection, time released)
+
+        _o_lock             protects _dl_idle
+
+        _n_connects         number of connections opened so far
+
+        _o_dns_cache        resolved host names
+    """
+
+    def __init__(self, n_max_idle=4, f_max_age=15.0, o_dns_cache=None):
+        """ initialize empty pool """
+        assert n_max_idle >= 0, 'n_max_idle must not be negative'
+        self._n_max_idle = n_max_idle
+        self._f_max_age = f_max_age
+        self._o_dns_cache = DnsCache() if o_dns_cache is None \
+            else o_dns_cache
+        self._dl_idle = dict()
+        self._o_lock = threading.Lock()
+        self._n_connects = 0
+
+    def n_get_connects(self) -> int:
+        """
+        return the number of connections opened so far
+        """
+        return self._n_connects
+
+    def o_connect(
+            self, o_url, f_connect_timeout: float, f_read_timeout: float):
+        """
+        open a new connection to the host of the given (split) url
+        """
+        if o_url.scheme == 'https':
+            o_connection = http.client.HTTPSConnection(
+                o_url.hostname, o_url.port, timeout=f_connect_timeout)
+        else:
+            o_connection = http.client.HTTPConnection(
+                o_url.hostname, o_url.port, timeout=f_connect_timeout)
+
+        # host names are resolved by the DNS cache: http.client opens its
+        # socket using the private attribute _create_connection, i.e.
+        # this depends on the implementation of http.client
+        o_create = self._o_dns_cache.o_create_connection
+        o_connection._create_connection = o_create  # pylint: disable=W0212
+        o_connection.connect()
+        o_connection.sock.settimeout(f_read_timeout)
+        with self._o_lock:
+            self._n_connects += 1
+        return o_connection
+
+    def t_acquire(
+            self, o_url, f_connect_timeout: float, f_read_timeout: float):
+        """
+        return (connection, b_reused) for the host of the given (split)
+        url: an idle connection from the pool or a new connection
+        """
+        t_key = t_pool_key(o_url)
+        f_now = time.monotonic()
+        while True:
+            with self._o_lock:
+                l_idle = self._dl_idle.get(t_key)
+                if not l_idle:
+                    break
+                o_connection, f_released = l_idle.pop()
+            if f_now - f_released < self._f_max_age \
+                    and _b_is_idle(o_connection):
+                o_connection.sock.settimeout(f_read_timeout)
+                return (o_connection, True)
+            o_connection.close()
+        return (
+            self.o_connect(o_url, f_connect_timeout, f_read_timeout),
+            False)
+
+    def release(self, o_url, o_connection, b_reusable: bool):
+        """
+        return connection to the pool if it can be used again,
+        else close it
+        """
+        if b_reusable:
+            t_key = t_pool_key(o_url)
+            with self._o_lock:
+                l_idle = self._dl_idle.setdefault(t_key, [])
+                if len(l_idle) < self._n_max_idle:
+                    l_idle.append((o_connection, time.monotonic()))
+                    return
+        o_connection.close()
+
+    def close_all(self):
+        """
+        close all idle connections
+        """
+        with self._o_lock:
+            ll_idle = list(self._dl_idle.values())
+            self._dl_idle.clear()
+        for l_idle in ll_idle:
+            for o_connection, _ in l_idle:
+                o_connection.close()
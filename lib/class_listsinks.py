@@ -0,0 +1,789 @@
+""" class_listsinks
+
+    implements the outputs of the list tools (list1, list2, list3) as
+    sinks fed by a single scan of the metadata (see n_scan) such that
+    several listings are created by one query (see render).
+
+    Each sink selects the rows of its listing (as the WHERE clause of
+    the former query of its tool) and sorts them as the former ORDER
+    BY clause: rows are scanned in the order they were loaded and
+    sorted by stable sorts, with NULL before numbers before text, as
+    sqlite does.
+"""
+# pylint: disable=R0912
+# pylint: disable=R0914
+# pylint: disable=R0915
+
+import abc
+import datetime
+import glob
+import hashlib
+import os
+import re
+import sqlite3
+from html import escape
+
+from .class_htmltemplate import HtmlTemplate
+from .class_tagstring import TagString
+from .metadata_check_tools import s_fix_url_for_html
+from .metadata_date_tools import ls_format_dates, s_format_date, \
+    s_format_day, s_format_month, t_parse_date
+from .metadata_export_tools import n_write_export
+from .metadata_list2_htm import s_format_entry, s_format_heading, \
+    s_icons, s_sups
+from .metadata_params import ConfigParams as CP
+
+# all columns of the metadata with the names of region and country,
+# optionally for a range of dates only
+
+S_REQUEST = (
+    "SELECT m.*, r.region_code, r.region_name, r.country_name "
+    "FROM " + CP.METADATA_TABLE + " m "
+    "LEFT OUTER JOIN " + CP.REGIONS_TABLE + " r "
+    "ON m.region = r.region_code "
+    "{0}ORDER BY m.rowid;")
+
+# columns a section of list2 is rendered from; the version is part of
+# the hash of a cached section of list2 or page of list1 by year and is
+# to be changed with the rendering
+
+_LS_LIST2_COLS = (
+    'title', 'subtitle', 'url', 'media', 'date', 'notes', 'region_label')
+_S_FRAGMENT_VERSION = '3'
+
+# pages of list1 by year (see List1YearSink)
+
+_O_YEAR_PAGE = re.compile(r'ma_list1_([0-9]{4}|undated)\.htm(\.gz)?')
+
+# columns of a record exported (see ListSink.n_export)
+
+_LS_EXPORT_COLS = (
+    'ID', 'date', 'title', 'subtitle', 'url', 'media', 'region',
+    'region_label')
+
+
+def t_sort_key(x_value) -> tuple:
+    """
+    return a key to sort values as sqlite does (NULL first, then
+    numbers, then text)
+
+    >>> sorted(['b', 2, None, 'a', 1.5], key=t_sort_key)
+    [None, 1.5, 2, 'a', 'b']
+
+    """
+    if x_value is None:
+        return (0, 0)
+    if isinstance(x_value, (int, float)):
+        return (1, x_value)
+    return (2, x_value)
+
+
+def s_format_rating(s_rating: str) -> str:
+    """
+    return the rating as shown by list1: (*****) best, (-) worst
+    """
+    if s_rating is None:
+        return '?'
+    if s_rating == '6':
+        return '-'
+    if s_rating.isnumeric():
+        return '*' * (6 - int(s_rating))
+    return s_rating
+
+
+def ls_get_tags(o_row) -> list:
+    """
+    return the tags of a record shown by icons or flags: '#paywall'
+    if present, and its media type ('#video', '#audio' or '#other')
+    """
+    o_tags = TagString(o_row['notes'])
+    o_tags.with_simple('#paywall')
+    o_tags.with_excls('#media_type', ['#video', '#audio'])
+    ls_tags = []
+    if o_tags.b_has_simple_tag('#paywall'):
+        ls_tags.append('#paywall')
+    ls_tags.append(o_tags.s_get_excls_tag('#media_type', '#other'))
+    return ls_tags
+
+
+def n_scan(o_dbconn, lo_sinks: list, t_dates=None) -> int:
+    """
+    read all metadata once and pass each row to the sinks accepting
+    it; t_dates (first, after last) limits the rows read to dates in
+    this range (compared as text, e.g. ('2020-01', '2021-01') for all
+    dates of 2020); returns the number of rows read
+    """
+    o_cursor = o_dbconn.cursor()
+    o_cursor.row_factory = sqlite3.Row
+    if t_dates is None:
+        o_rows = o_cursor.execute(S_REQUEST.format(''))
+    else:
+        o_rows = o_cursor.execute(S_REQUEST.format(
+            "WHERE m.date >= ? AND m.date < ? "), t_dates)
+    n_count = 0
+    for o_row in o_rows:
+        n_count += 1
+        for o_sink in lo_sinks:
+            if o_sink.b_accept(o_row):
+                o_sink.add(o_row)
+    return n_count
+
+
+class ListSink(abc.ABC):
+    """ Output of a list tool; subclasses render the body and the
+        other values of the template (_ls_body, _dx_values).
+
+        _s_filename         output file
+
+        _o_template         template of the output (see HtmlTemplate)
+
+        _lo_rows            rows accepted so far
+
+        _b_written          the output file was written (i.e. not
+                            unchanged) by n_write
+    """
+
+    def __init__(self, s_filename: str, s_template: str):
+        """ initialize sink writing to the given file """
+        self._s_filename = s_filename
+        self._o_template = HtmlTemplate.o_load(s_template)
+        self._lo_rows = []
+        self._b_written = False
+
+    def s_get_filename(self) -> str:
+        """
+        return the name of the output file
+        """
+        return self._s_filename
+
+    def b_get_written(self) -> bool:
+        """
+        true if the output file was written, false if its content
+        did not change
+        """
+        return self._b_written
+
+    def b_accept(self, o_row) -> bool:  # pylint: disable=W0613
+        """
+        true if the row is part of this listing (all rows by default)
+        """
+        return True
+
+    def add(self, o_row):
+        """
+        add an accepted row
+        """
+        self._lo_rows.append(o_row)
+
+    def _lo_sorted(self) -> list:
+        """
+        return the rows accepted in the order of the listing
+        """
+        return self._lo_rows
+
+    @abc.abstractmethod
+    def _ls_body(self, lo_rows: list) -> list:
+        """
+        return the body of the listing for the sorted rows
+        """
+
+    @abc.abstractmethod
+    def _dx_values(self) -> dict:
+        """
+        return the values of the placeholders other than the body
+        """
+
+    def n_write(self) -> int:
+        """
+        write the output file unless unchanged; returns the number
+        of records listed
+        """
+        lo_rows = self._lo_sorted()
+        dx_values = self._dx_values()
+        dx_values['body'] = self._ls_body(lo_rows)
+        self._b_written = self._o_template.b_write(
+            self._s_filename, dx_values)
+        return len(lo_rows)
+
+    def s_get_export_filename(self, s_format: str) -> str:
+        """
+        return the name of the export file in the given format, e.g.
+        ma_list2.ndjson
+        """
+        return os.path.splitext(self._s_filename)[0] + '.' + s_format
+
+    def n_export(self, s_format: str) -> int:
+        """
+        write the records of the listing in its order to the export
+        file (and its compressed copy, see n_write_export); returns
+        the number of records written
+        """
+        return n_write_export(
+            self.s_get_export_filename(s_format), s_format,
+            (self._dx_record(o_row) for o_row in self._lo_sorted()))
+
+    @staticmethod
+    def _dx_record(o_row) -> dict:
+        """
+        return the exported data of a record: its columns, the date
+        as text and the tags shown by icons or flags
+        """
+        dx_record = {s_col: o_row[s_col] for s_col in _LS_EXPORT_COLS}
+        dx_record['date_text'] = s_format_date(o_row['date'])
+        dx_record['tags'] = ls_get_tags(o_row)
+        return dx_record
+
+
+class List1Sink(ListSink):
+    """ All records in chronological order (list1).
+
+        _s_backup_base      base url of the reference copies
+    """
+
+    def __init__(self, s_backup_base: str, s_filename='ma_list1.htm'):
+        """ initialize sink """
+        super().__init__(s_filename, 'htm/main_list1.htm')
+        self._s_backup_base = s_backup_base
+
+    def _lo_sorted(self) -> list:
+        """
+        ORDER BY m.date
+        """
+        return sorted(
+            self._lo_rows, key=lambda o_row: t_sort_key(o_row['date']))
+
+    def _dx_values(self) -> dict:
+        """
+        base url, heading and date of creation
+        """
+        return {
+            'base': s_fix_url_for_html(self._s_backup_base),
+            'heading': 'Medienbeiträge (chronologisch sortiert)',
+            'date': s_format_day(datetime.date.today())}
+
+    def _ls_body(self, lo_rows: list) -> list:
+        """
+        one table row per record
+        """
+        ls_body = []
+        for o_row, s_date in zip(lo_rows, ls_format_dates(
+                [o_row['date'] for o_row in lo_rows])):
+
+            # start new row, column 1 with ID
+
+            ls_body.append(
+                '<tr class="vtop">\n'
+                '<td class="hcenter">\n'
+                '{0}\n'
+                '</td>\n'
+                '<td class="hleft">\n'
+                .format(o_row['ID'])
+            )
+
+            # author, title, subtitle, rating
+
+            s_item = o_row['author']
+            if s_item is not None:
+                ls_body.append(
+                    '{0}: '
+                    .format(escape(s_item))
+                )
+
+            s_title = o_row['title']
+            s_subt = o_row['subtitle']
+            if s_title is None:
+                s_title = '<???>'
+            if s_subt is not None:
+                s_title += ' - ' + s_subt
+
+            # url for title
+
+            s_item = o_row['url']
+            if s_item is None:
+                s_prefix = ''
+                s_suffix = ''
+            else:
+                s_item = s_fix_url_for_html(s_item)
+                s_prefix = '<a href="{0}" target="_blank">'.format(s_item)
+                s_suffix = '</a>'
+
+            # rating - transform integers to (*****) best, (-) worst
+
+            ls_body.append(
+                '{0}<i>{1}</i>{2} ({3})<br />\n'
+                .format(
+                    s_prefix, escape(s_title), s_suffix,
+                    s_format_rating(o_row['rating']))
+            )
+
+            # media, type, date
+
+            s_item = o_row['media']
+            if s_item is None:
+                s_item = '&lt;???&gt;'
+            ls_body.append(
+                'In: <i>{0}</i>'
+                .format(s_item)
+            )
+
+            s_item = o_row['type']
+            if s_item is not None:
+                ls_body.append(' ({0})'.format(s_item))
+
+            s_item = s_date or ''
+            if not s_item:
+                ls_body.append(', {0}'.format(s_item))
+            ls_body.append('.<br />\n')
+
+            # place, contact
+            #
+            # place - DE
+            # place (region) - DE-rr
+            # place (country) - xx
+            # place (region, country) - xx-rr
+            #
+            # region - DE
+            # (country) - xx
+            # region (country) - xx-rr
+
+            s_place = o_row['place']
+            s_code = o_row['region']
+            s_region = o_row['region_name']
+            s_country = o_row['country_name']
+
+            if s_code is None:
+                assert s_place is None, "place requires code"
+            elif s_code[0:2] == 'DE':
+                s_country = None
+
+            if s_place is None:
+                if s_region is None and s_country is None:
+                    s_item = None  # nothing to output
+                elif s_region is None:
+                    s_item = '({0})'.format(s_country)
+                elif s_country is None:
+                    s_item = '{0}'.format(s_region)
+                else:
+                    s_item = '{0} ({1})'.format(s_region, s_country)
+            else:
+                s_item = escape(s_place)
+                if s_region is None and s_country is None:
+                    pass  # that's it, output place only
+                elif s_region is None:
+                    s_item += ' ({0})'.format(s_country)
+                elif s_country is None:
+                    s_item += ' ({0})'.format(s_region)
+                else:
+                    s_item += ' ({0}, {1})'.format(s_region, s_country)
+
+            if s_item is not None:
+                ls_body.append(escape(s_item))
+
+            # contact
+
+            s_contact = o_row['contact']
+            if s_item is None and s_contact is None:
+                pass  # do not output this line
+            elif s_item is None:
+                ls_body.append(
+                    'Kontakt: {0}<br />\n'
+                    .format(escape(s_contact))
+                )
+            elif s_contact is None:
+                ls_body.append(
+                    '<br />\n'
+                )
+            else:
+                ls_body.append(
+                    ', Kontakt: {0}<br />\n'
+                    .format(s_contact))
+            # notes
+
+            s_item = o_row['notes']
+            if s_item is not None:
+                ls_body.append(
+                    'Anmerkungen: {0}<br />\n'
+                    .format(escape(s_item))
+                )
+
+            # local copy
+
+            if o_row['ref_ok']:
+                s_item = o_row['ref_copy']
+                ls_body.append(
+                    '<a href="{0}">Kopie</a>'
+                    .format(s_item))
+            else:
+                s_item = None
+
+            if o_row['url_ok']:
+                if s_item is None:
+                    pass  # nothing to do
+                else:
+                    ls_body.append('<br />\n')
+            else:
+                s_item = '' if s_item is None else ' '
+                s_item += '(Original nicht mehr online verfügbar)<br />\n'
+                ls_body.append(s_item)
+
+            # that's it for this item
+
+            ls_body.append('</td></tr>\n')
+        return ls_body
+
+
+class List1YearSink(List1Sink):
+    """ All records in chronological order (list1), one page per year
+        (records without a valid date on a page of their own) and an
+        index page with the number of records per year. The pages
+        show the data of list1 as one short paragraph per record
+        instead of a table row.
+
+        _o_cache            cache of the bodies of the pages per year
+                            (see FragmentCache)
+
+        _n_pages_written    number of pages written by n_write (pages
+                            of unchanged years are not written)
+
+        _n_pages_removed    number of pages removed by n_write (years
+                            without records)
+    """
+
+    def __init__(self, s_backup_base: str, o_cache):
+        """ initialize sink, pages of unchanged years are taken from
+            o_cache
+        """
+        super().__init__(s_backup_base, 'ma_list1_index.htm')
+        self._o_template = HtmlTemplate.o_load('htm/main_list1_index.htm')
+        self._o_page = HtmlTemplate.o_load('htm/main_list1_year.htm')
+        self._o_cache = o_cache
+        self._n_pages_written = 0
+        self._n_pages_removed = 0
+
+    def n_get_pages_written(self) -> int:
+        """
+        return the number of pages written by n_write
+        """
+        return self._n_pages_written
+
+    def n_get_pages_removed(self) -> int:
+        """
+        return the number of pages removed by n_write
+        """
+        return self._n_pages_removed
+
+    def _ls_body(self, lo_rows: list) -> list:
+        """
+        one paragraph per record: ID, author, title (linked), rating;
+        media, type and date; place and contact; notes; local copy
+        """
+        ls_body = []
+        for o_row, s_date in zip(lo_rows, ls_format_dates(
+                [o_row['date'] for o_row in lo_rows])):
+            s_title = o_row['title'] or '<???>'
+            if o_row['subtitle'] is not None:
+                s_title += ' - ' + o_row['subtitle']
+            s_title = '<i>{0}</i>'.format(escape(s_title))
+            if o_row['url'] is not None:
+                s_title = '<a href="{0}">{1}</a>'.format(
+                    s_fix_url_for_html(o_row['url']), s_title)
+            ls_lines = ['{0} {1}{2} ({3})'.format(
+                o_row['ID'],
+                '' if o_row['author'] is None
+                else escape(o_row['author']) + ': ',
+                s_title, s_format_rating(o_row['rating']))]
+
+            ls_lines.append('In: <i>{0}</i>{1}{2}'.format(
+                escape(o_row['media'] or '<???>'),
+                '' if o_row['type'] is None
+                else ' ({0})'.format(escape(o_row['type'])),
+                '' if s_date is None else ', ' + s_date))
+
+            # place with region and country (not for Germany), contact
+
+            ls_place = [
+                o_row['place'], o_row['region_name'],
+                None if (o_row['region'] or '')[:2] == 'DE'
+                else o_row['country_name']]
+            if o_row['contact'] is not None:
+                ls_place.append('Kontakt: ' + o_row['contact'])
+            s_place = ', '.join(filter(None, ls_place))
+            if s_place:
+                ls_lines.append(escape(s_place))
+
+            if o_row['notes'] is not None:
+                ls_lines.append(
+                    'Anmerkungen: {0}'.format(escape(o_row['notes'])))
+
+            ls_copy = []
+            if o_row['ref_ok']:
+                ls_copy.append('<a href="{0}">Kopie</a>'.format(
+                    o_row['ref_copy']))
+            if not o_row['url_ok']:
+                ls_copy.append('(Original nicht mehr online verfügbar)')
+            if ls_copy:
+                ls_lines.append(' '.join(ls_copy))
+
+            ls_body.append('<p>{0}</p>\n'.format('<br />\n'.join(ls_lines)))
+        return ls_body
+
+    def n_write(self) -> int:
+        """
+        write the pages of all years (unless unchanged) and the
+        index page; returns the number of records listed
+        """
+        lo_rows = self._lo_sorted()
+
+        # records in order of dates, i.e. years are contiguous
+
+        dlo_years = dict()
+        for o_row in lo_rows:
+            t_date = t_parse_date(o_row['date'])
+            dlo_years.setdefault(
+                'undated' if t_date is None else '{0:04d}'.format(t_date[0]),
+                []).append(o_row)
+
+        ls_index = []
+        for s_year, lo_year in dlo_years.items():
+            s_hash = hashlib.sha256(repr((
+                _S_FRAGMENT_VERSION, [tuple(o_row) for o_row in lo_year]
+                )).encode()).hexdigest()
+            s_body = self._o_cache.s_get_fragment(
+                s_year, s_hash,
+                lambda lo_year=lo_year: ''.join(self._ls_body(lo_year)))
+            s_filename = 'ma_list1_{0}.htm'.format(s_year)
+            if self._o_page.b_write(s_filename, {
+                    'base': s_fix_url_for_html(self._s_backup_base),
+                    'heading': 'Medienbeiträge {0}'.format(
+                        'ohne Datum' if s_year == 'undated' else s_year),
+                    'body': s_body}):
+                self._n_pages_written += 1
+            ls_index.append(
+                '<li><a href="{0}">{1}</a> ({2})</li>\n'.format(
+                    s_filename,
+                    'ohne Datum' if s_year == 'undated' else s_year,
+                    len(lo_year)))
+
+        # pages of years without records (and their compressed copies)
+
+        for s_filename in glob.glob('ma_list1_*.htm*'):
+            o_match = _O_YEAR_PAGE.fullmatch(s_filename)
+            if o_match is not None and o_match.group(1) not in dlo_years:
+                os.remove(s_filename)
+                if o_match.group(2) is None:
+                    self._n_pages_removed += 1
+
+        # most recent year first
+
+        self._b_written = self._o_template.b_write(self._s_filename, {
+            'heading': 'Medienbeiträge (chronologisch sortiert)',
+            'date': s_format_day(datetime.date.today()),
+            'body': ls_index[::-1]})
+        return len(lo_rows)
+
+
+class List2Sink(ListSink):
+    """ Records of Germany with a good rating by region and reverse
+        chronological order (list2, radelnohnealter.de/presse).
+
+        _o_cache            cache of the sections per region (see
+                            FragmentCache) or None
+    """
+
+    def __init__(self, s_filename='ma_list2.htm', o_cache=None):
+        """
+        initialize sink; sections of regions whose records did not
+        change are taken from o_cache if given
+        """
+        super().__init__(s_filename, 'htm/main_list2.htm')
+        self._o_cache = o_cache
+
+    def b_accept(self, o_row) -> bool:
+        """
+        title not empty, region in Germany, url ok, rating 1...3
+        """
+        return o_row['title'] is not None \
+            and (o_row['region'] or '')[:2] == 'DE' \
+            and bool(o_row['url_ok']) \
+            and o_row['rating'] in ('1', '2', '3')
+
+    def _lo_sorted(self) -> list:
+        """
+        ORDER BY m.region_level ASC, m.region_label ASC, m.date DESC
+        """
+        lo_rows = sorted(
+            self._lo_rows, key=lambda o_row: t_sort_key(o_row['date']),
+            reverse=True)
+        return sorted(lo_rows, key=lambda o_row: (
+            t_sort_key(o_row['region_level']),
+            t_sort_key(o_row['region_label'])))
+
+    def _dx_values(self) -> dict:
+        """
+        heading and date of creation
+        """
+        return {
+            'heading': 'Medienbeiträge (nach Regionen und Zeit sortiert)',
+            'date': s_format_day(datetime.date.today())}
+
+    def _ls_body(self, lo_rows: list) -> list:
+        """
+        records grouped by region, one section per region
+        """
+
+        # a new section starts when the region changes (the first
+        # has no heading if its region is empty)
+
+        llo_groups = []
+        s_last_place = str()
+        for o_row in lo_rows:
+            if not llo_groups or s_last_place != o_row['region_label']:
+                llo_groups.append([])
+                s_last_place = o_row['region_label']
+            llo_groups[-1].append(o_row)
+
+        ls_body = []
+        di_keys = dict()
+        for i_group, lo_group in enumerate(llo_groups):
+            b_heading = i_group > 0 or lo_group[0]['region_label'] != ''
+            if i_group > 0:
+                ls_body.append('</p>\n')
+            if self._o_cache is None:
+                ls_body.append(self._s_section(lo_group, b_heading))
+                continue
+            s_hash = hashlib.sha256(repr((
+                _S_FRAGMENT_VERSION,
+                b_heading, [tuple(o_row[s_col] for s_col in _LS_LIST2_COLS)
+                            for o_row in lo_group])).encode()).hexdigest()
+
+            # key is the region (numbered if it occurs more than once)
+
+            s_key = str(lo_group[0]['region_label'])
+            di_keys[s_key] = di_keys.get(s_key, 0) + 1
+            if di_keys[s_key] > 1:
+                s_key += '#{0}'.format(di_keys[s_key])
+            ls_body.append(self._o_cache.s_get_fragment(
+                s_key, s_hash,
+                lambda lo_group=lo_group, b_heading=b_heading:
+                self._s_section(lo_group, b_heading)))
+
+        # output closing tag
+
+        if len(lo_rows) > 1:
+            ls_body.append('</p>\n')
+        return ls_body
+
+    @staticmethod
+    def _s_section(lo_rows: list, b_heading: bool) -> str:
+        """
+        return the section of a region: heading and its records
+        """
+        ls_section = []
+        if b_heading:
+            ls_section.append(
+                s_format_heading(lo_rows[0]['region_label']) + '\n<p>\n')
+        for i_row, o_row in enumerate(lo_rows):
+            if i_row > 0 or not b_heading:
+                ls_section.append('<br />\n')
+
+            # determine icons
+
+            s_icon_list = s_icons(ls_get_tags(o_row))
+
+            ls_section.append(
+                s_format_entry(
+                    o_row['title'],
+                    o_row['subtitle'],
+                    o_row['url'],
+                    o_row['media'],
+                    o_row['date'],
+                    s_icon_list
+                    ))
+        return ''.join(ls_section)
+
+
+class List3Sink(ListSink):
+    """ Records of a month with a rating of 1...4 by region and
+        chronological order (list3, for use in mailings).
+
+        _o_date             first day of the month
+    """
+
+    def __init__(self, o_date: datetime.date, s_filename='ma_list3.htm'):
+        """ initialize sink for the month of the given date """
+        super().__init__(s_filename, 'htm/main_list3.htm')
+        self._o_date = o_date
+
+    def b_accept(self, o_row) -> bool:
+        """
+        title not empty, url ok, rating 1...4, date in month
+        """
+        return o_row['title'] is not None \
+            and bool(o_row['url_ok']) \
+            and o_row['rating'] in ('1', '2', '3', '4') \
+            and str(o_row['date']).startswith(
+                self._o_date.strftime('%Y-%m'))
+
+    def _lo_sorted(self) -> list:
+        """
+        ORDER BY m.region_level ASC, m.region_label ASC, m.date
+        """
+        return sorted(self._lo_rows, key=lambda o_row: (
+            t_sort_key(o_row['region_level']),
+            t_sort_key(o_row['region_label']),
+            t_sort_key(o_row['date'])))
+
+    def _dx_values(self) -> dict:
+        """
+        heading and month
+        """
+        return {
+            'heading': 'Radeln ohne Alter in den Medien',
+            'date': s_format_month(self._o_date)}
+
+    def _ls_body(self, lo_rows: list) -> list:
+        """
+        records grouped by region
+        """
+        ls_body = []
+        s_last_place = str()
+        n_count = 0
+        for o_row in lo_rows:
+            n_count += 1
+
+            # new group?
+
+            if s_last_place != o_row['region_label']:
+                if n_count > 1:
+                    ls_body.append('\n</p>\n')
+                s_last_place = o_row['region_label']
+                ls_body.append(
+                    s_format_heading(o_row['region_label']) + '\n<p>\n')
+            else:
+                ls_body.append('<br />\n')
+
+            # determine flags
+
+            s_sups_list = s_sups(ls_get_tags(o_row))
+
+            ls_body.append(
+                s_format_entry(
+                    o_row['title'],
+                    o_row['subtitle'],
+                    o_row['url'],
+                    o_row['media'],
+                    o_row['date'],
+                    '',
+                    s_sups_list
+                    ))
+
+        # end of loop, output closing tag
+
+        if n_count > 1:
+            ls_body.append('</p>')
+        return ls_body
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
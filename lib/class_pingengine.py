@@ -0,0 +1,239 @@
+""" class_pingengine
+
+    implements a class to check many urls concurrently using a pool
+    of worker threads.
+
+    Connections are kept open and reused for further urls of the
+    same host (see HttpPool).
+
+    The number of concurrent requests per host is limited such that
+    the engine does not overload single servers (many of our urls
+    point to the same few news sites). Checks failing for temporary
+    reasons (see b_is_transient) are repeated a limited number of
+    times, waiting longer after each attempt.
+
+    If a host could not be reached for a number of urls in a row, the
+    remaining urls of that host are not checked but reported with
+    status I_STATUS_SKIPPED (circuit breaker): on a bad-network day
+    this saves waiting for the timeouts of all these urls.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+from .class_dnscache import DnsCache
+from .class_httppool import HttpPool
+from .metadata_http_tools import t_probe_url, b_is_transient
+from .metadata_http_tools import F_CONNECT_TIMEOUT, F_READ_TIMEOUT
+
+# status reported for urls not checked as their host failed repeatedly
+
+I_STATUS_SKIPPED = -2
+
+
+def s_host_key(s_url: str) -> str:
+    """
+    return the host name of the given url in lower case, or an
+    empty string if the url has no host
+    """
+    try:
+        return (urlsplit(s_url).hostname or '').lower()
+    except ValueError:
+        return ''
+
+
+def ls_interleave_by_host(ls_urls: list, f_rank=None) -> list:
+    """
+    reorder urls such that consecutive urls have different hosts
+    as far as possible: this keeps the workers busy with other hosts
+    while a host is at its limit of concurrent requests; if f_rank is
+    given, urls with a lower rank come first (the order of urls with
+    the same host and rank is kept)
+    """
+    di_hosts = dict()
+    di_counts = dict()
+    lt_keys = []
+    for i_url, s_url in enumerate(ls_urls):
+        i_rank = 0 if f_rank is None else f_rank(s_url)
+        s_host = s_host_key(s_url)
+        i_host = di_hosts.setdefault(s_host, len(di_hosts))
+        i_count = di_counts.get((i_rank, i_host), 0)
+        di_counts[(i_rank, i_host)] = i_count + 1
+        lt_keys.append((i_rank, i_count, i_host, i_url))
+    return [ls_urls[t_key[3]] for t_key in sorted(lt_keys)]
+
+
+class PingEngine:
+    """ Checks urls concurrently.
+
+        _n_workers          number of worker threads
+
+        _n_per_host         maximum number of concurrent requests
+                            to a single host
+
+        _f_connect_timeout  timeout in seconds to connect to a server
+
+        _f_read_timeout     timeout in seconds for each read from a
+                            server
+
+        _n_retries          number of repetitions for a failed check
+                            (only if failure is temporary)
+
+        _f_backoff          delay in seconds before the first
+                            repetition; doubled for each repetition
+
+        _n_host_failures    number of urls in a row for which a host
+                            could not be reached before the remaining
+                            urls of that host are skipped (0: never)
+
+        _d_host_locks       a semaphore per host to limit concurrency
+
+        _di_host_failures   number of urls in a row per host for which
+                            the host could not be reached
+
+        _o_dns_cache        resolved host names
+
+        _o_pool             idle connections per host
+
+        _o_lock             protects _d_host_locks and _di_host_failures
+    """
+
+    def __init__(
+            self,
+            n_workers=16,
+            n_per_host=2,
+            f_connect_timeout=F_CONNECT_TIMEOUT,
+            f_read_timeout=F_READ_TIMEOUT,
+            n_retries=2,
+            f_backoff=1.0,
+            n_host_failures=5):
+        """ initialize engine with the given limits """
+        if n_workers < 1:
+            raise ValueError('n_workers must be a positive integer')
+        if n_per_host < 1:
+            raise ValueError('n_per_host must be a positive integer')
+        if n_retries < 0:
+            raise ValueError('n_retries must not be negative')
+        self._n_workers = n_workers
+        self._n_per_host = n_per_host
+        self._f_connect_timeout = f_connect_timeout
+        self._f_read_timeout = f_read_timeout
+        self._n_retries = n_retries
+        self._f_backoff = f_backoff
+        self._n_host_failures = n_host_failures
+        self._d_host_locks = dict()
+        self._di_host_failures = dict()
+        self._o_lock = threading.Lock()
+        self._o_dns_cache = DnsCache()
+        self._o_pool = HttpPool(
+            n_max_idle=n_per_host, o_dns_cache=self._o_dns_cache)
+
+    def _o_host_lock(self, s_url: str):
+        """ return the semaphore for the host of the given url """
+        s_host = s_host_key(s_url)
+        with self._o_lock:
+            if s_host not in self._d_host_locks:
+                self._d_host_locks[s_host] = \
+                    threading.BoundedSemaphore(self._n_per_host)
+            return self._d_host_locks[s_host]
+
+    def _b_host_failing(self, s_host: str) -> bool:
+        """ true if urls of the given host are to be skipped """
+        with self._o_lock:
+            return 0 < self._n_host_failures \
+                <= self._di_host_failures.get(s_host, 0)
+
+    def _count_host_failure(self, s_host: str, b_failed: bool):
+        """ count urls in a row for which host could not be reached """
+        with self._o_lock:
+            if b_failed:
+                self._di_host_failures[s_host] = \
+                    self._di_host_failures.get(s_host, 0) + 1
+            else:
+                self._di_host_failures[s_host] = 0
+
+    def ss_failing_hosts(self) -> set:
+        """
+        return the hosts whose urls are skipped
+        """
+        return {
+            s_host for s_host in self._di_host_failures
+            if self._b_host_failing(s_host)}
+
+    def t_probe(self, s_url: str, ds_headers=None) -> tuple:
+        """
+        check a single url, repeating the check after temporary
+        failures; returns (i_status, s_error, s_etag, s_last_modified)
+        as t_probe_url, or I_STATUS_SKIPPED as status if the host of
+        the url failed repeatedly
+        """
+        s_host = s_host_key(s_url)
+        o_host_lock = self._o_host_lock(s_url)
+        f_delay = self._f_backoff
+        for i_attempt in range(self._n_retries + 1):
+            if i_attempt > 0:
+                time.sleep(f_delay)
+                f_delay *= 2
+            with o_host_lock:
+                if self._b_host_failing(s_host):
+                    return (I_STATUS_SKIPPED, (
+                        "Check skipped: server {0} could not be reached "
+                        "for {1} links in a row.".format(
+                            s_host, self._n_host_failures)
+                        ), None, None)
+                t_result = t_probe_url(
+                    s_url, self._f_connect_timeout, self._f_read_timeout,
+                    ds_headers, self._o_pool)
+            if not b_is_transient(t_result[0]):
+                break
+        self._count_host_failure(s_host, t_result[0] == 0)
+        return t_result
+
+    def it_probe_all(
+            self, ls_urls: list, f_headers=None, f_rank=None,
+            b_keep_open=False):
+        """
+        check all given urls concurrently; f_headers may return
+        additional request headers for a url (see UrlStatusCache),
+        f_rank a priority for a url (lower values are checked first);
+        yields (s_url, i_status, s_error, s_etag, s_last_modified)
+        in the order the checks complete; idle connections are closed
+        at the end unless b_keep_open (for further calls, see close)
+        """
+        try:
+            with ThreadPoolExecutor(max_workers=self._n_workers) as o_pool:
+                d_futures = {
+                    o_pool.submit(
+                        self.t_probe, s_url,
+                        None if f_headers is None else f_headers(s_url)):
+                    s_url
+                    for s_url in ls_interleave_by_host(ls_urls, f_rank)}
+                try:
+                    for o_future in as_completed(d_futures):
+                        yield (d_futures[o_future],) + o_future.result()
+                finally:
+                    for o_future in d_futures:
+                        o_future.cancel()
+        finally:
+            if not b_keep_open:
+                self.close()
+
+    def close(self):
+        """
+        close all idle connections
+        """
+        self._o_pool.close_all()
+
+    def n_get_connects(self) -> int:
+        """
+        return the number of connections opened so far
+        """
+        return self._o_pool.n_get_connects()
+
+    def n_get_lookups(self) -> int:
+        """
+        return the number of DNS lookups done so far
+        """
+        return self._o_dns_cache.n_get_lookups()
@@ -0,0 +1,182 @@
+""" class_pingqueue
+
+    implements a work queue in the database such that several ping
+    processes (possibly on different machines sharing the database
+    file) check the urls of a run together.
+
+    Each process claims a batch of urls for a limited time (lease);
+    urls of a process that crashed or was stopped are claimed again by
+    another process after the lease expired. Claiming uses an
+    immediate transaction such that no url is claimed twice while its
+    lease is valid.
+
+    Urls a process skipped (their host could not be reached) stay in
+    the queue: they are not claimed again by that process, but by
+    other processes, or by the next process continuing the run once
+    released.
+"""
+
+import os
+import socket
+import time
+
+from .metadata_params import ConfigParams as CP
+
+
+def s_worker_id() -> str:
+    """
+    return the identification of this process used as lease owner
+    """
+    return '{0}:{1}'.format(socket.gethostname(), os.getpid())
+
+
+class PingQueue:
+    """ Urls of a ping run waiting to be checked.
+
+        _o_dbconn           database connection
+
+        _i_run              number of the run (see PingScheduler)
+
+        _s_owner            identification of this process
+    """
+
+    def __init__(self, o_dbconn, i_run: int, s_owner=None):
+        """ create table if necessary """
+        self._o_dbconn = o_dbconn
+        self._i_run = i_run
+        self._s_owner = s_worker_id() if s_owner is None else s_owner
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.PING_QUEUE_TABLE + ' ('
+            'run INT NOT NULL, '
+            'url TEXT NOT NULL, '
+            'position INT NOT NULL, '
+            'owner TEXT, '
+            'expires REAL, '
+            'done INT NOT NULL DEFAULT 0, '
+            'PRIMARY KEY (run, url));')
+        self._o_dbconn.execute(
+            'CREATE INDEX IF NOT EXISTS ' + CP.PING_QUEUE_TABLE
+            + '_open ON ' + CP.PING_QUEUE_TABLE + ' (run, done, position);')
+        self._o_dbconn.commit()
+
+    def n_count(self, b_open_only=False) -> int:
+        """
+        return the number of urls of the run in the queue, or the
+        number of urls not yet checked
+        """
+        return self._o_dbconn.execute(
+            'SELECT COUNT(*) FROM ' + CP.PING_QUEUE_TABLE
+            + ' WHERE run = ?' + (' AND done = 0;' if b_open_only else ';'),
+            (self._i_run,)).fetchone()[0]
+
+    def n_count_pending(self) -> int:
+        """
+        return the number of urls not yet checked, except the urls
+        skipped by this process
+        """
+        return self._o_dbconn.execute(
+            'SELECT COUNT(*) FROM ' + CP.PING_QUEUE_TABLE
+            + ' WHERE run = ? AND done = 0'
+            ' AND (expires IS NOT NULL OR owner IS NOT ?);',
+            (self._i_run, self._s_owner)).fetchone()[0]
+
+    def ss_open_urls(self) -> set:
+        """
+        return the urls of the run not yet checked
+        """
+        return {
+            t_row[0] for t_row in self._o_dbconn.execute(
+                'SELECT url FROM ' + CP.PING_QUEUE_TABLE
+                + ' WHERE run = ? AND done = 0;', (self._i_run,))}
+
+    def fill(self, ls_urls: list):
+        """
+        add the urls to be checked in the run, in this order
+        """
+        with self._o_dbconn:
+            self._o_dbconn.executemany(
+                'INSERT OR IGNORE INTO ' + CP.PING_QUEUE_TABLE
+                + ' (run, url, position) VALUES (?, ?, ?);',
+                ((self._i_run, s_url, i_position)
+                 for i_position, s_url in enumerate(ls_urls)))
+
+    def ls_claim(self, n_batch: int, f_lease: float, f_now=None) -> list:
+        """
+        claim up to n_batch urls not checked and not leased (or whose
+        lease expired) for f_lease seconds, except the urls skipped by
+        this process; returns the urls claimed in queue order
+        """
+        if f_now is None:
+            f_now = time.time()
+        self._o_dbconn.execute('BEGIN IMMEDIATE;')
+        try:
+            ls_urls = [
+                t_row[0] for t_row in self._o_dbconn.execute(
+                    'SELECT url FROM ' + CP.PING_QUEUE_TABLE
+                    + ' WHERE run = ? AND done = 0'
+                    ' AND (expires IS NULL AND owner IS NOT ?'
+                    ' OR expires < ?)'
+                    ' ORDER BY position LIMIT ?;',
+                    (self._i_run, self._s_owner, f_now, n_batch))]
+            self._o_dbconn.executemany(
+                'UPDATE ' + CP.PING_QUEUE_TABLE
+                + ' SET owner = ?, expires = ? WHERE run = ? AND url = ?;',
+                ((self._s_owner, f_now + f_lease, self._i_run, s_url)
+                 for s_url in ls_urls))
+        except BaseException:
+            self._o_dbconn.rollback()
+            raise
+        self._o_dbconn.commit()
+        return ls_urls
+
+    def f_next_expiry(self):
+        """
+        return the time the next lease of another process expires,
+        or None if no url is leased by other processes
+        """
+        return self._o_dbconn.execute(
+            'SELECT MIN(expires) FROM ' + CP.PING_QUEUE_TABLE
+            + ' WHERE run = ? AND done = 0 AND owner <> ?;',
+            (self._i_run, self._s_owner)).fetchone()[0]
+
+    def complete(self, ls_urls: list):
+        """
+        mark urls as checked; the caller is responsible to commit
+        """
+        self._o_dbconn.executemany(
+            'UPDATE ' + CP.PING_QUEUE_TABLE
+            + ' SET done = 1 WHERE run = ? AND url = ?;',
+            ((self._i_run, s_url) for s_url in ls_urls))
+
+    def skip(self, ls_urls: list):
+        """
+        mark urls as skipped by this process: their leases end, and
+        they are left for other processes; the caller is responsible
+        to commit
+        """
+        self._o_dbconn.executemany(
+            'UPDATE ' + CP.PING_QUEUE_TABLE
+            + ' SET owner = ?, expires = NULL WHERE run = ? AND url = ?'
+            ' AND done = 0;',
+            ((self._s_owner, self._i_run, s_url) for s_url in ls_urls))
+
+    def release(self):
+        """
+        give up the leases of this process for urls not checked,
+        including the urls skipped
+        """
+        with self._o_dbconn:
+            self._o_dbconn.execute(
+                'UPDATE ' + CP.PING_QUEUE_TABLE
+                + ' SET owner = NULL, expires = NULL'
+                ' WHERE run = ? AND done = 0 AND owner = ?;',
+                (self._i_run, self._s_owner))
+
+    def clear(self):
+        """
+        remove the urls of the run from the queue
+        """
+        with self._o_dbconn:
+            self._o_dbconn.execute(
+                'DELETE FROM ' + CP.PING_QUEUE_TABLE + ' WHERE run = ?;',
+                (self._i_run,))
@@ -0,0 +1,193 @@
+""" class_pingscheduler
+
+    implements a class to decide which urls ping checks in which
+    order, and to keep the history of all checks.
+
+    Each invocation of ping is a run: a run which was stopped before
+    all urls due were checked (budget exhausted, interrupted) is
+    continued by the next invocation, skipping urls already checked
+    in that run. Urls skipped as their host could not be reached
+    (see PingEngine) are checked again.
+
+    A url is due if it was never checked, if its last check failed,
+    or if its last successful check is older than the time to live.
+    Urls used by records shown in list2/list3 come first; within this
+    rank, failed urls come first, then urls never checked, then the
+    others starting with the oldest check.
+"""
+
+import time
+
+from .class_pingengine import I_STATUS_SKIPPED
+from .metadata_params import ConfigParams as CP
+
+# ratings of records shown in list2 (1...3) and list3 (1...4)
+
+_TS_LISTED_RATINGS = ('1', '2', '3', '4')
+
+
+class PingScheduler:
+    """ Scheduling and history of url checks.
+
+        _o_dbconn           database connection
+
+        _i_run              number of the current run
+
+        _ss_done            urls checked in the current run so far
+
+        _ss_listed          urls of records shown in list2/list3
+
+        _lt_pending         history rows not yet written to database
+    """
+
+    def __init__(self, o_dbconn):
+        """ create tables if necessary """
+        self._o_dbconn = o_dbconn
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.PING_RUNS_TABLE + ' ('
+            'run INTEGER PRIMARY KEY, '
+            'started REAL NOT NULL, '
+            'finished REAL);')
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.PING_HISTORY_TABLE + ' ('
+            'run INT NOT NULL, '
+            'url TEXT NOT NULL, '
+            'status INT, '
+            'error TEXT, '
+            'checked REAL NOT NULL);')
+        self._o_dbconn.execute(
+            'CREATE INDEX IF NOT EXISTS ' + CP.PING_HISTORY_TABLE
+            + '_url ON ' + CP.PING_HISTORY_TABLE + ' (url, checked);')
+        self._o_dbconn.commit()
+        self._i_run = None
+        self._ss_done = set()
+        self._ss_listed = set()
+        self._lt_pending = []
+
+    def b_start_run(self) -> bool:
+        """
+        continue the last run if it was not finished, else start a
+        new run; returns True if a run is continued
+        """
+        if not self.b_join_run():
+            with self._o_dbconn:
+                self._i_run = self._o_dbconn.execute(
+                    'INSERT INTO ' + CP.PING_RUNS_TABLE
+                    + ' (started) VALUES (?);', (time.time(),)).lastrowid
+            self._ss_done = set()
+            return False
+
+        self._ss_done = {
+            t_url[0] for t_url in self._o_dbconn.execute(
+                'SELECT url FROM ' + CP.PING_HISTORY_TABLE
+                + ' WHERE run = ? AND status <> ?;',
+                (self._i_run, I_STATUS_SKIPPED))}
+        return True
+
+    def b_join_run(self) -> bool:
+        """
+        use the last run if it was not finished, without starting a
+        new run (as done by additional ping workers); returns False if
+        there is no such run
+        """
+        t_row = self._o_dbconn.execute(
+            'SELECT run FROM ' + CP.PING_RUNS_TABLE
+            + ' WHERE finished IS NULL ORDER BY run DESC LIMIT 1;'
+            ).fetchone()
+        if t_row is None:
+            return False
+        self._i_run = t_row[0]
+        return True
+
+    def i_get_run(self) -> int:
+        """
+        return the number of the current run
+        """
+        return self._i_run
+
+    def ss_listed_urls(self) -> set:
+        """
+        return the urls of all records which may be shown in
+        list2/list3
+        """
+        return {
+            t_url[0] for t_url in self._o_dbconn.execute(
+                'SELECT DISTINCT url FROM ' + CP.METADATA_TABLE
+                + ' WHERE url NOT NULL AND title NOT NULL'
+                + ' AND rating IN ({0});'.format(
+                    ','.join('?' * len(_TS_LISTED_RATINGS))),
+                _TS_LISTED_RATINGS)}
+
+    def ls_schedule(
+            self,
+            ls_urls: list,
+            o_cache,
+            f_ttl: float,
+            f_now=None) -> list:
+        """
+        return the urls due from the given list (see UrlStatusCache
+        for o_cache) in the order they should be checked; f_ttl is the
+        time to live of a successful check in seconds
+        """
+        if f_now is None:
+            f_now = time.time()
+        self._ss_listed = self.ss_listed_urls()
+
+        lt_due = []
+        for s_url in ls_urls:
+            if s_url in self._ss_done:
+                continue
+            if o_cache.b_is_fresh(s_url, f_ttl, f_now):
+                continue
+            t_status = o_cache.t_get_status(s_url)
+            if t_status is None:
+                t_key = (1, 0.0)
+            elif t_status[1] is not None:
+                t_key = (0, t_status[4])
+            else:
+                t_key = (2, t_status[4])
+            lt_due.append(
+                (self.i_get_rank(s_url),) + t_key + (s_url,))
+
+        lt_due.sort()
+        return [t_due[-1] for t_due in lt_due]
+
+    def i_get_rank(self, s_url: str) -> int:
+        """
+        rank of url for PingEngine: 0 for urls shown in listings,
+        else 1
+        """
+        return int(s_url not in self._ss_listed)
+
+    def add_result(
+            self, s_url: str, i_status: int, s_error: str, f_checked=None):
+        """
+        record the result of a check in the current run; call
+        write_pending to save in database
+        """
+        if f_checked is None:
+            f_checked = time.time()
+        self._ss_done.add(s_url)
+        self._lt_pending.append(
+            (self._i_run, s_url, i_status, s_error, f_checked))
+
+    def write_pending(self):
+        """
+        write all recorded results to the database; the caller is
+        responsible to commit
+        """
+        self._o_dbconn.executemany(
+            'INSERT INTO ' + CP.PING_HISTORY_TABLE
+            + ' (run, url, status, error, checked) '
+            'VALUES (?, ?, ?, ?, ?);', self._lt_pending)
+        self._lt_pending.clear()
+
+    def finish_run(self):
+        """
+        mark the current run as completed
+        """
+        with self._o_dbconn:
+            self._o_dbconn.execute(
+                'UPDATE ' + CP.PING_RUNS_TABLE
+                + ' SET finished = ? WHERE run = ?;',
+                (time.time(), self._i_run))
@@ -0,0 +1,128 @@
+""" class_publishmanifest
+
+    implements a manifest of the files published from the working
+    folder (the listings, exports, compressed copies and search index
+    written by the list tools, see LS_PUBLISHED): content hash, size
+    and modification time of each file, stored as JSON in the folder
+    (ma_publish.json: {"files": {path: [hash, size, mtime_ns]}}).
+
+    The list tools update the manifest after writing their files and
+    report the files changed. As files are only written if their
+    content changes (see AtomicFile), only files with a changed size
+    or modification time are hashed again. A program uploading the
+    files compares the manifest with the one of its last upload to
+    upload only the files changed since (and remove the files removed
+    since).
+"""
+
+import glob
+import json
+import os
+
+from .class_atomicfile import AtomicFile
+from .metadata_hash_tools import s_hash_file
+
+# manifest file
+
+S_PUBLISH_MANIFEST = 'ma_publish.json'
+
+# files published (including compressed copies)
+
+LS_PUBLISHED = [
+    'ma_list*.htm*', 'ma_list*.json*', 'ma_list*.ndjson*',
+    os.path.join('ma_search', '*.json*')]
+
+
+class PublishManifest:
+    """ Files published from a folder.
+
+        _s_folder           folder of the files
+
+        _dt_files           per path (relative to the folder): (hash,
+                            size, mtime_ns)
+
+        _ls_changed         paths of files new or changed by update
+
+        _ls_removed         paths of files removed since the last update
+    """
+
+    def __init__(self, s_folder='.'):
+        """ load manifest of folder (if found) """
+        self._s_folder = s_folder
+        try:
+            with open(os.path.join(s_folder, S_PUBLISH_MANIFEST),
+                      encoding='utf-8') as o_file:
+                self._dt_files = {
+                    s_path: tuple(l_entry) for s_path, l_entry
+                    in json.load(o_file)['files'].items()}
+        except (OSError, ValueError, KeyError, AttributeError):
+            self._dt_files = dict()
+        self._ls_changed = []
+        self._ls_removed = []
+
+    def update(self):
+        """
+        update the manifest from the files found in the folder; files
+        are hashed unless their size and modification time did not
+        change
+        """
+        ss_paths = set()
+        for s_pattern in LS_PUBLISHED:
+            ss_paths.update(
+                os.path.relpath(s_path, self._s_folder) for s_path
+                in glob.glob(os.path.join(self._s_folder, s_pattern)))
+
+        dt_files = dict()
+        self._ls_changed = []
+        for s_path in sorted(ss_paths):
+            s_filename = os.path.join(self._s_folder, s_path)
+            try:
+                o_stat = os.stat(s_filename)
+                t_old = self._dt_files.get(s_path)
+                if t_old is not None \
+                        and t_old[1:] == (o_stat.st_size, o_stat.st_mtime_ns):
+                    dt_files[s_path] = t_old
+                    continue
+                s_hash = s_hash_file(s_filename)
+            except OSError:
+                continue
+            dt_files[s_path] = (s_hash, o_stat.st_size, o_stat.st_mtime_ns)
+            if t_old is None or t_old[0] != s_hash:
+                self._ls_changed.append(s_path)
+        self._ls_removed = sorted(self._dt_files.keys() - dt_files.keys())
+        self._dt_files = dt_files
+
+    def ls_get_changed(self) -> list:
+        """
+        return the paths of the files new or changed by update
+        """
+        return self._ls_changed
+
+    def ls_get_removed(self) -> list:
+        """
+        return the paths of the files removed since the update before
+        """
+        return self._ls_removed
+
+    def save(self):
+        """
+        write the manifest
+        """
+        with AtomicFile(os.path.join(
+                self._s_folder, S_PUBLISH_MANIFEST)) as o_file:
+            o_file.write(json.dumps({
+                'files': {
+                    s_path: list(t_entry)
+                    for s_path, t_entry in sorted(self._dt_files.items())}},
+                indent=1).encode('utf-8'))
+
+    def s_get_report(self) -> str:
+        """
+        return the files changed and removed by update as text for
+        the log
+        """
+        if not self._ls_changed and not self._ls_removed:
+            return 'no published files changed'
+        return ',\n'.join(
+            ['{0} changed'.format(s_path) for s_path in self._ls_changed]
+            + ['{0} removed'.format(s_path) for s_path in self._ls_removed])
@@ -0,0 +1,274 @@
+""" class_searchindex
+
+    implements a search index of the records of a listing (e.g. list2)
+    for a search on the published page, i.e. by the browser without
+    a server: the words of title, subtitle, media and region of the
+    records are written as inverted index in JSON files (see n_write),
+    together with a compressed copy (.gz) of each file.
+
+    The index is split into shards by the first character of the
+    words, and the documents (records as shown) into shards by ranges
+    of record IDs, such that a search loads only the shards of the
+    words searched for and of the records found:
+
+        index.json          version, names of the shards, IDs per
+                            document shard, numbers of the document
+                            shards
+        docs-<n>.json       per record ID from n * IDs per document
+                            shard: title, subtitle, media, date (as
+                            text), url, region
+        <c>.json            per word starting with c: IDs of the
+                            records containing it
+
+    Words are case folded and without diacritics (see ls_tokenize),
+    the search is expected to do the same with the words searched.
+
+    The index is built incrementally: the words of each record are
+    stored in the database with a hash of the columns they are taken
+    from, only records changed since the last build are split into
+    words again, and only shards containing words of changed or
+    removed records are written again.
+
+    The table is not touched by load, i.e. the words survive reloading
+    the metadata.
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+
+from .metadata_date_tools import s_format_date
+from .metadata_export_tools import b_write_text
+from .metadata_params import ConfigParams as CP
+
+# columns whose words are indexed and columns of the documents; the
+# version is part of the hash of the words of a record and is to be
+# changed with ls_tokenize
+
+_LS_INDEX_COLS = ('title', 'subtitle', 'media', 'region_label')
+_LS_DOC_COLS = ('title', 'subtitle', 'media', 'date', 'url', 'region_label')
+_S_INDEX_VERSION = '1'
+
+# record IDs per document shard
+
+_N_DOCS_PER_SHARD = 256
+
+# words of a text
+
+_O_WORD = re.compile(r'\w+')
+
+
+def ls_tokenize(s_text: str) -> list:
+    """
+    return the distinct words of a text, case folded and without
+    diacritics, in order of appearance; single characters are not
+    words
+
+    >>> ls_tokenize('Räder für Senioren - Straße & Räder, 2 x')
+    ['rader', 'fur', 'senioren', 'strasse']
+
+    """
+    if not s_text:
+        return []
+    s_text = ''.join(
+        s_char for s_char in unicodedata.normalize('NFKD', s_text.casefold())
+        if not unicodedata.combining(s_char))
+    return list(dict.fromkeys(
+        s_word for s_word in _O_WORD.findall(s_text) if len(s_word) > 1))
+
+
+def s_get_shard(s_word: str) -> str:
+    """
+    return the name of the shard of a word: its first character if a
+    letter a...z or a digit, else '_'
+
+    >>> s_get_shard('rader'), s_get_shard('2020'), s_get_shard('ça')
+    ('r', '2', '_')
+
+    """
+    s_char = s_word[0]
+    if 'a' <= s_char <= 'z' or '0' <= s_char <= '9':
+        return s_char
+    return '_'
+
+
+def s_get_docs_shard(i_id: int) -> str:
+    """
+    return the name of the document shard of a record ID
+
+    >>> s_get_docs_shard(1), s_get_docs_shard(255), s_get_docs_shard(256)
+    ('docs-0', 'docs-0', 'docs-1')
+
+    """
+    return 'docs-{0}'.format(i_id // _N_DOCS_PER_SHARD)
+
+
+def _s_dumps(x_data) -> str:
+    """
+    return data as compact JSON
+    """
+    return json.dumps(
+        x_data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+class SearchIndex:
+    """ Search index of the records of a listing.
+
+        _o_dbconn           database connection
+
+        _o_listing          listing whose records are indexed (see
+                            b_accept)
+
+        _dt_stored          per ID: (hash, words) as read from the
+                            database
+
+        _dt_records         per ID: (hash, words, document) of the
+                            records added
+
+        _ss_changed         shards containing words of records changed
+                            or removed since the last build
+    """
+
+    def __init__(self, o_dbconn, o_listing):
+        """ create table if necessary and load words of all records """
+        self._o_dbconn = o_dbconn
+        self._o_listing = o_listing
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.SEARCH_TABLE + ' ('
+            'ID INT PRIMARY KEY NOT NULL, '
+            'hash TEXT NOT NULL, '
+            'words TEXT NOT NULL);')
+        self._o_dbconn.commit()
+        self._dt_stored = {
+            t_row[0]: (t_row[1], t_row[2].split())
+            for t_row in self._o_dbconn.execute(
+                'SELECT ID, hash, words FROM ' + CP.SEARCH_TABLE + ';')}
+        self._dt_records = dict()
+        self._ss_changed = set()
+
+    def b_accept(self, o_row) -> bool:
+        """
+        true if the row is part of the listing indexed
+        """
+        return self._o_listing.b_accept(o_row)
+
+    def add(self, o_row):
+        """
+        add an accepted row, its words are taken from the database
+        unless the row changed
+        """
+        s_hash = hashlib.sha256(repr((
+            _S_INDEX_VERSION,
+            [o_row[s_col] for s_col in _LS_INDEX_COLS])).encode()).hexdigest()
+        t_stored = self._dt_stored.get(o_row['ID'])
+        if t_stored is not None and t_stored[0] == s_hash:
+            ls_words = t_stored[1]
+        else:
+            ls_words = list(dict.fromkeys(
+                s_word for s_col in _LS_INDEX_COLS
+                for s_word in ls_tokenize(o_row[s_col])))
+            self._ss_changed.update(s_get_shard(s_word) for s_word in ls_words)
+            if t_stored is not None:
+                self._ss_changed.update(
+                    s_get_shard(s_word) for s_word in t_stored[1])
+        ls_document = [o_row[s_col] for s_col in _LS_DOC_COLS]
+        ls_document[3] = s_format_date(ls_document[3])
+        self._dt_records[o_row['ID']] = (s_hash, ls_words, ls_document)
+
+    def t_get_counts(self) -> tuple:
+        """
+        return (records indexed, records changed, records removed)
+        """
+        return (
+            len(self._dt_records),
+            sum(self._dt_stored.get(i_id, (None,))[0] != t_record[0]
+                for i_id, t_record in self._dt_records.items()),
+            len(self._dt_stored.keys() - self._dt_records.keys()))
+
+    def n_write(self, s_folder: str) -> int:
+        """
+        write the index files to the given folder (created if
+        necessary): the shards containing words of changed or removed
+        records (or missing), the document shards and list of shards
+        (if changed); returns the number of files written
+        """
+        for i_id in self._dt_stored.keys() - self._dt_records.keys():
+            self._ss_changed.update(
+                s_get_shard(s_word) for s_word in self._dt_stored[i_id][1])
+
+        # IDs per word, per shard
+
+        ddl_shards = dict()
+        for i_id in sorted(self._dt_records):
+            for s_word in self._dt_records[i_id][1]:
+                ddl_shards.setdefault(s_get_shard(s_word), dict()) \
+                    .setdefault(s_word, []).append(i_id)
+
+        os.makedirs(s_folder, exist_ok=True)
+        n_written = 0
+        for s_shard, dl_words in ddl_shards.items():
+            s_filename = os.path.join(s_folder, s_shard + '.json')
+            if s_shard in self._ss_changed \
+                    or not os.path.exists(s_filename):
+                n_written += b_write_text(s_filename, _s_dumps(dl_words))
+
+        # documents per shard, written if changed
+
+        ddl_docs = dict()
+        for i_id, t_record in self._dt_records.items():
+            ddl_docs.setdefault(s_get_docs_shard(i_id), dict())[i_id] = \
+                t_record[2]
+        for s_shard, dl_docs in ddl_docs.items():
+            n_written += b_write_text(
+                os.path.join(s_folder, s_shard + '.json'), _s_dumps(dl_docs))
+
+        # shards without words or documents (and the documents of the
+        # former unsharded layout)
+
+        ss_removed = (self._ss_changed - ddl_shards.keys()) | (
+            {s_get_docs_shard(i_id) for i_id in self._dt_stored}
+            - ddl_docs.keys()) | {'docs'}
+        for s_shard in ss_removed:
+            for s_filename in [s_shard + '.json', s_shard + '.json.gz']:
+                try:
+                    os.remove(os.path.join(s_folder, s_filename))
+                except OSError:
+                    pass
+
+        n_written += b_write_text(
+            os.path.join(s_folder, 'index.json'), _s_dumps({
+                'version': _S_INDEX_VERSION,
+                'fields': list(_LS_DOC_COLS),
+                'shards': sorted(ddl_shards),
+                'docs_per_shard': _N_DOCS_PER_SHARD,
+                'docs': sorted({
+                    i_id // _N_DOCS_PER_SHARD
+                    for i_id in self._dt_records})}))
+        return n_written
+
+    def save(self):
+        """
+        store the words of the records added, remove all others
+        """
+        with self._o_dbconn:
+            self._o_dbconn.executemany(
+                'DELETE FROM ' + CP.SEARCH_TABLE + ' WHERE ID = ?;',
+                ((i_id,) for i_id in self._dt_stored
+                 if i_id not in self._dt_records))
+            self._o_dbconn.executemany(
+                'INSERT OR REPLACE INTO ' + CP.SEARCH_TABLE
+                + ' (ID, hash, words) VALUES (?, ?, ?);',
+                ((i_id, t_record[0], ' '.join(t_record[1]))
+                 for i_id, t_record in self._dt_records.items()
+                 if self._dt_stored.get(i_id, (None,))[0] != t_record[0]))
+        self._dt_stored = {
+            i_id: t_record[:2] for i_id, t_record in self._dt_records.items()}
+        self._dt_records = dict()
+        self._ss_changed = set()
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,107 @@
+""" class_urlstatus
+
+    implements a class to keep the result of url checks in the
+    database such that ping can skip urls checked recently and
+    revalidate the others using conditional requests.
+
+    The table is not touched by load, i.e. the status survives
+    reloading the metadata.
+"""
+
+import time
+
+from .metadata_params import ConfigParams as CP
+from .metadata_http_tools import ds_conditional_headers
+
+
+class UrlStatusCache:
+    """ Status of url checks, stored per url.
+
+        _o_dbconn           database connection
+
+        _dt_status          status per url as read from the database:
+                            (status, error, etag, last_modified,
+                            checked) where checked is the time of the
+                            last check in seconds since the epoch
+
+        _lt_pending         rows not yet written to the database
+    """
+
+    def __init__(self, o_dbconn):
+        """ create table if necessary and load all entries """
+        self._o_dbconn = o_dbconn
+        self._o_dbconn.execute(
+            'CREATE TABLE IF NOT EXISTS ' + CP.URL_STATUS_TABLE + ' ('
+            'url TEXT PRIMARY KEY NOT NULL, '
+            'status INT, '
+            'error TEXT, '
+            'etag TEXT, '
+            'last_modified TEXT, '
+            'checked REAL);')
+        self._dt_status = {
+            t_row[0]: t_row[1:] for t_row in self._o_dbconn.execute(
+                'SELECT url, status, error, etag, last_modified, checked '
+                'FROM ' + CP.URL_STATUS_TABLE + ';')}
+        self._lt_pending = []
+
+    def t_get_status(self, s_url: str) -> tuple:
+        """
+        return (status, error, etag, last_modified, checked) for the
+        given url or None if url was never checked
+        """
+        return self._dt_status.get(s_url)
+
+    def b_is_fresh(self, s_url: str, f_ttl: float, f_now=None) -> bool:
+        """
+        true if the url was checked successfully less than f_ttl
+        seconds ago, i.e. it need not be checked again
+        """
+        t_status = self._dt_status.get(s_url)
+        if t_status is None or t_status[1] is not None:
+            return False
+        if f_now is None:
+            f_now = time.time()
+        return f_now - t_status[4] < f_ttl
+
+    def ds_get_headers(self, s_url: str) -> dict:
+        """
+        return the headers for a conditional request for the given url
+        """
+        t_status = self._dt_status.get(s_url)
+        if t_status is None:
+            return dict()
+        return ds_conditional_headers(t_status[2], t_status[3])
+
+    def set_status(
+            self,
+            s_url: str,
+            i_status: int,
+            s_error: str,
+            s_etag: str,
+            s_last_modified: str,
+            f_checked=None):
+        """
+        record the result of a check; after 304 (not modified) the
+        validators of the earlier response are kept unless new ones
+        were sent; call write_pending to save in database
+        """
+        if f_checked is None:
+            f_checked = time.time()
+        t_old = self._dt_status.get(s_url)
+        if i_status == 304 and t_old is not None:
+            s_etag = s_etag or t_old[2]
+            s_last_modified = s_last_modified or t_old[3]
+        t_status = (i_status, s_error, s_etag, s_last_modified, f_checked)
+        self._dt_status[s_url] = t_status
+        self._lt_pending.append((s_url,) + t_status)
+
+    def write_pending(self):
+        """
+        write all recorded results to the database; the caller is
+        responsible to commit
+        """
+        self._o_dbconn.executemany(
+            'INSERT OR REPLACE INTO ' + CP.URL_STATUS_TABLE +
+            ' (url, status, error, etag, last_modified, checked) '
+            'VALUES (?, ?, ?, ?, ?, ?);', self._lt_pending)
+        self._lt_pending.clear()
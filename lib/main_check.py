@@ -12,12 +12,14 @@ specifications.
 
 import csv
 import re
+from concurrent.futures import ThreadPoolExecutor
 from os.path import basename, splitext
 
-from lib import ErrorReports, ConfigParams
+from lib import ErrorReports, ConfigParams, ArchiveIndex
 from lib import report_log, s_check_for_valid_file, \
     s_url_is_alive, s_trim, ls_import_valid_string_values, b_is_valid_path, \
     s_check_url, s_make_backup_filename, s_check_date, TagString
+from lib.metadata_check_tools import S_NOT_FOUND
 
 
 def fix_labels(n_max_col: int, sl_labels: list):
@@ -39,9 +41,12 @@ def fix_labels(n_max_col: int, sl_labels: list):
 def main(
         s_config_file: str,
         b_check_ext_links: bool,
-        b_check_int_links: bool) -> int:
+        b_check_int_links: bool,
+        n_workers=8) -> int:
     """
-    main program - exits (1) on error, exits (0) if all checks passed
+    main program - exits (1) on error, exits (0) if all checks passed;
+    the reference copies (b_check_int_links) are checked by n_workers
+    threads
     """
 
     # initialize
@@ -102,6 +107,13 @@ def main(
             .format(o_error.n_error_count()))
         return 1
 
+    # reference copies are looked up in an index of the archive folder
+    # (each folder is read once), those found are checked on disk
+    # after the metadata: (line, label, file, found)
+
+    o_index = ArchiveIndex(s_backup_path)
+    lt_refs = []
+
     # validate vv_regions as they will be read into the metadata database
 
     report_log("\n*** check processing {0} ***\n".format(s_filename_r))
@@ -346,6 +358,7 @@ def main(
                 # check reference copy
 
                 if b_pass_basic_checks('ref_copy', sl_row):
+                    s_ref_copy = s_check_item
                     s_check_item = s_backup_path + s_check_item
                     s_basename = basename(s_check_item)
                     s_file_no_ext = splitext(s_basename)[0]
@@ -363,14 +376,9 @@ def main(
                     # check if reference copy is available
 
                     if b_check_int_links:
-                        s_result = s_check_for_valid_file(s_check_item)
-                        if s_result is not None:
-                            o_error.report_with_std_msg(
-                                o_reader.line_num,
-                                sl_labels[i_column],
-                                ('\n{0}\n{1}\n')
-                                .format(s_check_item, s_result)
-                            )
+                        lt_refs.append((
+                            o_reader.line_num, sl_labels[i_column],
+                            s_check_item, o_index.b_files_exist(s_ref_copy)))
 
                 # check tags in notes
 
@@ -433,6 +441,16 @@ def main(
     except StopIteration:
         o_error.report_empty_file(s_filename_m)
 
+    # check reference copies concurrently, report in the order of rows
+
+    with ThreadPoolExecutor(max_workers=n_workers) as o_pool:
+        for (i_line, s_label, s_file, _), s_result in zip(lt_refs, o_pool.map(
+                lambda t_ref: s_check_for_valid_file(t_ref[2])
+                if t_ref[3] else S_NOT_FOUND, lt_refs)):
+            if s_result is not None:
+                o_error.report_with_std_msg(
+                    i_line, s_label, ('\n{0}\n{1}\n').format(s_file, s_result))
+
     # output final, completion message
 
     report_log(
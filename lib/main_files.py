@@ -1,20 +1,27 @@
 """ma_files
 
-This utility validates the files in the archive folder and reports all
-files not found in the metadata database.
+This utility validates the files in the archive folder (including
+subfolders) and reports all files not found in the metadata database,
+and all records whose reference copy is not found in the archive
+folder.
+
+The names of the reference copies are read in a single query and
+compared with the manifest of the archive folder (see ArchiveManifest),
+which is refreshed first.
 """
 
+import glob
 import sqlite3
-import os
+from fnmatch import fnmatchcase
 
 from lib import ConfigParams as CP
 from lib import ErrorReports as ER
-from lib import report_log
+from lib import ArchiveManifest, report_log
 
 
-def main(s_config_filename: str) -> None:
+def main(s_config_filename: str, b_rescan=False) -> None:
     """
-    main program
+    main program; b_rescan reads all folders of the archive again
     """
 
     # initialize
@@ -26,37 +33,58 @@ def main(s_config_filename: str) -> None:
 
     s_backup_path = o_params.s_get_config_path('ref_files')
 
-    # prepare database
+    # read reference copies of all records: paths and search patterns
 
     o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
-    o_dbcursor = o_dbconn.cursor()
-    s_request = (
-        "SELECT EXISTS (SELECT 1 FROM " + CP.METADATA_TABLE +
-        " WHERE ref_copy = '{0}' LIMIT 1);"
-        )
+    lt_records = o_dbconn.execute(
+        'SELECT ID, title, ref_copy FROM ' + CP.METADATA_TABLE
+        + ' WHERE ref_copy NOT NULL ORDER BY ID;').fetchall()
+
+    ss_used = set()
+    ls_patterns = []
+    for _, _, s_ref_copy in lt_records:
+        if glob.has_magic(s_ref_copy):
+            ls_patterns.append(s_ref_copy)
+        else:
+            ss_used.add(s_ref_copy)
+
+    # check all files in the archive folder
 
-    # loop over all files and check if record exists
+    o_manifest = ArchiveManifest(o_dbconn, s_backup_path)
+    o_manifest.refresh(b_rescan)
+    o_dbconn.close()
+    o_archive = o_manifest.o_get_index()
 
     n_count_good = 0
     n_count_bad = 0
 
-    for s_file in os.scandir(s_backup_path):
-        t_result = o_dbcursor.execute(s_request.format(s_file.name))
-        if t_result.fetchone()[0]:
+    for s_file in o_manifest.ls_get_files():
+        if s_file in ss_used or any(
+                fnmatchcase(s_file, s_pattern) for s_pattern in ls_patterns):
             n_count_good += 1
         else:
             n_count_bad += 1
             o_error.report_error(
                 "File in reference folder but not in metadata database:\n"
-                "{0}".format(s_file.name))
+                "{0}".format(s_file))
 
-    o_dbconn.close()
+    # check reference copies of all records
+
+    n_count_missing = 0
+
+    for i_id, s_title, s_ref_copy in lt_records:
+        if not o_archive.b_files_exist(s_ref_copy):
+            n_count_missing += 1
+            o_error.report_error(
+                "Reference file for row {0} not in reference folder: {1}\n"
+                "{2}".format(i_id, s_title, s_ref_copy))
 
     # output some statistics
 
     report_log(
         "\n*** files completed: ***\n"
         "{0} files tested ok,\n"
-        "{1} files not used in database.\n"
-        .format(n_count_good, n_count_bad)
+        "{1} files not used in database,\n"
+        "{2} reference files of records not found.\n"
+        .format(n_count_good, n_count_bad, n_count_missing)
     )
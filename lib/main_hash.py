@@ -0,0 +1,137 @@
+"""hash
+
+This utility computes the content hashes of all files in the archive
+folder and reports groups of identical files (duplicates, e.g. the
+same article saved under different backup filenames) together with
+the records using them.
+
+The hashes are kept in the manifest of the archive folder (see
+ArchiveManifest): only files new or changed since the last run are
+hashed, several files at a time. With --verify all files are hashed
+again and compared with the stored hash; a file whose content changed
+although its size and modification time did not is reported as
+corrupted.
+"""
+
+import sqlite3
+
+from lib import ConfigParams as CP
+from lib import ErrorReports as ER
+from lib import ArchiveManifest, report_log
+from lib.metadata_hash_tools import it_hash_files
+
+# number of hashes stored per database transaction
+
+_N_BATCH_SIZE = 200
+
+
+def main(
+        s_config_filename: str,
+        b_verify=False,
+        b_rescan=False,
+        n_workers=4) -> int:
+    """
+    main program - returns 1 if files could not be read or are
+    corrupted, else 0; b_verify hashes all files again, b_rescan
+    reads all folders of the archive again, n_workers files are
+    hashed concurrently
+    """
+
+    # initialize
+
+    report_log("\n*** hash executing ***\n")
+
+    o_error = ER()
+    o_params = CP(o_error, s_config_filename)
+
+    s_backup_path = o_params.s_get_config_path('ref_files')
+
+    o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
+    o_manifest = ArchiveManifest(o_dbconn, s_backup_path)
+    o_manifest.refresh(b_rescan)
+
+    # hash new and changed files (or all files)
+
+    ls_files = o_manifest.ls_get_files()
+    ls_todo = ls_files if b_verify else [
+        s_path for s_path in ls_files
+        if o_manifest.t_get_entry(s_path)[3] is None]
+
+    n_count_new = 0
+    n_count_verified = 0
+    n_count_corrupt = 0
+    lt_hashes = []
+    for s_path, s_hash, s_result, t_stat in it_hash_files(
+            s_backup_path, ls_todo, n_workers):
+        if s_hash is None:
+            o_error.report_error(
+                "File in reference folder cannot be read:\n"
+                "{0}\n{1}".format(s_path, s_result))
+            continue
+
+        t_entry = o_manifest.t_get_entry(s_path)
+        if t_entry is None:
+            continue
+        if t_entry[3] is None:
+            lt_hashes.append((s_path, s_hash, t_stat))
+        elif t_entry[3] == s_hash:
+            n_count_verified += 1
+        elif t_entry[1:3] == t_stat:
+            n_count_corrupt += 1
+            o_error.report_error(
+                "File in reference folder changed although its size and "
+                "modification time did not (corrupted?):\n"
+                "{0}".format(s_path))
+
+        if len(lt_hashes) >= _N_BATCH_SIZE:
+            n_count_new += o_manifest.set_hashes(lt_hashes)
+            lt_hashes.clear()
+    n_count_new += o_manifest.set_hashes(lt_hashes)
+
+    # report groups of identical files with the records using them
+
+    dl_records = dict()
+    for i_id, s_title, s_ref_copy in o_dbconn.execute(
+            'SELECT ID, title, ref_copy FROM ' + CP.METADATA_TABLE
+            + ' WHERE ref_copy NOT NULL ORDER BY ID;'):
+        dl_records.setdefault(s_ref_copy, []).append((i_id, s_title))
+    o_dbconn.close()
+
+    dls_groups = dict()
+    for s_path in ls_files:
+        t_entry = o_manifest.t_get_entry(s_path)
+        if t_entry is not None and t_entry[3] is not None:
+            dls_groups.setdefault(t_entry[3], []).append(s_path)
+
+    n_count_groups = 0
+    n_count_copies = 0
+    for ls_group in sorted(
+            ls_paths for ls_paths in dls_groups.values()
+            if len(ls_paths) > 1):
+        n_count_groups += 1
+        n_count_copies += len(ls_group) - 1
+        ls_lines = []
+        for s_path in ls_group:
+            ls_lines.append("{0}: {1}".format(s_path, ', '.join(
+                "row {0} ({1})".format(i_id, s_title)
+                for i_id, s_title in dl_records.get(s_path, []))
+                or 'not used in database'))
+        report_log(
+            "Identical files ({0} bytes):\n{1}\n".format(
+                o_manifest.t_get_entry(ls_group[0])[1],
+                '\n'.join(ls_lines)))
+
+    # output some statistics
+
+    report_log(
+        "\n*** hash completed: ***\n"
+        "{0} files in reference folder,\n"
+        "{1} files hashed,\n"
+        "{2} files verified,\n"
+        "{3} files corrupted,\n"
+        "{4} groups of identical files with {5} surplus copies.\n"
+        .format(
+            len(ls_files), n_count_new, n_count_verified, n_count_corrupt,
+            n_count_groups, n_count_copies)
+    )
+    return 0 if o_error.n_error_count() == 0 else 1
@@ -0,0 +1,68 @@
+"""index
+
+Create the search index of the records of list2 for a search on the
+published page: the words of title, subtitle, media and region are
+written as inverted index, split into shards by their first character,
+and the records as shown into shards by ranges of IDs, as compressed
+and uncompressed JSON files to the folder ma_search next to
+ma_list2.htm (see SearchIndex).
+
+Only records changed since the last run are split into words again,
+and only shards containing their words are written again.
+"""
+
+import sqlite3
+
+from lib import ConfigParams as CP
+from lib import ErrorReports as ER
+from lib import report_log
+from lib import List2Sink, SearchIndex, n_scan
+from lib import PublishManifest
+
+# folder of the index files
+
+S_INDEX_FOLDER = 'ma_search'
+
+
+def main(s_config_filename: str) -> None:
+    """
+    main program
+    """
+
+    # initialize
+
+    report_log("\n*** index executing ***\n")
+
+    o_error = ER()
+    o_params = CP(o_error, s_config_filename)
+
+    # read records of list2, words of unchanged records are taken from
+    # the database
+
+    o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
+    o_index = SearchIndex(o_dbconn, List2Sink())
+    n_scan(o_dbconn, [o_index])
+
+    n_indexed, n_changed, n_removed = o_index.t_get_counts()
+    n_written = o_index.n_write(S_INDEX_FOLDER)
+    o_index.save()
+    o_dbconn.close()
+
+    # update manifest of published files, files changed are reported
+
+    o_publish = PublishManifest()
+    o_publish.update()
+    o_publish.save()
+
+    # output some statistics
+
+    report_log(
+        "\n*** index completed ***\n"
+        "{0} records indexed,\n"
+        "{1} records changed, {2} records removed,\n"
+        "{3} files written to {4},\n"
+        "{5}.\n"
+        .format(
+            n_indexed, n_changed, n_removed, n_written, S_INDEX_FOLDER,
+            o_publish.s_get_report())
+    )
@@ -5,29 +5,26 @@ order; output is written to a file with the same name as this file and
 having the extension .htm
 
 Format is to suit radelnohnealter.de/presse format
+
+With --export the records listed are also written as NDJSON or JSON
+(ma_list2.ndjson, ma_list2.json), and compressed copies (.gz) of the
+files are created for static serving.
 """
-# pylint: disable=R0912
-# pylint: disable=R0914
-# pylint: disable=R0915
 
-import locale
-import datetime
 import sqlite3
 
-from os.path import basename, splitext
-
 from lib import ConfigParams as CP
 from lib import ErrorReports as ER
 from lib import report_log
-from lib import s_format_heading
-from lib import s_format_entry
-from lib import s_icons
-from lib import TagString
+from lib import b_write_gzip
+from lib import FragmentCache, List2Sink, n_scan
+from lib import PublishManifest
 
 
-def main(s_config_filename: str) -> None:
+def main(s_config_filename: str, s_export=None) -> None:
     """
-    main program
+    main program - s_export is the format of the export (see
+    LS_EXPORT_FORMATS) or None
     """
 
     # initialize
@@ -37,111 +34,43 @@ def main(s_config_filename: str) -> None:
     o_error = ER()
     o_params = CP(o_error, s_config_filename)
 
-    locale.setlocale(locale.LC_TIME, 'de_DE.utf-8')
-
-    s_base_filename = splitext(basename(__file__))[0]
-    o_output_file = open('ma_list2.htm', 'w')
-
-    # copy part1 from template
-
-    o_input_file = open('htm/' + s_base_filename + '.htm', 'r')
-    for s_line in o_input_file:
-        s_line = s_line.rstrip()
-        if s_line == '<>':
-            break
-        o_output_file.write(s_line + '\n')
-
-    # create heading
-
-    d_today = datetime.date.today()
-
-    o_output_file.write(
-        '<h1>Medienbeiträge (nach Regionen und Zeit sortiert)</h1>\n'
-        '<p>erstellt am {0}</p>\n'
-        .format(d_today.strftime('%d. %B %Y'))
-    )
-
-    # prepare database
+    # read all records and create listing (see List2Sink), sections of
+    # regions without changes are taken from the cache
 
     o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
-    o_dbcursor = o_dbconn.cursor()
-
-    # loop over all files and check if record exists
-
-    s_request = (
-        '''
-        SELECT m.title, m.subtitle, m.url, m.media, m.url_ok,
-        m.date, m.region_label, m.notes, m.region_level
-        FROM {0} AS m
-        WHERE (m.title IS NOT NULL) AND
-        (SUBSTR(m.region, 1, 2)=="DE")
-        AND (m.url_ok) AND (m.rating IN ("1","2","3"))
-        ORDER BY m.region_level ASC, m.region_label ASC, m.date DESC;
-        '''
-        .format(CP.METADATA_TABLE)
-        )
-
-    # ready to loop over each entry
-
-    s_last_place = str()
-    n_count = 0
-
-    for ts_row in o_dbcursor.execute(s_request):
-
-        n_count += 1
-
-        # new group?
-
-        if s_last_place != ts_row[6]:
-            if n_count > 1:
-                o_output_file.write('</p>\n')
-            s_last_place = ts_row[6]
-            o_output_file.write(s_format_heading(ts_row[6]) + '\n<p>\n')
-        else:
-            o_output_file.write('<br />\n')
-
-        # determine icons
-
-        o_tags = TagString(ts_row[7])
-        o_tags.with_simple('#paywall')
-        o_tags.with_excls('#media_type', ['#video', '#audio'])
-        sl_tags = []
-        if o_tags.b_has_simple_tag('#paywall'):
-            sl_tags.append('#paywall')
-        sl_tags.append(o_tags.s_get_excls_tag('#media_type', '#other'))
-        s_icon_list = s_icons(sl_tags)
-
-        o_output_file.write(
-            s_format_entry(
-                ts_row[0],  # title
-                ts_row[1],  # subtitle
-                ts_row[2],  # url
-                ts_row[3],  # media
-                ts_row[5],  # date
-                s_icon_list
-                ))
-
-        # that's it for this item
-
-    # end of loop, output closing tag
-
-    if n_count > 1:
-        o_output_file.write('</p>\n')
+    o_cache = FragmentCache(o_dbconn, 'list2')
+    o_sink = List2Sink(o_cache=o_cache)
+    n_scan(o_dbconn, [o_sink])
 
+    n_count = o_sink.n_write()
+    o_cache.save()
     o_dbconn.close()
 
-    # copy remaining part of template
+    # export records listed, compressed copies for static serving
+
+    if s_export is not None:
+        o_sink.n_export(s_export)
+        b_write_gzip(o_sink.s_get_filename(), o_sink.b_get_written())
 
-    for s_line in o_input_file:
-        s_line = s_line.rstrip()
-        o_output_file.write(s_line + '\n')
+    # update manifest of published files, files changed are reported
 
-    o_output_file.close()
+    o_publish = PublishManifest()
+    o_publish.update()
+    o_publish.save()
 
     # output some statistics
 
     report_log(
         "\n*** list2 completed ***\n"
-        "{0} records created.\n"
-        .format(n_count)
+        "{0} records created,\n"
+        "{1} regions unchanged, {2} regions rendered,\n"
+        "{3}{4},\n"
+        "{5}.\n"
+        .format(
+            n_count, *o_cache.t_get_counts(),
+            'ma_list2.htm written' if o_sink.b_get_written()
+            else 'ma_list2.htm unchanged',
+            '' if s_export is None else ',\n{0} exported'.format(
+                o_sink.s_get_export_filename(s_export)),
+            o_publish.s_get_report())
     )
@@ -7,54 +7,112 @@ same name as this file and having the extension .htm
 Note: Only items with a rating of 1...4 are listed!
 
 Format is for use in mailings
+
+With --from and --to a listing is created for each month of the range
+(ma_list3_YYYY-MM.htm) from a single query, and an index page
+(ma_list3_index.htm) links them.
+
+With --export the records listed are also written as NDJSON or JSON
+(e.g. ma_list3.ndjson), and compressed copies (.gz) of all files are
+created for static serving.
 """
-# pylint: disable=R0912
-# pylint: disable=R0914
-# pylint: disable=R0915
 
-import locale
 import datetime
 import sqlite3
 import re
 
-from os.path import basename, splitext
 from dateutil.relativedelta import relativedelta
 
 from lib import ConfigParams as CP
 from lib import ErrorReports as ER
 from lib import report_log
-from lib import s_format_heading
-from lib import s_format_entry
-from lib import s_sups
-from lib import TagString
+from lib import HtmlTemplate, b_write_gzip
+from lib import s_format_day, s_format_month
+from lib import List3Sink, n_scan
+from lib import PublishManifest
+
+
+def o_get_month(s_month: str, o_error: ER) -> datetime.date:
+    """
+    return the first day of the given month YYYY-MM (previous month
+    if None), or None (and report an error) if the month is invalid
+    """
+    if s_month is None:
+        return datetime.date.today() + relativedelta(day=1, months=-1)
+
+    o_match = re.search('^([0-9]{4})-([0-9]{2})$', s_month)
+    try:
+        if o_match is None:
+            raise ValueError()
+        return datetime.date(
+            int(o_match.group(1)),
+            int(o_match.group(2)),
+            1
+            )
+    except ValueError:
+        o_error.report_error('Invalid month: >{0}<'.format(s_month))
+        return None
+
+
+def lo_get_months(o_first: datetime.date, o_last: datetime.date) -> list:
+    """
+    return the first days of all months from o_first to o_last
+    """
+    lo_dates = []
+    o_date = o_first
+    while o_date <= o_last:
+        lo_dates.append(o_date)
+        o_date += relativedelta(months=1)
+    return lo_dates
 
 
-def main(s_config_filename: str, s_month: str) -> int:
+def _ls_index(lt_months: list) -> list:
     """
-    main program
+    return the entries of the index page from (month, filename,
+    number of records), most recent month first
+    """
+    return [
+        '<li><a href="{0}">{1}</a> ({2})</li>\n'
+        .format(s_filename, s_format_month(o_date), n_count)
+        for o_date, s_filename, n_count in reversed(lt_months)]
+
+
+def main(
+        s_config_filename: str,
+        s_month: str,
+        s_from=None,
+        s_to=None,
+        s_export=None) -> int:
+    """
+    main program - a listing for s_month, or for each month from
+    s_from to s_to (defaults to previous month); s_export is the
+    format of the export (see LS_EXPORT_FORMATS) or None
     """
 
-    # check s_month for correct syntax YYYY-MM or create default
+    # check months for correct syntax YYYY-MM or create default
 
     o_error = ER()
 
-    o_date = None
-    if s_month is None:
-        o_date = datetime.date.today() + relativedelta(day=1, months=-1)
-        s_month = o_date.strftime('%Y-%m')
+    b_range = s_from is not None or s_to is not None
+    if not b_range:
+        o_date = o_get_month(s_month, o_error)
+        if o_date is None:
+            return 1
+        lo_dates = [o_date]
+    elif s_from is None:
+        o_error.report_error('Missing first month: --from')
+        return 1
     else:
-        o_match = re.search('^([0-9]{4})-([0-9]{2})$', s_month)
-        try:
-            if o_match is None:
-                raise ValueError()
-            o_date = datetime.date(
-                int(o_match.group(1)),
-                int(o_match.group(2)),
-                1
-                )
-        except ValueError:
-            o_error.report_error('Invalid month: >{0}<'.format(s_month))
+        o_first = o_get_month(s_from, o_error)
+        o_last = o_get_month(s_to, o_error)
+        if o_first is None or o_last is None:
+            return 1
+        if o_first > o_last:
+            o_error.report_error(
+                'Invalid range of months: >{0}< to >{1}<'
+                .format(s_from, o_last.strftime('%Y-%m')))
             return 1
+        lo_dates = lo_get_months(o_first, o_last)
 
     # initialize
 
@@ -62,112 +120,62 @@ def main(s_config_filename: str, s_month: str) -> int:
 
     o_params = CP(o_error, s_config_filename)
 
-    locale.setlocale(locale.LC_TIME, 'de_DE.utf-8')
-
-    s_base_filename = splitext(basename(__file__))[0]
-    o_output_file = open('ma_list3.htm', 'w')
-
-    # copy part1 from template
-
-    o_input_file = open('htm/' + s_base_filename + '.htm', 'r')
-    for s_line in o_input_file:
-        s_line = s_line.rstrip()
-        if s_line == '<>':
-            break
-        o_output_file.write(s_line + '\n')
-
-    # create heading
-
-    o_output_file.write(
-        '<h2>Radeln ohne Alter in den Medien ({0})</h2>\n'
-        .format(o_date.strftime('%B %Y'))
-    )
+    if not b_range:
+        lo_sinks = [List3Sink(lo_dates[0])]
+    else:
+        lo_sinks = [
+            List3Sink(o_date, o_date.strftime('ma_list3_%Y-%m.htm'))
+            for o_date in lo_dates]
 
-    # prepare database
+    # read the records of all months (see List3Sink)
 
     o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
-    o_dbcursor = o_dbconn.cursor()
-
-    # loop over all files and check if record exists
-
-    s_request = (
-        '''
-        SELECT m.title, m.subtitle, m.url, m.media, m.url_ok,
-        m.date, m.region_label, m.notes, m.region_level
-        FROM {0} AS m
-        WHERE (m.title IS NOT NULL)
-        AND (m.url_ok) AND (m.rating IN ("1","2","3","4"))
-        AND (m.date LIKE "{1}%")
-        ORDER BY m.region_level ASC, m.region_label ASC, m.date;
-        '''
-        .format(CP.METADATA_TABLE, s_month)
-        )
-
-    # ready to loop over each entry
-
-    s_last_place = str()
-    n_count = 0
-
-    for ts_row in o_dbcursor.execute(s_request):
-
-        n_count += 1
-
-        # new group?
-
-        if s_last_place != ts_row[6]:
-            if n_count > 1:
-                o_output_file.write('\n</p>\n')
-            s_last_place = ts_row[6]
-            o_output_file.write(
-                s_format_heading(ts_row[6]) + '\n<p>\n')
-        else:
-            o_output_file.write('<br />\n')
-
-        # determine flags
-
-        o_tags = TagString(ts_row[7])
-        o_tags.with_simple('#paywall')
-        o_tags.with_excls('#media_type', ['#video', '#audio'])
-        sl_tags = []
-        if o_tags.b_has_simple_tag('#paywall'):
-            sl_tags.append('#paywall')
-        sl_tags.append(o_tags.s_get_excls_tag('#media_type', '#other'))
-        s_sups_list = s_sups(sl_tags)
-
-        o_output_file.write(
-            s_format_entry(
-                ts_row[0],  # title
-                ts_row[1],  # subtitle
-                ts_row[2],  # url
-                ts_row[3],  # media
-                ts_row[5],  # date
-                '',
-                s_sups_list
-                ))
-
-        # that's it for this item
-
-    # end of loop, output closing tag
-
-    if n_count > 1:
-        o_output_file.write('</p>')
-
+    n_scan(o_dbconn, lo_sinks, (
+        lo_dates[0].strftime('%Y-%m'),
+        (lo_dates[-1] + relativedelta(months=1)).strftime('%Y-%m')))
     o_dbconn.close()
 
-    # copy remaining part of template
-
-    for s_line in o_input_file:
-        s_line = s_line.rstrip()
-        o_output_file.write(s_line + '\n')
-
-    o_output_file.close()
+    # create listings (and exports), then index
+
+    ln_counts = []
+    for o_sink in lo_sinks:
+        ln_counts.append(o_sink.n_write())
+        if s_export is not None:
+            o_sink.n_export(s_export)
+            b_write_gzip(o_sink.s_get_filename(), o_sink.b_get_written())
+
+    if b_range:
+        b_written = HtmlTemplate.o_load('htm/main_list3_index.htm').b_write(
+            'ma_list3_index.htm', {
+                'heading': 'Radeln ohne Alter in den Medien',
+                'date': s_format_day(datetime.date.today()),
+                'body': _ls_index([
+                    (o_date, o_sink.s_get_filename(), n_count)
+                    for o_date, o_sink, n_count in zip(
+                        lo_dates, lo_sinks, ln_counts)])})
+        if s_export is not None:
+            b_write_gzip('ma_list3_index.htm', b_written)
+
+    # update manifest of published files, files changed are reported
+
+    o_publish = PublishManifest()
+    o_publish.update()
+    o_publish.save()
 
     # output some statistics
 
     report_log(
         "\n*** list3 completed ***\n"
-        "{0} records created.\n"
-        .format(n_count)
+        "{0} records created{1}{2},\n"
+        "{3}.\n"
+        .format(
+            sum(ln_counts), '' if not b_range else
+            ' for {0} months, {1} files written'.format(
+                len(lo_sinks),
+                sum(o_sink.b_get_written() for o_sink in lo_sinks)),
+            '' if s_export is None else ', {0} files exported'.format(
+                len(lo_sinks)),
+            o_publish.s_get_report())
     )
 
     return 0
@@ -7,99 +7,600 @@ database such that this status can be used for successive queries.
 
 ping may be called more than once on the same database: this will cause
 an update of the respective status variables.
+
+The urls are checked concurrently (see PingEngine); each url is checked
+only once even if used by several records. Results are written back to
+the database in batches.
+
+The result of each url check is kept in a separate table (see
+UrlStatusCache): urls checked successfully within the given time to
+live (ttl) are not checked again, all others are revalidated using
+conditional requests such that unchanged pages answer with a short
+304 (not modified).
+
+All checks are recorded in a history table (see PingScheduler): urls
+of records shown in list2/list3 are checked first, and the number of
+checks or the time spent may be limited; a run stopped this way or
+interrupted is continued by the next invocation of ping. Records whose
+url is not checked in a run keep the last known status of their url.
+
+The reference copies of all records are checked against the manifest
+of the archive folder (see ArchiveManifest), which is refreshed first.
+
+If a server cannot be reached for several urls in a row, its remaining
+urls are skipped by this invocation (and keep their last known status):
+they are left in the queue for other workers, or for the next
+invocation if the run is continued; a run is finished when only such
+urls are left. Host names are resolved once per run.
+
+The urls due in a run are put into a queue in the database (see
+PingQueue) from which they are claimed in batches. Additional workers
+(ping --worker, possibly on other machines sharing the database file)
+claim batches of the current run as well; the first ping waits for
+their results before the run is finished. Urls claimed by a worker
+which crashed are checked again after the lease expired.
+
+ping --sample only estimates the share of dead links: it checks a
+random sample of the links, stratified by region, media and year (small
+strata merged, see metadata_sample_tools), and reports the estimates
+per stratum and for all links. Only links found dead for good (client
+errors, unknown host names) count as dead; links which could not be
+checked (skipped, or temporary failures) are unknown and left out of
+the estimates. The database is not changed.
 """
 
+import random
 import sqlite3
+import time
 
 from lib import ErrorReports as ER
 from lib import ConfigParams as CP
-from lib import report_log, s_url_is_alive, b_files_exist
+from lib import PingEngine, PingQueue, PingScheduler, UrlStatusCache
+from lib import I_STATUS_SKIPPED, b_is_dead
+from lib import ArchiveManifest, report_log
+from lib.metadata_sample_tools import f_z_value, n_sample_size, \
+    dx_collapse, di_allocate, t_wilson_interval, t_stratified_estimate
 
+# number of records updated per database transaction
 
-def main(s_config_filename: str) -> int:
-    """
-    main program
-    """
+_N_BATCH_SIZE = 200
 
-    # initialize
+# seconds to wait for the database if locked by another process, and
+# seconds between checks for results of other workers
+
+_F_DB_TIMEOUT = 60.0
+_F_POLL_INTERVAL = 5.0
 
-    report_log("\n*** ping executing ***\n")
+
+def sample(
+        s_config_filename: str,
+        f_margin: float,
+        f_confidence: float,
+        i_seed,
+        o_engine) -> int:
+    """
+    estimate the share of dead links from a stratified random sample
+    such that the estimate for all links is within +/- f_margin at the
+    given confidence level; i_seed selects the sample (None: random)
+    """
+    report_log("\n*** ping sample executing ***\n")
 
     o_error = ER()
     o_params = CP(o_error, s_config_filename)
+    o_dbconn = sqlite3.connect(
+        o_params.s_get_config_filename('db_name'), timeout=_F_DB_TIMEOUT)
 
-    s_backup_path = o_params.s_get_config_path('ref_files')
+    # each url belongs to the stratum of its first record, strata too
+    # small for a link of the sample are merged
+
+    dls_urls = dict()
+    ss_seen = set()
+    for s_url, s_region, s_media, s_date in o_dbconn.execute(
+            'SELECT url, region, media, date FROM ' + CP.METADATA_TABLE
+            + ' WHERE url NOT NULL ORDER BY ID;'):
+        if s_url in ss_seen:
+            continue
+        ss_seen.add(s_url)
+        t_stratum = (s_region or '-', s_media or '-', (s_date or '-')[:4])
+        dls_urls.setdefault(t_stratum, []).append(s_url)
+    o_dbconn.close()
 
-    # prepare database
+    n_planned = n_sample_size(len(ss_seen), f_margin, f_confidence)
+    dt_merged = dx_collapse(
+        {t_stratum: len(ls_urls) for t_stratum, ls_urls in dls_urls.items()},
+        n_planned)
+    dls_strata = dict()
+    for t_stratum, ls_urls in dls_urls.items():
+        dls_strata.setdefault(dt_merged[t_stratum], []).extend(ls_urls)
 
-    o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
-    o_dbcursor = o_dbconn.cursor()
+    di_sizes = {
+        t_stratum: len(ls_urls) for t_stratum, ls_urls in dls_strata.items()}
+    di_alloc = di_allocate(di_sizes, n_planned)
+    o_random = random.Random(i_seed)
+    dt_sample = {
+        s_url: t_stratum
+        for t_stratum, ls_urls in dls_strata.items()
+        for s_url in o_random.sample(ls_urls, di_alloc[t_stratum])}
 
-    # loop over all records and check accessibility
+    # links which could not be checked are left out of the sample
 
-    n_count_recs = 0
-    n_count_good = [0, 0]
-    n_count_bad = [0, 0]
+    di_dead = {t_stratum: 0 for t_stratum in dls_strata}
+    di_checked = dict(di_alloc)
+    for s_url, i_status, s_result, _, _ in o_engine.it_probe_all(
+            list(dt_sample)):
+        if b_is_dead(i_status):
+            di_dead[dt_sample[s_url]] += 1
+        elif s_result is not None:
+            di_checked[dt_sample[s_url]] -= 1
+    n_unknown = sum(di_alloc.values()) - sum(di_checked.values())
+
+    # output estimates per stratum and for all links
+
+    f_z = f_z_value(f_confidence)
+    report_log(
+        "{0:<40}{1:>7}{2:>8}{3:>8}{4:>6}{5:>8}{6:>17}".format(
+            'region / media / year', 'links', 'sample', 'unknown', 'dead',
+            'share', '{0:.0%} interval'.format(f_confidence)))
+    for t_stratum in sorted(dls_strata):
+        f_lower, f_upper = t_wilson_interval(
+            di_dead[t_stratum], di_checked[t_stratum], f_z)
+        report_log(
+            "{0:<40}{1:>7}{2:>8}{3:>8}{4:>6}{5:>8.1%}{6:>8.1%} -{7:>7.1%}"
+            .format(
+                ' / '.join(t_stratum)[:39], di_sizes[t_stratum],
+                di_alloc[t_stratum],
+                di_alloc[t_stratum] - di_checked[t_stratum],
+                di_dead[t_stratum],
+                di_dead[t_stratum] / max(1, di_checked[t_stratum]),
+                f_lower, f_upper))
+    f_share, f_lower, f_upper = t_stratified_estimate(
+        [(di_sizes[t_stratum], di_checked[t_stratum], di_dead[t_stratum])
+         for t_stratum in dls_strata], f_z)
+
+    report_log(
+        "\n*** ping sample completed ***\n"
+        "{0} links in {1} strata ({2} before merging small strata),\n"
+        "{3} links planned for the margin of error, {4} links sampled,\n"
+        "{5} dead links found, {6} links unknown (not checked),\n"
+        "{7:.1%} of all links estimated dead "
+        "({8:.0%} interval {9:.1%} - {10:.1%}).\n"
+        .format(
+            len(ss_seen), len(dls_strata), len(dls_urls), n_planned,
+            len(dt_sample), sum(di_dead.values()), n_unknown, f_share,
+            f_confidence, f_lower, f_upper))
+    return 0
 
-    for ts_row in o_dbcursor.execute(
+
+def _dl_read_records(o_dbconn) -> dict:
+    """
+    return the records with url as (id, title, url, ref_copy) per url
+    """
+    dl_url_rows = dict()
+    for ts_row in o_dbconn.execute(
             'SELECT id, title, url, ref_copy FROM '
             + CP.METADATA_TABLE
-            + ' WHERE url NOT NULL;'):
+            + ' WHERE url NOT NULL;').fetchall():
+        dl_url_rows.setdefault(ts_row[2], []).append(ts_row)
+    return dl_url_rows
 
-        n_count_recs += 1
 
-        if ts_row[2] is None:
-            i_result_1 = 0
-        else:
-            s_result = s_url_is_alive(ts_row[2])
-            i_result_1 = int(s_result is None)
-            if i_result_1 == 1:
-                n_count_good[0] += 1
+def _t_check_refs(
+        o_dbconn, o_error, s_backup_path: str, dl_url_rows: dict,
+        b_rescan: bool) -> tuple:
+    """
+    check the reference copies of all records against the manifest of
+    the archive folder (refreshed first, b_rescan reads all folders
+    again) and update their status; returns (number of references
+    verified, number not found)
+    """
+    o_manifest = ArchiveManifest(o_dbconn, s_backup_path)
+    o_manifest.refresh(b_rescan)
+    o_archive = o_manifest.o_get_index()
+    n_count_good = 0
+    n_count_bad = 0
+    ll_updates_ref = []
+    for l_rows in dl_url_rows.values():
+        for ts_row in l_rows:
+            i_ref_ok = 0
+            if ts_row[3] is not None:
+                i_ref_ok = int(o_archive.b_files_exist(ts_row[3]))
+                if i_ref_ok == 1:
+                    n_count_good += 1
+                else:
+                    n_count_bad += 1
+                    o_error.report_error(
+                        "Reference file for row {0} cannot be "
+                        "reached: {1}\n"
+                        "{2}"
+                        .format(ts_row[0], ts_row[1], ts_row[3])
+                    )
+            ll_updates_ref.append([i_ref_ok, ts_row[0]])
+    with o_dbconn:
+        o_dbconn.executemany(
+            'UPDATE ' + CP.METADATA_TABLE
+            + ' SET ref_ok = ? WHERE ID = ?;', ll_updates_ref)
+    return (n_count_good, n_count_bad)
+
+
+def _o_schedule(
+        o_dbconn, o_scheduler, o_cache, ls_urls: list, f_ttl: float):
+    """
+    return the queue of the current run: an unfinished run is
+    continued, else a new run is started with the urls due (f_ttl is
+    the time to live of a successful check in hours)
+    """
+    if o_scheduler.b_start_run():
+        report_log(
+            "continuing run {0}\n".format(o_scheduler.i_get_run()))
+    o_queue = PingQueue(o_dbconn, o_scheduler.i_get_run())
+    if o_queue.n_count() == 0:
+        o_queue.fill(o_scheduler.ls_schedule(
+            ls_urls, o_cache, f_ttl * 3600.0))
+    return o_queue
+
+
+# pylint: disable=too-many-instance-attributes
+
+class _PingRun:
+    """ Checks of the urls of a run by this ping or a worker; the
+        results are written to the database in batches.
+
+        _o_dbconn           database connection
+
+        _o_error            error reports
+
+        _o_cache            status per url (see UrlStatusCache)
+
+        _o_scheduler        history of the checks (see PingScheduler)
+
+        _o_queue            urls of the run (see PingQueue)
+
+        _dl_url_rows        records (id, title, url, ref_copy) per url
+
+        _ll_updates         pending updates of url_ok: [status, id]
+
+        _ls_completed       pending urls checked
+
+        _ls_skipped         pending urls skipped (see I_STATUS_SKIPPED)
+
+        _f_deadline         time (monotonic) to stop checking, or None
+
+        _n_budget_requests  maximum number of urls checked (0: no
+                            limit)
+
+        _di_counts          counts of rows ('good', 'bad') and urls
+                            ('checked', 'unchanged', 'skipped')
+    """
+
+    def __init__(
+            self, o_dbconn, o_error, o_cache, o_scheduler, o_queue,
+            dl_url_rows: dict):
+        """ initialize a run without budget """
+        self._o_dbconn = o_dbconn
+        self._o_error = o_error
+        self._o_cache = o_cache
+        self._o_scheduler = o_scheduler
+        self._o_queue = o_queue
+        self._dl_url_rows = dl_url_rows
+        self._ll_updates = []
+        self._ls_completed = []
+        self._ls_skipped = []
+        self._f_deadline = None
+        self._n_budget_requests = 0
+        self._di_counts = dict.fromkeys(
+            ('good', 'bad', 'checked', 'unchanged', 'skipped'), 0)
+
+    def set_budget(
+            self, f_start: float, f_budget_time: float,
+            n_budget_requests: int):
+        """
+        limit the checks to f_budget_time minutes after f_start
+        (monotonic) and to n_budget_requests urls (0: no limit)
+        """
+        if f_budget_time > 0:
+            self._f_deadline = f_start + f_budget_time * 60.0
+        self._n_budget_requests = n_budget_requests
+
+    def di_get_counts(self) -> dict:
+        """
+        return the counts of rows ('good', 'bad') and of urls
+        ('checked', 'unchanged', 'skipped')
+        """
+        return dict(self._di_counts)
+
+    def flush(self):
+        """
+        write pending updates in a single transaction
+        """
+        with self._o_dbconn:
+            self._o_dbconn.executemany(
+                'UPDATE ' + CP.METADATA_TABLE
+                + ' SET url_ok = ? WHERE ID = ?;', self._ll_updates)
+            self._o_cache.write_pending()
+            self._o_scheduler.write_pending()
+            self._o_queue.complete(self._ls_completed)
+            self._o_queue.skip(self._ls_skipped)
+        self._ll_updates.clear()
+        self._ls_completed.clear()
+        self._ls_skipped.clear()
+
+    def add_result(self, s_url: str, s_result: str):
+        """
+        record result for all rows using this url (updated by ID, as
+        the url is not indexed)
+        """
+        i_result = int(s_result is None)
+
+        for ts_row in self._dl_url_rows.get(s_url, []):
+            self._ll_updates.append([i_result, ts_row[0]])
+            if i_result == 1:
+                self._di_counts['good'] += 1
             else:
-                n_count_bad[0] += 1
-                o_error.report_error(
+                self._di_counts['bad'] += 1
+                self._o_error.report_error(
                     "Link for row {0} cannot be reached: {1}\n"
                     "{2}\n"
                     "{3}"
                     .format(ts_row[0], ts_row[1], ts_row[2], s_result)
                 )
 
-        if ts_row[3] is None:
-            i_result_2 = 0
-        else:
-            i_result_2 = int(b_files_exist(s_backup_path + ts_row[3]))
-            if i_result_2 == 1:
-                n_count_good[1] += 1
-            else:
-                n_count_bad[1] += 1
-                o_error.report_error(
-                    "Reference file for row {0} cannot be reached: {1}\n"
-                    "{2}"
-                    .format(ts_row[0], ts_row[1], ts_row[3])
-                )
+        if len(self._ll_updates) >= _N_BATCH_SIZE:
+            self.flush()
 
-        o_dbconn.execute(
-            'UPDATE ' + CP.METADATA_TABLE
-            + ' SET url_ok = ?, ref_ok = ? WHERE ID = ?;',
-            [i_result_1, i_result_2, ts_row[0]])
-        o_dbconn.commit()
+    def b_keep_last_status(self, s_url: str) -> bool:
+        """
+        record the last known status for all rows using this url;
+        returns False if the url was never checked
+        """
+        t_status = self._o_cache.t_get_status(s_url)
+        if t_status is None:
+            return False
+        self.add_result(s_url, t_status[1])
+        return True
+
+    def n_keep_last_status(self, ss_open: set) -> int:
+        """
+        records with urls not due (not in ss_open) keep the last known
+        status; returns the number of these urls never checked
+        """
+        n_count_unknown = 0
+        for s_url in self._dl_url_rows:
+            if s_url not in ss_open and not self.b_keep_last_status(s_url):
+                n_count_unknown += 1
+        self.flush()
+        return n_count_unknown
+
+    def add_probe(
+            self, s_url: str, i_status: int, s_result: str, s_etag: str,
+            s_last_modified: str):
+        """
+        record the result of a check (see PingEngine.it_probe_all)
+        """
+        self._o_scheduler.add_result(s_url, i_status, s_result)
+        if i_status == I_STATUS_SKIPPED:
+            self._di_counts['skipped'] += 1
+            self._ls_skipped.append(s_url)
+            self.b_keep_last_status(s_url)
+            return
+        self._di_counts['checked'] += 1
+        self._ls_completed.append(s_url)
+        if i_status == 304:
+            self._di_counts['unchanged'] += 1
+        self._o_cache.set_status(
+            s_url, i_status, s_result, s_etag, s_last_modified)
+        self.add_result(s_url, s_result)
+
+    def b_out_of_time(self) -> bool:
+        """
+        true if the time budget is exhausted
+        """
+        return self._f_deadline is not None \
+            and time.monotonic() > self._f_deadline
+
+    def b_check_claimed(self, o_engine, n_batch: int, f_lease: float) -> bool:
+        """
+        check urls claimed from the queue concurrently, n_batch at a
+        time for f_lease seconds, until none is left (the loop of a
+        worker); returns False if stopped as the budget is exhausted
+        """
+        while True:
+            n_claim = n_batch
+            if self._n_budget_requests > 0:
+                n_claim = min(
+                    n_claim, self._n_budget_requests
+                    - self._di_counts['checked']
+                    - self._di_counts['skipped'])
+                if n_claim <= 0:
+                    return False
+            ls_batch = self._o_queue.ls_claim(n_claim, f_lease)
+            if not ls_batch:
+                return True
+
+            it_results = o_engine.it_probe_all(
+                ls_batch, self._o_cache.ds_get_headers, b_keep_open=True)
+            try:
+                for t_result in it_results:
+                    self.add_probe(*t_result)
+                    if self.b_out_of_time():
+                        return False
+            finally:
+                it_results.close()
+                self.flush()
+
+    def check_run(self, o_engine, n_batch: int, f_lease: float):
+        """
+        check urls claimed from the queue (see b_check_claimed) within
+        budget; when none is left, wait for the results of other
+        workers and claim the urls of expired leases again
+        """
+        while self.b_check_claimed(o_engine, n_batch, f_lease) \
+                and not self.b_out_of_time() \
+                and self._o_queue.n_count_pending() > 0:
+            f_expiry = self._o_queue.f_next_expiry()
+            time.sleep(_F_POLL_INTERVAL if f_expiry is None else min(
+                _F_POLL_INTERVAL, max(0.0, f_expiry - time.time())))
+
+
+def main(
+        s_config_filename: str,
+        *,
+        n_workers=16,
+        n_per_host=2,
+        f_connect_timeout=10.0,
+        f_read_timeout=30.0,
+        n_retries=2,
+        f_ttl=24.0,
+        f_budget_time=0.0,
+        n_budget_requests=0,
+        n_host_failures=5,
+        b_worker=False,
+        n_batch=50,
+        f_lease=600.0,
+        f_sample_margin=0.0,
+        f_confidence=0.95,
+        i_seed=None,
+        b_rescan=False) -> int:
+    """
+    main program, options are given by keyword; f_ttl is the time to
+    live of a successful check in hours, f_budget_time the maximum
+    time in minutes spent on checking urls, n_budget_requests the
+    maximum number of urls checked (0: no limit), n_host_failures the
+    number of urls in a row a host may fail before its other urls are
+    skipped (0: never); b_worker selects an additional worker for the
+    current run, claiming n_batch urls at a time for f_lease seconds;
+    f_sample_margin > 0 only estimates the share of dead links (see
+    sample); b_rescan reads all folders of the archive again
+    """
+    if f_sample_margin > 0:
+        return sample(
+            s_config_filename, f_sample_margin, f_confidence, i_seed,
+            PingEngine(
+                n_workers, n_per_host, f_connect_timeout, f_read_timeout,
+                n_retries, n_host_failures=0))
+
+    # initialize
+
+    report_log("\n*** ping executing ***\n")
+
+    f_start = time.monotonic()
+
+    o_error = ER()
+    o_params = CP(o_error, s_config_filename)
+
+    s_backup_path = o_params.s_get_config_path('ref_files')
+
+    # prepare database, read all records
 
+    o_dbconn = sqlite3.connect(
+        o_params.s_get_config_filename('db_name'), timeout=_F_DB_TIMEOUT)
+    dl_url_rows = _dl_read_records(o_dbconn)
+
+    o_cache = UrlStatusCache(o_dbconn)
+    o_scheduler = PingScheduler(o_dbconn)
+
+    if b_worker:
+        if not o_scheduler.b_join_run():
+            report_log("\n*** ping worker: no run to join ***\n")
+            o_dbconn.close()
+            return 0
+        o_queue = PingQueue(o_dbconn, o_scheduler.i_get_run())
+        report_log(
+            "joining run {0}\n".format(o_scheduler.i_get_run()))
+    else:
+        t_count_refs = _t_check_refs(
+            o_dbconn, o_error, s_backup_path, dl_url_rows, b_rescan)
+        o_queue = _o_schedule(
+            o_dbconn, o_scheduler, o_cache, list(dl_url_rows), f_ttl)
+
+    ss_open = o_queue.ss_open_urls()
+    o_run = _PingRun(
+        o_dbconn, o_error, o_cache, o_scheduler, o_queue, dl_url_rows)
+    o_run.set_budget(f_start, f_budget_time, n_budget_requests)
+
+    # records with urls not due keep the last known status
+
+    n_count_unknown = 0
+    if not b_worker:
+        n_count_unknown = o_run.n_keep_last_status(ss_open)
+
+    # check urls claimed from the queue concurrently within budget
+
+    o_engine = PingEngine(
+        n_workers, n_per_host, f_connect_timeout, f_read_timeout, n_retries,
+        n_host_failures=n_host_failures)
+    try:
+        if b_worker:
+            o_run.b_check_claimed(o_engine, n_batch, f_lease)
+        else:
+            o_run.check_run(o_engine, n_batch, f_lease)
+    except KeyboardInterrupt:
+        report_log("\n*** ping interrupted ***\n")
+    finally:
+        o_engine.close()
+        b_complete = o_queue.n_count_pending() == 0
+        o_queue.release()
+
+    if b_complete and not b_worker:
+        o_scheduler.finish_run()
+        o_queue.clear()
     o_dbconn.close()
 
     # output some statistics
 
+    di_counts = o_run.di_get_counts()
+    if b_worker:
+        report_log(
+            "\n*** ping worker done, run {0} ***\n"
+            "{1} links tested ok,\n"
+            "{2} failed link tests,\n"
+            "{3} of {4} links due checked in run {5},\n"
+            "{6} links reported as not modified,\n"
+            "{7} links skipped as their server failed repeatedly,\n"
+            "{8} connections opened,\n"
+            "{9} host names resolved.\n"
+            .format(
+                'completed' if b_complete else 'not finished',
+                di_counts['good'],
+                di_counts['bad'],
+                di_counts['checked'],
+                len(ss_open),
+                o_scheduler.i_get_run(),
+                di_counts['unchanged'],
+                di_counts['skipped'],
+                o_engine.n_get_connects(),
+                o_engine.n_get_lookups(),
+            )
+        )
+        return 0
+
     report_log(
-        "\n*** ping completed ***\n"
-        "{0} records processed,\n"
-        "{1} links tested ok,\n"
-        "{2} failed link tests,\n"
-        "{3} references verified,\n"
-        "{4} references not found.\n"
+        "\n*** ping {0} ***\n"
+        "{1} records processed,\n"
+        "{2} links tested ok,\n"
+        "{3} failed link tests,\n"
+        "{4} references verified,\n"
+        "{5} references not found,\n"
+        "{6} of {7} links due checked in run {8},\n"
+        "{9} links reported as not modified,\n"
+        "{10} links never checked so far,\n"
+        "{11} links skipped as their server failed repeatedly,\n"
+        "{12} connections opened,\n"
+        "{13} host names resolved.\n"
         .format(
-            n_count_recs,
-            n_count_good[0],
-            n_count_bad[0],
-            n_count_good[1],
-            n_count_bad[1],
+            'completed' if b_complete else 'stopped, run not finished',
+            sum(len(l_rows) for l_rows in dl_url_rows.values()),
+            di_counts['good'],
+            di_counts['bad'],
+            t_count_refs[0],
+            t_count_refs[1],
+            di_counts['checked'],
+            len(ss_open),
+            o_scheduler.i_get_run(),
+            di_counts['unchanged'],
+            n_count_unknown,
+            di_counts['skipped'],
+            o_engine.n_get_connects(),
+            o_engine.n_get_lookups(),
         )
     )
+    return 0
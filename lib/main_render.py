@@ -0,0 +1,97 @@
+"""render
+
+Create the listings of list1, list2 and list3 by a single read of the
+metadata: each record is passed to the outputs (see class_listsinks)
+which select and sort their records, hence the files are the same as
+created by the individual tools.
+
+list3 is created for the months given (comma separated, defaults to
+the previous month); for a single month the output is written to
+ma_list3.htm as by list3, for several months to ma_list3_YYYY-MM.htm.
+
+With --export the records of each listing are also written as NDJSON
+or JSON (e.g. ma_list2.ndjson), and compressed copies (.gz) of all
+files are created for static serving.
+"""
+
+import sqlite3
+
+from lib import ConfigParams as CP
+from lib import ErrorReports as ER
+from lib import report_log
+from lib import b_write_gzip
+from lib import FragmentCache, List1Sink, List2Sink, List3Sink, n_scan
+from lib import PublishManifest
+from lib.main_list3 import o_get_month
+
+
+def main(s_config_filename: str, s_months: str, s_export=None) -> int:
+    """
+    main program - s_export is the format of the export (see
+    LS_EXPORT_FORMATS) or None
+    """
+
+    # check months for correct syntax YYYY-MM or create default
+
+    o_error = ER()
+
+    lo_dates = []
+    for s_month in [None] if s_months is None else s_months.split(','):
+        o_date = o_get_month(
+            None if s_month is None else s_month.strip(), o_error)
+        if o_date is None:
+            return 1
+        if o_date not in lo_dates:
+            lo_dates.append(o_date)
+
+    # initialize
+
+    report_log("\n*** render executing ***\n")
+
+    o_params = CP(o_error, s_config_filename)
+
+    o_dbconn = sqlite3.connect(o_params.s_get_config_filename('db_name'))
+    o_cache = FragmentCache(o_dbconn, 'list2')
+    lo_sinks = [
+        List1Sink(o_params.s_get_config_path('ref_base')),
+        List2Sink(o_cache=o_cache)]
+    for o_date in lo_dates:
+        lo_sinks.append(List3Sink(
+            o_date, 'ma_list3.htm' if len(lo_dates) == 1
+            else o_date.strftime('ma_list3_%Y-%m.htm')))
+
+    # read all records once, then create all listings
+
+    n_count = n_scan(o_dbconn, lo_sinks)
+
+    ls_results = []
+    for o_sink in lo_sinks:
+        ls_results.append('{0}: {1} records{2}'.format(
+            o_sink.s_get_filename(), o_sink.n_write(),
+            '' if o_sink.b_get_written() else ' (unchanged)'))
+        if s_export is not None:
+            ls_results.append('{0}: {1} records exported'.format(
+                o_sink.s_get_export_filename(s_export),
+                o_sink.n_export(s_export)))
+            b_write_gzip(o_sink.s_get_filename(), o_sink.b_get_written())
+    o_cache.save()
+    o_dbconn.close()
+
+    # update manifest of published files, files changed are reported
+
+    o_publish = PublishManifest()
+    o_publish.update()
+    o_publish.save()
+
+    # output some statistics
+
+    report_log(
+        "\n*** render completed ***\n"
+        "{0} records read,\n"
+        "{1},\n"
+        "{2}.\n"
+        .format(
+            n_count, ',\n'.join(ls_results), o_publish.s_get_report())
+    )
+
+    return 0
@@ -5,18 +5,31 @@ a HTML snippet for a single reference from the clipboard. This is for
 situations when a new reference should be processed quickly for simple
 insertion into an existing list2.htm listing or unto the website (the
 format is to suit radelnohnealter.de/presse)
+
+With --insert the entry is also inserted into the existing listing of
+list2 (ma_list2.htm in the working folder) in a single pass over the
+file: into the section of its region in the order of dates, or into a
+new section in the order of the regions. The database is only read
+(for the names of regions), i.e. load and list2 are not needed.
 """
+import os
+import pathlib
+import sqlite3
 import sys
-import locale
 import re
 import pyperclip
 
+from lib import ConfigParams as CP
+from lib import ErrorReports as ER
 from lib import s_format_heading
 from lib import s_format_entry
 from lib import s_make_backup_filename
 from lib import s_check_date
 from lib import TagString
 from lib import s_icons
+from lib import b_insert_entry, b_write_gzip
+from lib import PublishManifest
+from lib.main_load import t_determine_place_label
 
 # the following are indeces into the row being processed:
 
@@ -27,9 +40,14 @@ _COL_REGION = 4
 _COL_TITLE = 6
 _COL_SUBTITLE = 7
 _COL_URL = 9
+_COL_RATING = 11
 _COL_COMMENT = 12
 _COL_COUNT = 13  # total number of columns needed to process request
 
+# listing of list2 an entry is inserted into
+
+S_LIST2 = 'ma_list2.htm'
+
 
 def s_format_backup_filename(
         s_date: str, s_title: str, s_subtitle: str) -> str:
@@ -42,12 +60,79 @@ def s_format_backup_filename(
     return s_make_backup_filename(s_date_new, s_title, s_subtitle)
 
 
-def main() -> None:
+def b_insert_into_list2(
+        s_config_filename: str, l_record: list, s_entry: str) -> bool:
     """
-    process one record from the clipboard
+    insert the formatted entry of a record into ma_list2.htm unless
+    it (or its url) is already listed in its section; returns False
+    (and reports why) if not possible
     """
+    if l_record[_COL_REGION][:2] != 'DE' \
+            or l_record[_COL_RATING] not in ('1', '2', '3'):
+        print(
+            '>>> Record is not part of list2 '
+            '(region in Germany and rating 1...3 required).')
+        return False
+
+    # label and level of the section as by load, levels of the
+    # sections found in the listing (region or country names)
+
+    o_params = CP(ER(), s_config_filename)
+    try:
+        o_dbconn = sqlite3.connect(pathlib.Path(
+            o_params.s_get_config_filename('db_name')).absolute().as_uri()
+            + '?mode=ro', uri=True)
+        try:
+            s_label, i_level = t_determine_place_label(
+                l_record[_COL_PLACE] or None, l_record[_COL_REGION],
+                o_dbconn.cursor())
+            di_levels = dict()
+            for s_country, s_region in o_dbconn.execute(
+                    'SELECT country_name, region_name FROM '
+                    + CP.REGIONS_TABLE + ';'):
+                if s_region is None:
+                    di_levels.setdefault(s_country, 1)
+                else:
+                    di_levels.setdefault(s_region, 2)
+        finally:
+            o_dbconn.close()
+    except sqlite3.Error as o_exception:
+        print('>>> Regions cannot be read from database: {0}'
+              .format(o_exception))
+        return False
+    if s_label is None:
+        print('>>> Unknown region: {0}'.format(l_record[_COL_REGION]))
+        return False
+
+    try:
+        b_new_section = b_insert_entry(
+            S_LIST2, (i_level, s_label), l_record[_COL_DATE], s_entry,
+            di_levels)
+    except OSError as o_exception:
+        print('>>> {0} cannot be updated: {1}'.format(S_LIST2, o_exception))
+        return False
+    if b_new_section is None:
+        print('Not inserted, already listed in {0} (section {1}).\n'
+              .format(S_LIST2, s_label))
+        return True
+    if os.path.exists(S_LIST2 + '.gz'):
+        b_write_gzip(S_LIST2, True)
+    o_publish = PublishManifest()
+    o_publish.update()
+    o_publish.save()
+
+    print('Inserted into {0} ({1}section {2}),\n{3}.\n'.format(
+        S_LIST2, 'new ' if b_new_section else '', s_label,
+        o_publish.s_get_report()))
+    return True
 
-    locale.setlocale(locale.LC_ALL, "de_DE.utf-8")
+
+def main(s_config_filename=None, b_insert=False) -> None:
+    """
+    process one record from the clipboard; b_insert also inserts the
+    entry into ma_list2.htm (s_config_filename is needed for the
+    database)
+    """
 
     # expect a complete record on the clipboard,
     # or at least as many columns as needed for this functionality
@@ -154,16 +239,21 @@ def main() -> None:
         )
     print("\n{0}\n".format(s_filename))
 
-    print(s_format_heading(s_region))
-    print(s_format_entry(
+    s_entry = s_format_entry(
         l_record[_COL_TITLE],
         l_record[_COL_SUBTITLE],
-        l_record[_COL_URL],
+        l_record[_COL_URL] or None,
         l_record[_COL_MEDIA],
         l_record[_COL_DATE],
-        s_icon_list))
+        s_icon_list)
+    print(s_format_heading(s_region))
+    print(s_entry)
     print()
 
+    if b_insert and not b_insert_into_list2(
+            s_config_filename, l_record, s_entry):
+        sys.exit(1)
+
     pyperclip.copy(s_filename)
 
     sys.exit(0)
@@ -10,26 +10,42 @@ import csv
 import os.path
 import re
 import glob
-import datetime
+from functools import lru_cache
 from urllib.parse import urlparse, quote
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
-
-
-# Check https://regex101.com/r/A326u1/5 for reference
-
-_DOMAIN_FORMAT = re.compile(
-    r"(?:^(\w{1,255}):(.{1,255})@|^)"  # http basic authentication [optional]
-    r"(?:(?:(?=\S{0,253}(?:$|:))"  # check full domain length to be less than
-    # or equal to 253 (starting after http basic auth, stopping before port)
-    r"((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+"  # check for at least
-    # one subdomain (maximum length per subdomain: 63 characters), dashes
-    # in between allowed
-    r"(?:[a-z0-9]{1,63})))"  # check for top level domain, no dashes allowed
-    r"|localhost)"  # accept also "localhost" only
-    r"(:\d{1,5})?",  # port [optional]
-    re.IGNORECASE
-)
+
+from .metadata_http_tools import t_probe_url
+
+# messages for problems with a file (see s_check_for_valid_file)
+
+S_NOT_FOUND = 'File does not exist.'
+S_NOT_READABLE = 'File cannot be read.'
+S_EMPTY = 'File is empty.'
+
+
+# Domain validation (see b_is_valid_domain) is done by a hand-written
+# scanner instead of a regular expression: this guarantees linear run
+# time even for garbled input. The scanner accepts exactly the same
+# strings as the former expression (https://regex101.com/r/A326u1/5):
+#
+#   [user:password@]label.[label.]tld[:port]
+#   [user:password@]localhost[:port]
+#
+# - user: 1..255 word characters, password: 1..255 characters (no newline)
+# - full domain length (after user, before port) must be <= 253 characters
+# - label: 1..63 characters from _LABEL_CHARS or '-', no leading or
+#   trailing dash; tld: 1..63 characters from _LABEL_CHARS, no dash
+# - port: 1..5 decimal digits
+#
+# Note: matching was case-insensitive, hence four non-ASCII characters
+# are accepted as letters (they fold to i, i, s, k respectively).
+
+_LABEL_CHARS = frozenset(
+    'abcdefghijklmnopqrstuvwxyz'
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    '0123456789'
+    '\u0130\u0131\u017f\u212a')
+_LABEL_DASH_CHARS = _LABEL_CHARS | {'-'}
+
 _SCHEME_FORMAT = re.compile(
     r"^(http|hxxp|ftp|fxp)s?$",  # scheme: http(s) or ftp(s)
     re.IGNORECASE
@@ -143,56 +159,19 @@ def b_is_valid_path(s_path: str) -> bool:
     return os.path.isdir(s_path)
 
 
-def s_check_date(s_text: str) -> str:
+def s_stat_problem(s_path: str, o_stat) -> str:
     """
-    Check if date is correctly formatted, i.e. permitted formats are:
-    * YYYY          year only
-    * YYYY-MM       year + month
-    * YYYY-MM-DD    year, month, date
-
-        Returns:
-            00000000    for an empty or illformatted string
-            invalid     for invalid date, e.g. 2020-02-30
-            too early   if date is before start of CWA
-            YYYYMMDD    with zeros for missing information (day, day and month)
-
-    >>> s_check_date('')
-    '00000000'
-
-    >>> s_check_date('2020-02-30')
-    'invalid'
-
-    >>> s_check_date('2002-02-02')
-    'too early'
-
-    >>> s_check_date('2020-02-02')
-    '20200202'
-
+    return the problem of a file given its stat result (None if the
+    file does not exist), or None if the file can be used; whether it
+    can be read is left to the system (access rights, ACLs, mounts)
     """
-    o_match = re.search('^([0-9]{4})(-([0-9]{2})(-([0-9]{2}))*)*$', s_text)
-    if o_match is not None:
-        s_date = o_match.group(0).replace('-', '')
-        try:
-            o_date = datetime.date(int(o_match.group(1)), 1, 1)
-            if o_match.group(3) is None:
-                s_date += '0000'
-            else:
-                o_date = o_date.replace(month=int(o_match.group(3)))
-                if o_match.group(5) is None:
-                    s_date += '00'
-                else:
-                    o_date = o_date.replace(day=int(o_match.group(5)))
-
-        except ValueError:
-            s_date = 'invalid'
-
-        if o_date < datetime.date(2013, 1, 1):
-            s_date = 'too early'
-
-    else:
-        s_date = '00000000'
-
-    return s_date
+    if o_stat is None:
+        return S_NOT_FOUND
+    if not os.access(s_path, os.R_OK):
+        return S_NOT_READABLE
+    if o_stat.st_size == 0:
+        return S_EMPTY
+    return None
 
 
 def s_check_for_valid_file(s_file: str, o_error=None) -> str:
@@ -220,12 +199,12 @@ def s_check_for_valid_file(s_file: str, o_error=None) -> str:
 
     if s_full_path is None:
         s_error_detail = 'Cannot determine full path.'
-    elif not os.path.exists(s_full_path):
-        s_error_detail = 'File does not exist.'
-    elif not os.access(s_full_path, os.R_OK):
-        s_error_detail = 'File cannot be read.'
-    elif os.stat(s_full_path).st_size == 0:
-        s_error_detail = 'File is empty.'
+    else:
+        try:
+            o_stat = os.stat(s_full_path)
+        except (OSError, ValueError):
+            o_stat = None
+        s_error_detail = s_stat_problem(s_full_path, o_stat)
 
     if o_error is None:
         return s_error_detail
@@ -267,6 +246,89 @@ def s_trim(s_text: str, i_max_len: int) -> str:
     return s_text[:(i_max_len - 3)] + '...'
 
 
+def _b_is_valid_host(s_host: str) -> bool:
+    """
+    Checks a host name without authentication and port:
+    'localhost' or a sequence of labels separated by dots
+    """
+    if s_host.replace('\u017f', 's').lower() == 'localhost':
+        return True
+
+    if len(s_host) > 253:
+        return False
+
+    ls_labels = s_host.split('.')
+    if len(ls_labels) < 2:
+        return False
+
+    s_tld = ls_labels.pop()
+    if not 0 < len(s_tld) <= 63:
+        return False
+    for s_char in s_tld:
+        if s_char not in _LABEL_CHARS:
+            return False
+
+    for s_label in ls_labels:
+        if not 0 < len(s_label) <= 63:
+            return False
+        if s_label[0] not in _LABEL_CHARS or \
+                s_label[-1] not in _LABEL_CHARS:
+            return False
+        for s_char in s_label:
+            if s_char not in _LABEL_DASH_CHARS:
+                return False
+
+    return True
+
+
+@lru_cache(maxsize=4096)
+def b_is_valid_domain(s_domain: str) -> bool:
+    """
+    Checks the domain part (netloc) of an URL in a single pass;
+    results are cached per domain as many URLs share the same domain.
+
+    >>> b_is_valid_domain('www.example.com')
+    True
+
+    >>> b_is_valid_domain('user:secret@localhost:8080')
+    True
+
+    >>> b_is_valid_domain('-bad-.example.com')
+    False
+
+    >>> b_is_valid_domain('example.com:123456')
+    False
+
+    """
+    # optional authentication: user consists of word characters
+    # only, hence it ends at the first colon; the host cannot contain
+    # an '@', hence the password ends at the last '@'
+
+    i_at = s_domain.rfind('@')
+    if i_at >= 0:
+        i_colon = s_domain.find(':')
+        if not 0 < i_colon <= 255 or i_colon >= i_at:
+            return False
+        for s_char in s_domain[:i_colon]:
+            if not (s_char.isalnum() or s_char == '_'):
+                return False
+        s_password = s_domain[i_colon + 1:i_at]
+        if not 0 < len(s_password) <= 255 or '\n' in s_password:
+            return False
+        s_domain = s_domain[i_at + 1:]
+
+    # optional port
+
+    i_colon = s_domain.find(':')
+    if i_colon >= 0:
+        s_port = s_domain[i_colon + 1:]
+        if not 0 < len(s_port) <= 5 or not s_port.isdecimal():
+            return False
+        s_domain = s_domain[:i_colon]
+
+    return _b_is_valid_host(s_domain)
+
+
 def s_check_url(url: str) -> str:
     """
     Checks if a given URL has a valid syntax.
@@ -296,7 +358,7 @@ def s_check_url(url: str) -> str:
     if not domain:
         return "No domain specified."
 
-    if not re.fullmatch(_DOMAIN_FORMAT, domain):
+    if not b_is_valid_domain(domain):
         return "Invalid domain given (domain={})".format(domain)
 
     return None
@@ -307,29 +369,7 @@ def s_url_is_alive(url: str) -> str:
     Test whether given url can be reached, return error string
     if not, else None
     """
-    try:
-        url_req = Request(url, None, {
-            'User-Agent':
-            'Mozilla/5.0 (X11; Linux x86_64; rv:78.0) '
-            'Gecko/20100101 Firefox/78.0'
-            })
-        urlopen(url_req)
-    except HTTPError as u_error:
-        return (
-            "Server couldn't fulfill the request.\n"
-            "HTTP status code: {0}.".format(u_error.code)
-            )
-    except URLError as u_error:
-        return (
-            "Could not reach server, reason:\n"
-            "{0}.".format(u_error.reason)
-            )
-    except ValueError as u_error:
-        return (
-            "Unable to check status of server, reason:\n"
-            "{0}.".format(u_error)
-            )
-    return None
+    return t_probe_url(url)[1]
 
 
 def s_make_filename(s_text: str) -> str:
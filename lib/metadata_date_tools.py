@@ -0,0 +1,208 @@
+"""metadata_date_tools
+
+Parsing and formatting of the dates in the metadata (YYYY, YYYY-MM or
+YYYY-MM-DD) shared by check and the list tools
+
+Month names are German and built in, i.e. no locale needs to be set
+(or installed). The dates of the metadata repeat a lot, hence results
+are kept per distinct date string.
+"""
+
+import datetime
+import re
+from functools import lru_cache
+
+# German month names (as strftime('%B') with locale de_DE)
+
+_LS_MONTHS = (
+    'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni', 'Juli',
+    'August', 'September', 'Oktober', 'November', 'Dezember')
+
+# permitted formats of a date
+
+_O_DATE = re.compile(r'([0-9]{4})(?:-([0-9]{2})(?:-([0-9]{2}))?)?')
+
+# dates as formatted by s_format_date
+
+_O_FORMATTED_DATE = re.compile(r'(?:([0-9]{2})\. )?(?:(\w+) )?([0-9]{4})')
+
+# dates before the start of Cycling Without Age are not permitted
+
+_O_FIRST_DATE = datetime.date(2013, 1, 1)
+
+
+@lru_cache(maxsize=None)
+def t_parse_date(s_date: str) -> tuple:
+    """
+    return (year, month, day) of a date YYYY, YYYY-MM or YYYY-MM-DD
+    with 0 for a missing month or day, or None if the text is not a
+    valid date
+
+    >>> t_parse_date('2020-02'), t_parse_date('2020-02-30')
+    ((2020, 2, 0), None)
+
+    >>> t_parse_date('2020-00') is None
+    True
+
+    """
+    if not isinstance(s_date, str):
+        return None
+    o_match = _O_DATE.fullmatch(s_date)
+    if o_match is None:
+        return None
+    s_year, s_month, s_day = o_match.groups()
+    try:
+        datetime.date(
+            int(s_year), 1 if s_month is None else int(s_month),
+            1 if s_day is None else int(s_day))
+    except ValueError:
+        return None
+    return (int(s_year), int(s_month or 0), int(s_day or 0))
+
+
+@lru_cache(maxsize=None)
+def s_check_date(s_text: str) -> str:
+    """
+    Check if date is correctly formatted, i.e. permitted formats are:
+    * YYYY          year only
+    * YYYY-MM       year + month
+    * YYYY-MM-DD    year, month, date
+
+        Returns:
+            00000000    for an empty or illformatted string
+            invalid     for invalid date, e.g. 2020-02-30
+            too early   if date is before start of CWA
+            YYYYMMDD    with zeros for missing information (day, day and month)
+
+    >>> s_check_date('')
+    '00000000'
+
+    >>> s_check_date('2020-02-30')
+    'invalid'
+
+    >>> s_check_date('2002-02-02')
+    'too early'
+
+    >>> s_check_date('2020-02-02')
+    '20200202'
+
+    """
+    o_match = _O_DATE.fullmatch(s_text)
+    if o_match is None:
+        return '00000000'
+
+    t_date = t_parse_date(s_text)
+    if t_date is None:
+
+        # the year (and month) may still be too early
+
+        s_year, s_month, _ = o_match.groups()
+        if s_month is not None and 1 <= int(s_month) <= 12:
+            t_date = (int(s_year), int(s_month), 1)
+        else:
+            t_date = (int(s_year), 1, 1)
+        s_result = 'invalid'
+    else:
+        s_result = '{0:04d}{1:02d}{2:02d}'.format(*t_date)
+
+    if t_date[0] == 0 or datetime.date(
+            t_date[0], t_date[1] or 1, t_date[2] or 1) < _O_FIRST_DATE:
+        return 'too early'
+    return s_result
+
+
+def s_format_month(o_date: datetime.date) -> str:
+    """
+    return month and year in German
+
+    >>> s_format_month(datetime.date(2020, 3, 1))
+    'März 2020'
+
+    """
+    return '{0} {1:04d}'.format(_LS_MONTHS[o_date.month - 1], o_date.year)
+
+
+def s_format_day(o_date: datetime.date) -> str:
+    """
+    return day, month and year in German
+
+    >>> s_format_day(datetime.date(2020, 5, 1))
+    '01. Mai 2020'
+
+    """
+    return '{0:02d}. {1} {2:04d}'.format(
+        o_date.day, _LS_MONTHS[o_date.month - 1], o_date.year)
+
+
+@lru_cache(maxsize=None)
+def s_format_date(s_date: str) -> str:
+    """
+    return the date as text in German (year, month and year, or day,
+    month and year) or None if the date is not valid
+
+    >>> s_format_date('2020'), s_format_date('2020-12')
+    ('2020', 'Dezember 2020')
+
+    >>> s_format_date('2020-07-04'), s_format_date('2020-07-32')
+    ('04. Juli 2020', None)
+
+    """
+    t_date = t_parse_date(s_date)
+    if t_date is None:
+        return None
+    if t_date[1] == 0:
+        return '{0:04d}'.format(t_date[0])
+    if t_date[2] == 0:
+        return '{0} {1:04d}'.format(_LS_MONTHS[t_date[1] - 1], t_date[0])
+    return '{0:02d}. {1} {2:04d}'.format(
+        t_date[2], _LS_MONTHS[t_date[1] - 1], t_date[0])
+
+
+def s_parse_formatted_date(s_text: str) -> str:
+    """
+    return the date (YYYY, YYYY-MM or YYYY-MM-DD) of a text formatted
+    by s_format_date, or None if the text is not such a date
+
+    >>> s_parse_formatted_date('04. Juli 2020')
+    '2020-07-04'
+
+    >>> s_parse_formatted_date('März 2021'), s_parse_formatted_date('2020')
+    ('2021-03', '2020')
+
+    >>> s_parse_formatted_date('HNA') is None
+    True
+
+    """
+    o_match = _O_FORMATTED_DATE.fullmatch(s_text)
+    if o_match is None:
+        return None
+    s_day, s_month, s_year = o_match.groups()
+    if s_month is None:
+        return s_year if s_day is None else None
+    if s_month not in _LS_MONTHS:
+        return None
+    s_date = '{0}-{1:02d}'.format(s_year, _LS_MONTHS.index(s_month) + 1)
+    if s_day is not None:
+        s_date += '-' + s_day
+    return s_date if t_parse_date(s_date) is not None else None
+
+
+def ls_format_dates(ls_dates: list) -> list:
+    """
+    return the dates as text in German (see s_format_date), each
+    distinct date is formatted once
+
+    >>> ls_format_dates(['2020-05', None, '2020-05'])
+    ['Mai 2020', None, 'Mai 2020']
+
+    """
+    ds_formatted = dict()
+    for s_date in ls_dates:
+        if s_date not in ds_formatted:
+            ds_formatted[s_date] = s_format_date(s_date)
+    return [ds_formatted[s_date] for s_date in ls_dates]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,133 @@
+"""metadata_export_tools
+
+Support functions to export the records of a listing as JSON or NDJSON
+(one JSON object per line) and to create precompressed copies (.gz) of
+the files written by the list tools, such that a web server can serve
+them as static files without compressing them on each request.
+
+Files are written as a stream: records are written one at a time to
+the file and its compressed copy, and compressed copies are created
+from the file in chunks. The compressed copies do not contain a
+modification time, i.e. the same content gives the same copy. All
+files are replaced atomically and only if their content changes (see
+AtomicFile).
+"""
+
+import gzip
+import json
+import os
+import shutil
+
+from .class_atomicfile import AtomicFile
+
+# formats of an export
+
+LS_EXPORT_FORMATS = ['ndjson', 'json']
+
+
+def _o_gzip(o_file):
+    """
+    return a compressing writer to the given binary file (without
+    name and modification time in its header)
+    """
+    return gzip.GzipFile(filename='', mode='wb', fileobj=o_file, mtime=0)
+
+
+def b_write_gzip(s_filename: str, b_force=False) -> bool:
+    """
+    create the compressed copy s_filename.gz unless it is not older
+    than the file (b_force: the file was just written, its time may
+    not differ from that of the copy); returns True if written
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as s_folder:
+    ...     s_filename = os.path.join(s_folder, 'a.htm')
+    ...     with open(s_filename, 'w') as o_file:
+    ...         _ = o_file.write('<p>abc</p>\\n')
+    ...     b_first = b_write_gzip(s_filename)
+    ...     with gzip.open(s_filename + '.gz', 'rt') as o_file:
+    ...         s_text = o_file.read()
+    ...     b_first, b_write_gzip(s_filename), s_text
+    (True, False, '<p>abc</p>\\n')
+
+    """
+    s_gzip = s_filename + '.gz'
+    try:
+        if not b_force and os.stat(s_gzip).st_mtime_ns \
+                >= os.stat(s_filename).st_mtime_ns:
+            return False
+    except OSError:
+        pass
+    o_atomic = AtomicFile(s_gzip)
+    with open(s_filename, 'rb') as o_input, o_atomic as o_raw, \
+            _o_gzip(o_raw) as o_output:
+        shutil.copyfileobj(o_input, o_output)
+    return o_atomic.b_get_written()
+
+
+def b_write_text(s_filename: str, s_text: str) -> bool:
+    """
+    write the text to the file and its compressed copy unless the file
+    has this content already; returns True if written
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as s_folder:
+    ...     s_filename = os.path.join(s_folder, 'a.json')
+    ...     lb_written = [
+    ...         b_write_text(s_filename, s_text) for s_text in ['1', '1', '2']]
+    ...     with gzip.open(s_filename + '.gz', 'rt') as o_file:
+    ...         s_text = o_file.read()
+    ...     lb_written, s_text
+    ([True, False, True], '2')
+
+    """
+    o_atomic = AtomicFile(s_filename)
+    with o_atomic as o_file:
+        o_file.write(s_text.encode('utf-8'))
+    b_write_gzip(s_filename, o_atomic.b_get_written())
+    return o_atomic.b_get_written()
+
+
+def n_write_export(s_filename: str, s_format: str, it_records) -> int:
+    """
+    write the records (dicts) to s_filename and s_filename.gz in the
+    given format (see LS_EXPORT_FORMATS), one record per line; returns
+    the number of records written
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as s_folder:
+    ...     s_filename = os.path.join(s_folder, 'a.json')
+    ...     n_count = n_write_export(
+    ...         s_filename, 'json', iter([{'ID': 1}, {'ID': 2}]))
+    ...     with open(s_filename) as o_file:
+    ...         s_text = o_file.read()
+    ...     with gzip.open(s_filename + '.gz', 'rt') as o_file:
+    ...         b_same = o_file.read() == s_text
+    ...     n_count, json.loads(s_text), b_same
+    (2, [{'ID': 1}, {'ID': 2}], True)
+
+    """
+    if s_format not in LS_EXPORT_FORMATS:
+        raise ValueError('Invalid export format: >{0}<'.format(s_format))
+    n_count = 0
+    with AtomicFile(s_filename) as o_file, \
+            AtomicFile(s_filename + '.gz') as o_raw, \
+            _o_gzip(o_raw) as o_gzip:
+        for dx_record in it_records:
+            s_line = json.dumps(dx_record, ensure_ascii=False)
+            if s_format == 'json':
+                s_line = ('[' if n_count == 0 else ',') + s_line
+            b_line = (s_line + '\n').encode('utf-8')
+            o_file.write(b_line)
+            o_gzip.write(b_line)
+            n_count += 1
+        if s_format == 'json':
+            b_line = b'[]\n' if n_count == 0 else b']\n'
+            o_file.write(b_line)
+            o_gzip.write(b_line)
+    return n_count
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,77 @@
+"""metadata_hash_tools
+
+Support functions to compute the content hashes of the files in the
+archive folder (see hash and ArchiveManifest)
+
+Files are read in chunks into a reused buffer; hashlib releases the
+interpreter lock while hashing larger chunks, such that several files
+are hashed in parallel by a pool of threads.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# size of the chunks read from a file
+
+_N_CHUNK_SIZE = 1 << 20
+
+# hash algorithm used
+
+S_HASH_NAME = 'sha256'
+
+
+def s_hash_file(s_filename: str) -> str:
+    """
+    return the hex digest of the content of the given file
+
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile(delete=False) as o_file:
+    ...     _ = o_file.write(b'abc')
+    >>> s_hash_file(o_file.name)[:16]
+    'ba7816bf8f01cfea'
+    >>> os.remove(o_file.name)
+
+    """
+    o_hash = hashlib.new(S_HASH_NAME)
+    b_buffer = bytearray(_N_CHUNK_SIZE)
+    o_view = memoryview(b_buffer)
+    with open(s_filename, 'rb', buffering=0) as o_file:
+        while True:
+            n_read = o_file.readinto(b_buffer)
+            if not n_read:
+                break
+            o_hash.update(o_view[:n_read])
+    return o_hash.hexdigest()
+
+
+def _t_hash_entry(s_root: str, s_path: str) -> tuple:
+    """
+    return (s_path, hex digest or None, error or None, (size,
+    mtime_ns) after hashing or None)
+    """
+    s_filename = os.path.join(s_root, s_path)
+    try:
+        s_hash = s_hash_file(s_filename)
+        o_stat = os.stat(s_filename)
+    except OSError as o_error:
+        return (s_path, None, str(o_error), None)
+    return (s_path, s_hash, None, (o_stat.st_size, o_stat.st_mtime_ns))
+
+
+def it_hash_files(s_root: str, ls_paths: list, n_workers=4):
+    """
+    hash the given files (paths relative to s_root) concurrently;
+    yields (s_path, s_hash, s_error, t_stat) in the order given where
+    t_stat is (size, mtime_ns) of the file after hashing (to detect
+    files changed while hashing)
+    """
+    with ThreadPoolExecutor(max_workers=n_workers) as o_pool:
+        for t_result in o_pool.map(
+                lambda s_path: _t_hash_entry(s_root, s_path), ls_paths):
+            yield t_result
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,317 @@
+"""metadata_http_tools
+
+Support functions to check the status of urls via HTTP(S)
+
+The functions here use http.client directly (instead of urlopen) such
+that connect and read timeouts can be set separately and connections
+can be kept open for further requests to the same host (see HttpPool);
+any other scheme is handed over to urlopen.
+
+To save bandwidth, a url is checked using HEAD; only if the server
+reports an error for HEAD (some servers do not support it) the url is
+checked again with a GET for the first byte only. Response bodies are
+not read unless they are known to be small.
+"""
+import http.client
+import socket
+from urllib.parse import urlsplit, urljoin, quote
+from urllib.request import Request, urlopen
+from urllib.error import URLError, HTTPError
+
+from .class_httppool import HttpPool
+
+# default timeouts in seconds
+
+F_CONNECT_TIMEOUT = 10.0
+F_READ_TIMEOUT = 30.0
+
+# status codes for which urlopen follows the redirection, and the
+# maximum number of redirections followed (same as urlopen)
+
+_TI_REDIRECTS = (301, 302, 303, 307, 308)
+_N_MAX_REDIRECTS = 10
+
+# status codes indicating a temporary problem of the server
+
+_TI_TRANSIENT = (408, 429, 500, 502, 503, 504)
+
+# status if the host name does not exist (the DNS lookup failed for
+# good, not temporarily), and the errors of getaddrinfo meaning so
+
+I_STATUS_UNKNOWN_HOST = -3
+_TI_UNKNOWN_HOST = tuple(
+    getattr(socket, s_name) for s_name in ('EAI_NONAME', 'EAI_NODATA')
+    if hasattr(socket, s_name))
+
+# maximum size of a response body read such that the connection
+# can be reused; connections with larger responses or responses of
+# unknown size are closed
+
+_N_MAX_DRAIN = 65536
+
+# header for a GET of the first byte only, and the status code returned
+# if the resource is empty
+
+_DS_RANGE_HEADERS = {'Range': 'bytes=0-0'}
+_I_RANGE_NOT_SATISFIABLE = 416
+
+# characters not to be quoted in a path + query
+
+_S_SAFE_CHARS = "/%:@!$&'()*+,;=-._~?"
+
+_DS_HEADERS = {
+    'User-Agent':
+    'Mozilla/5.0 (X11; Linux x86_64; rv:78.0) '
+    'Gecko/20100101 Firefox/78.0'
+    }
+
+# connections kept for checks without a pool of their own
+
+_O_SHARED_POOL = HttpPool()
+
+
+def s_status_message(i_status: int, s_reason=None) -> str:
+    """
+    Return the error message for a failed check; i_status is
+    the HTTP status code or 0 if the server could not be reached
+
+    >>> s_status_message(404)
+    "Server couldn't fulfill the request.\\nHTTP status code: 404."
+
+    >>> s_status_message(0, 'timed out')
+    'Could not reach server, reason:\\ntimed out.'
+
+    """
+    if i_status > 0:
+        return (
+            "Server couldn't fulfill the request.\n"
+            "HTTP status code: {0}.".format(i_status)
+            )
+    return (
+        "Could not reach server, reason:\n"
+        "{0}.".format(s_reason)
+        )
+
+
+def b_is_transient(i_status: int) -> bool:
+    """
+    True if a check with the given result should be repeated later:
+    server could not be reached (0) or reported a temporary problem
+
+    >>> b_is_transient(0), b_is_transient(503), b_is_transient(404)
+    (True, True, False)
+
+    """
+    return i_status == 0 or i_status in _TI_TRANSIENT
+
+
+def b_is_dead(i_status: int) -> bool:
+    """
+    True if a check with the given result shows a dead link for good:
+    the server reported a client error (except temporary ones, see
+    b_is_transient) or the host name does not exist
+
+    >>> b_is_dead(404), b_is_dead(410), b_is_dead(I_STATUS_UNKNOWN_HOST)
+    (True, True, True)
+
+    >>> b_is_dead(0), b_is_dead(429), b_is_dead(503), b_is_dead(200)
+    (False, False, False, False)
+
+    """
+    return i_status == I_STATUS_UNKNOWN_HOST or (
+        400 <= i_status < 500 and not b_is_transient(i_status))
+
+
+def _t_urlopen(s_url: str, f_timeout: float) -> tuple:
+    """
+    check non-HTTP(S) urls using urlopen
+    """
+    try:
+        with urlopen(Request(s_url, None, _DS_HEADERS), timeout=f_timeout):
+            pass
+    except HTTPError as u_error:
+        return (u_error.code, s_status_message(u_error.code), None, None)
+    except URLError as u_error:
+        return (0, s_status_message(0, u_error.reason), None, None)
+    except (ValueError, OSError) as u_error:
+        return (-1, (
+            "Unable to check status of server, reason:\n"
+            "{0}.".format(u_error)
+            ), None, None)
+    return (200, None, None, None)
+
+
+def ds_conditional_headers(s_etag: str, s_last_modified: str) -> dict:
+    """
+    return the request headers to revalidate a url using the
+    validators received with an earlier response
+
+    >>> ds_conditional_headers('"abc"', None)
+    {'If-None-Match': '"abc"'}
+
+    """
+    ds_headers = dict()
+    if s_etag:
+        ds_headers['If-None-Match'] = s_etag
+    if s_last_modified:
+        ds_headers['If-Modified-Since'] = s_last_modified
+    return ds_headers
+
+
+def _b_drain(o_response) -> bool:
+    """
+    read the remainder of a small response; returns True if the
+    response was read completely and the connection can be reused
+    """
+    if o_response.will_close or o_response.length is None \
+            or o_response.length > _N_MAX_DRAIN:
+        o_response.close()
+        return False
+    o_response.read(_N_MAX_DRAIN + 1)
+    if o_response.isclosed():
+        return True
+    o_response.close()
+    return False
+
+
+def _t_request(
+        o_pool, o_url, s_method: str, ds_headers: dict,
+        f_connect_timeout: float, f_read_timeout: float) -> tuple:
+    """
+    send a single request using a pooled connection, repeating the
+    request once if a reused connection was closed by the server;
+    returns (i_status, s_location, s_etag, s_last_modified)
+    """
+    s_path = s_request_path(o_url)
+    o_connection, b_reused = o_pool.t_acquire(
+        o_url, f_connect_timeout, f_read_timeout)
+    while True:
+        try:
+            o_connection.request(s_method, s_path, headers=ds_headers)
+            o_response = o_connection.getresponse()
+            t_result = (
+                o_response.status,
+                o_response.getheader('Location'),
+                o_response.getheader('ETag'),
+                o_response.getheader('Last-Modified'))
+            o_pool.release(o_url, o_connection, _b_drain(o_response))
+            return t_result
+        except (OSError, http.client.HTTPException):
+            o_connection.close()
+            if not b_reused:
+                raise
+        o_connection = o_pool.o_connect(
+            o_url, f_connect_timeout, f_read_timeout)
+        b_reused = False
+
+
+def s_request_path(o_url) -> str:
+    """
+    return the path and query of a (split) url as used in the request
+
+    >>> s_request_path(urlsplit('https://example.com'))
+    '/'
+
+    >>> s_request_path(urlsplit('https://example.com/Bürger?a=1#top'))
+    '/B%C3%BCrger?a=1'
+
+    """
+    s_path = o_url.path or '/'
+    if o_url.query:
+        s_path += '?' + o_url.query
+    return quote(s_path, _S_SAFE_CHARS)
+
+
+def _t_follow(
+        o_pool, s_url: str, s_method: str, ds_headers: dict,
+        f_connect_timeout: float, f_read_timeout: float) -> tuple:
+    """
+    send request for url, following redirections; returns
+    (i_status, s_etag, s_last_modified) of the final response
+    """
+    i_status = -1
+    s_etag = None
+    s_last_modified = None
+    for _ in range(_N_MAX_REDIRECTS + 1):
+        o_url = urlsplit(s_url)
+        if not o_url.hostname:
+            raise ValueError('no host given')
+        i_status, s_location, s_etag, s_last_modified = _t_request(
+            o_pool, o_url, s_method, ds_headers,
+            f_connect_timeout, f_read_timeout)
+        if i_status not in _TI_REDIRECTS or not s_location:
+            break
+        s_url = urljoin(s_url, s_location)
+    return (i_status, s_etag, s_last_modified)
+
+
+def t_probe_url(
+        s_url: str,
+        f_connect_timeout=F_CONNECT_TIMEOUT,
+        f_read_timeout=F_READ_TIMEOUT,
+        ds_headers=None,
+        o_pool=None) -> tuple:
+    """
+    Test whether given url can be reached, following redirections;
+    ds_headers are added to the request, e.g. to make it conditional
+    (see ds_conditional_headers); connections are taken from o_pool,
+    or from a pool shared by all callers without a pool.
+
+    The url is checked using HEAD; if the server reports an error, the
+    result of a GET for the first byte (or the whole resource if it is
+    empty) is returned such that the result is the same as for a GET.
+
+        Returns:
+            (i_status, s_error, s_etag, s_last_modified) where i_status
+            is the final HTTP status code, 0 if the server could not be
+            reached, I_STATUS_UNKNOWN_HOST if its name does not exist,
+            or -1 if the url could not be checked at all;
+            s_error is None if the url could be reached (this includes
+            304 - not modified), else an error message; s_etag and
+            s_last_modified are the validators of the final response
+            (or None)
+    """
+    o_url = urlsplit(s_url)
+    if o_url.scheme not in ('http', 'https'):
+        return _t_urlopen(s_url, f_connect_timeout + f_read_timeout)
+
+    if o_pool is None:
+        o_pool = _O_SHARED_POOL
+
+    ds_request = dict(_DS_HEADERS)
+    if ds_headers:
+        ds_request.update(ds_headers)
+
+    try:
+        i_status, s_etag, s_last_modified = _t_follow(
+            o_pool, s_url, 'HEAD', ds_request,
+            f_connect_timeout, f_read_timeout)
+        if i_status >= 400:
+            ds_range = dict(ds_request, **_DS_RANGE_HEADERS)
+            i_status, s_etag, s_last_modified = _t_follow(
+                o_pool, s_url, 'GET', ds_range,
+                f_connect_timeout, f_read_timeout)
+        if i_status == _I_RANGE_NOT_SATISFIABLE:
+            i_status, s_etag, s_last_modified = _t_follow(
+                o_pool, s_url, 'GET', ds_request,
+                f_connect_timeout, f_read_timeout)
+    except (http.client.InvalidURL, ValueError) as u_error:
+        return (-1, (
+            "Unable to check status of server, reason:\n"
+            "{0}.".format(u_error)
+            ), None, None)
+    except socket.gaierror as u_error:
+        return (
+            I_STATUS_UNKNOWN_HOST if u_error.errno in _TI_UNKNOWN_HOST
+            else 0, s_status_message(0, u_error), None, None)
+    except (OSError, http.client.HTTPException) as u_error:
+        return (0, s_status_message(0, u_error), None, None)
+
+    if 200 <= i_status < 300 or i_status == 304:
+        return (i_status, None, s_etag, s_last_modified)
+    return (i_status, s_status_message(i_status), None, None)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
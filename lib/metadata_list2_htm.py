@@ -1,12 +1,22 @@
 """metadata_list2_htm
 
 provides several HTML formatting functions to be used by list2
-row to ensure consistent formatting
+row to ensure consistent formatting, and the insertion of an entry
+into an existing listing of list2 (see b_insert_entry)
 """
+import re
 from html import escape
-import datetime
 
+from .class_atomicfile import AtomicFile
 from .metadata_check_tools import s_fix_url_for_html
+from .metadata_date_tools import s_format_date, s_parse_formatted_date
+
+# heading of a section, media and date following the title of an entry
+# (the media may contain parentheses as well), url of an entry
+
+_O_HEADING = re.compile(r'<h3>(.*)</h3>')
+_O_MEDIA_DATE = re.compile(r'</i>(?:</a>)? \((.*)\)$')
+_O_URL = re.compile(r'^<a href="([^"]*)"')
 
 _ICON_LIST = {
     '#paywall': '&#xf023;',
@@ -56,34 +66,6 @@ def s_format_heading(s_text: str) -> str:
     return "<h3>{0}</h3>".format(s_text)
 
 
-def s_format_date(s_date: str) -> str:
-    """
-    return a useful date string - none if date is not valid
-    """
-    try:
-        ls_date = s_date.split('-')
-        if len(ls_date) == 1:
-            s_date = datetime.date(
-                int(ls_date[0]), 1, 1).strftime('%Y')
-        elif len(ls_date) == 2:
-            s_date = datetime.date(
-                int(ls_date[0]),
-                int(ls_date[1]),
-                1).strftime('%B %Y')
-        elif len(ls_date) == 3:
-            s_date = datetime.date(
-                int(ls_date[0]),
-                int(ls_date[1]),
-                int(ls_date[2])).strftime('%d. %B %Y')
-        else:
-            s_date = None
-
-    except ValueError:
-        s_date = None
-
-    return s_date
-
-
 # pylint: disable=too-many-arguments
 
 def s_format_entry(
@@ -140,6 +122,128 @@ def s_format_entry(
     return s_result
 
 
+def s_get_entry_date(s_entry: str) -> str:
+    """
+    return the date (YYYY, YYYY-MM or YYYY-MM-DD) of an entry as
+    formatted by s_format_entry, or None if it has no date
+
+    >>> s_get_entry_date(s_format_entry(
+    ...     'Titel (Video)', None, None, 'Kurier', '2021-09-03'))
+    '2021-09-03'
+
+    >>> s_get_entry_date(s_format_entry(
+    ...     'Titel', None, 'https://a.de', 'HNA (Kassel)', '2021-09'))
+    '2021-09'
+
+    >>> s_get_entry_date(s_format_entry('Titel', None, None, 'HNA', None))
+
+    """
+    o_match = _O_MEDIA_DATE.search(s_entry)
+    if o_match is None:
+        return None
+    return s_parse_formatted_date(o_match.group(1).rsplit(', ', 1)[-1])
+
+
+def _ls_insert_into_section(
+        ls_lines: list, s_date: str, s_entry: str) -> list:
+    """
+    return the lines of a section (heading, paragraph and one entry
+    per line) with the entry inserted after all entries with the same
+    or a later date (entries without date last), or None if the entry
+    or its url is already listed in the section
+    """
+    ls_entries = ''.join(ls_lines[2:])[:-len('</p>\n')].split('<br />\n')
+    o_match = _O_URL.match(s_entry)
+    for s_other in ls_entries:
+        if s_other == s_entry or (
+                o_match is not None
+                and s_other.startswith(o_match.group(0))):
+            return None
+    i_pos = len(ls_entries)
+    for i_entry, s_other in enumerate(ls_entries):
+        s_other_date = s_get_entry_date(s_other)
+        if s_date is not None and (
+                s_other_date is None or s_other_date < s_date):
+            i_pos = i_entry
+            break
+    ls_entries.insert(i_pos, s_entry)
+    return ls_lines[:2] + ['<br />\n'.join(ls_entries) + '</p>\n']
+
+
+def b_insert_entry(
+        s_filename: str,
+        t_section: tuple,
+        s_date: str,
+        s_entry: str,
+        di_levels: dict) -> bool:
+    """
+    insert an entry (see s_format_entry) into a listing of list2 by a
+    single pass over the file: into the section given by (level,
+    label) in the order of its dates (latest first), or into a new
+    section in the order of the sections (by level, then label) if
+    not found; the levels of the sections of the listing are taken
+    from di_levels per label; labels not found are places (3) after
+    the first section found, before it they are records of an unknown
+    region (0, shown first)
+
+    returns True if a new section was created, None if the entry (or
+    its url) is already listed in the section; the file is not changed
+    then
+    """
+    b_done = False
+    b_new_section = True
+    i_level = 0
+    ls_section = []
+
+    def ls_new_section() -> list:
+        """ lines of the new section """
+        return [
+            s_format_heading(t_section[1]) + '\n', '<p>\n',
+            s_entry + '</p>\n']
+
+    o_atomic = AtomicFile(s_filename)
+    with open(s_filename, 'r', encoding='utf-8') as o_input, \
+            o_atomic as o_output:
+        for s_line in o_input:
+            if not ls_section and _O_HEADING.fullmatch(s_line.rstrip()):
+                ls_section.append(s_line)
+                continue
+            if not ls_section:
+                if not b_done and s_line.startswith('</body>'):
+                    o_output.write(''.join(ls_new_section()).encode('utf-8'))
+                    b_done = True
+                o_output.write(s_line.encode('utf-8'))
+                continue
+
+            # collect a section up to its closing tag
+
+            ls_section.append(s_line)
+            if not s_line.endswith('</p>\n'):
+                continue
+
+            s_label = _O_HEADING.fullmatch(ls_section[0].rstrip()).group(1)
+            i_level = max(
+                i_level, di_levels.get(s_label, 3 if i_level > 0 else 0))
+            if not b_done and (i_level, s_label) == t_section:
+                ls_inserted = _ls_insert_into_section(
+                    ls_section, s_date, s_entry)
+                if ls_inserted is None:
+                    b_new_section = None
+                else:
+                    ls_section = ls_inserted
+                    b_new_section = False
+                b_done = True
+            elif not b_done and (i_level, s_label) > t_section:
+                ls_section = ls_new_section() + ls_section
+                b_done = True
+            o_output.write(''.join(ls_section).encode('utf-8'))
+            ls_section = []
+        o_output.write(''.join(ls_section).encode('utf-8'))
+        if not b_done:
+            o_output.write(''.join(ls_new_section()).encode('utf-8'))
+    return b_new_section
+
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
@@ -78,6 +78,13 @@ class ConfigParams:
 
     METADATA_TABLE = 'metadata'
     REGIONS_TABLE = 'regions'
+    URL_STATUS_TABLE = 'url_status'
+    PING_RUNS_TABLE = 'ping_runs'
+    PING_HISTORY_TABLE = 'ping_history'
+    PING_QUEUE_TABLE = 'ping_queue'
+    ARCHIVE_TABLE = 'archive_manifest'
+    FRAGMENT_TABLE = 'list_fragments'
+    SEARCH_TABLE = 'search_words'
 
     METADATA_COLS = _LS_CONFIG_SECTIONS[0]
     REGIONS_COLS = _LS_CONFIG_SECTIONS[1]
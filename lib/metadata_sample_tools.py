@@ -0,0 +1,201 @@
+"""metadata_sample_tools
+
+Support functions to estimate the share of dead links from a
+stratified random sample (see ping --sample)
+
+The links are divided into strata (e.g. by region, media and year);
+the sample size needed for the requested margin of error is allocated
+to the strata in proportion to their size (at least one link each).
+Strata too small for a link of their own are merged first (e.g. the
+years of a region and media), such that the sample does not grow
+beyond the size needed.
+The share of dead links is estimated per stratum (Wilson interval)
+and for all links (stratified estimate with finite population
+correction).
+"""
+
+import math
+from statistics import NormalDist
+
+
+def f_z_value(f_confidence: float) -> float:
+    """
+    return the two-sided standard normal quantile for the given
+    confidence level
+
+    >>> round(f_z_value(0.95), 3)
+    1.96
+
+    """
+    return NormalDist().inv_cdf((1.0 + f_confidence) / 2.0)
+
+
+def n_sample_size(
+        n_population: int, f_margin: float, f_confidence: float) -> int:
+    """
+    return the number of links to check such that the share of dead
+    links is estimated within +/- f_margin at the given confidence
+    level (worst case share of 50 %, finite population correction)
+
+    >>> n_sample_size(100000, 0.05, 0.95)
+    383
+
+    >>> n_sample_size(1000, 0.05, 0.95)
+    278
+
+    >>> n_sample_size(10, 0.05, 0.95)
+    10
+
+    """
+    if n_population <= 0:
+        return 0
+    f_n0 = f_z_value(f_confidence) ** 2 * 0.25 / f_margin ** 2
+    return min(n_population, math.ceil(
+        f_n0 / (1.0 + (f_n0 - 1.0) / n_population)))
+
+
+def dx_collapse(di_sizes: dict, n_sample: int) -> dict:
+    """
+    return the stratum each stratum (a tuple of its parts) is merged
+    into such that each stratum gets at least one link of a sample of
+    n_sample links in proportion to its size: too small strata are
+    merged by their leading parts, dropping the last part ('*') first,
+    up to a single stratum of the remaining small strata
+
+    >>> dx_collapse({('a', 'x'): 60, ('a', 'y'): 4, ('a', 'z'): 4,
+    ...              ('b', 'x'): 2}, 10)[('a', 'y')]
+    ('a', '*')
+
+    >>> sorted(set(dx_collapse({('a', 'x'): 60, ('a', 'y'): 2,
+    ...                         ('a', 'z'): 3, ('b', 'x'): 5}, 10).values()))
+    [('*', '*'), ('a', 'x')]
+
+    """
+    dx_merged = {x_key: x_key for x_key in di_sizes}
+    n_total = sum(di_sizes.values())
+    if n_total == 0 or not di_sizes:
+        return dx_merged
+    f_per_link = n_sample / n_total
+
+    for i_part in reversed(range(len(next(iter(di_sizes))))):
+        di_merged = dict()
+        for x_key, t_merged in dx_merged.items():
+            di_merged[t_merged] = \
+                di_merged.get(t_merged, 0) + di_sizes[x_key]
+        for x_key, t_merged in dx_merged.items():
+            if di_merged[t_merged] * f_per_link < 1.0:
+                dx_merged[x_key] = \
+                    t_merged[:i_part] + ('*',) * (len(t_merged) - i_part)
+    return dx_merged
+
+
+def di_allocate(di_sizes: dict, n_sample: int) -> dict:
+    """
+    return the number of links to sample per stratum: proportional
+    to the size of the stratum (largest remainders), at least one
+    link per stratum, at most all links of the stratum
+
+    >>> di_allocate({'a': 60, 'b': 30, 'c': 10}, 10)
+    {'a': 6, 'b': 3, 'c': 1}
+
+    >>> di_allocate({'a': 98, 'b': 1, 'c': 1}, 4)
+    {'a': 2, 'b': 1, 'c': 1}
+
+    """
+    n_total = sum(di_sizes.values())
+    if n_total == 0:
+        return {x_key: 0 for x_key in di_sizes}
+    n_sample = min(n_sample, n_total)
+
+    df_share = {
+        x_key: n_size * n_sample / n_total
+        for x_key, n_size in di_sizes.items()}
+    di_alloc = {
+        x_key: min(n_size, max(1, int(df_share[x_key])))
+        for x_key, n_size in di_sizes.items()}
+
+    # distribute the remainder by largest difference to the share
+
+    n_left = n_sample - sum(di_alloc.values())
+    for x_key in sorted(
+            df_share, key=lambda x_key: di_alloc[x_key] - df_share[x_key]):
+        if n_left <= 0:
+            break
+        if di_alloc[x_key] < di_sizes[x_key]:
+            di_alloc[x_key] += 1
+            n_left -= 1
+    for x_key in sorted(
+            df_share, key=lambda x_key: df_share[x_key] - di_alloc[x_key]):
+        if n_left >= 0:
+            break
+        if di_alloc[x_key] > 1:
+            di_alloc[x_key] -= 1
+            n_left += 1
+    return di_alloc
+
+
+def t_wilson_interval(n_dead: int, n_sample: int, f_z: float) -> tuple:
+    """
+    return (lower, upper) bound of the Wilson score interval for the
+    share of dead links
+
+    >>> tuple(round(f_bound, 3) for f_bound in t_wilson_interval(
+    ...     5, 50, 1.96))
+    (0.043, 0.214)
+
+    """
+    if n_sample == 0:
+        return (0.0, 1.0)
+    f_share = n_dead / n_sample
+    f_z2 = f_z * f_z
+    f_center = (f_share + f_z2 / (2 * n_sample)) / (1 + f_z2 / n_sample)
+    f_half = f_z / (1 + f_z2 / n_sample) * math.sqrt(
+        f_share * (1 - f_share) / n_sample + f_z2 / (4 * n_sample ** 2))
+    return (max(0.0, f_center - f_half), min(1.0, f_center + f_half))
+
+
+def t_stratified_estimate(lt_strata: list, f_z: float) -> tuple:
+    """
+    return (share, lower, upper) of dead links of the population from
+    lt_strata: (links in stratum, links sampled, dead links sampled);
+    strata of which all links were checked add no uncertainty, strata
+    without links sampled are assumed to be like the others
+
+    >>> tuple(round(f_value, 3) for f_value in t_stratified_estimate(
+    ...     [(600, 60, 6), (400, 40, 0)], 1.96))
+    (0.06, 0.016, 0.104)
+
+    >>> tuple(round(f_value, 3) for f_value in t_stratified_estimate(
+    ...     [(1, 1, 1), (3, 1, 0)], 1.96))
+    (0.25, 0.0, 0.85)
+
+    >>> tuple(round(f_value, 3) for f_value in t_stratified_estimate(
+    ...     [(600, 60, 6), (400, 0, 0)], 1.96))
+    (0.1, 0.027, 0.173)
+
+    """
+    n_total = sum(
+        t_stratum[0] for t_stratum in lt_strata if t_stratum[1] > 0)
+    if n_total == 0:
+        return (0.0, 0.0, 1.0)
+    f_share = 0.0
+    f_variance = 0.0
+    for n_size, n_sample, n_dead in lt_strata:
+        if n_sample == 0:
+            continue
+        f_weight = n_size / n_total
+        f_stratum = n_dead / n_sample
+        f_share += f_weight * f_stratum
+
+        # a single link gives no variance estimate: assume the worst
+
+        f_spread = f_stratum * (1 - f_stratum) / (n_sample - 1) \
+            if n_sample > 1 else 0.25
+        f_variance += f_weight ** 2 * (1 - n_sample / n_size) * f_spread
+    f_half = f_z * math.sqrt(f_variance)
+    return (f_share, max(0.0, f_share - f_half), min(1.0, f_share + f_half))
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
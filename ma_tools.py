@@ -9,26 +9,50 @@ Syntax:
     ma_tools <tool> <options>
 
     tool:   check   perform basic checks on the given csv file(s)
-                    (-c, --config, -p, --ping, -x, --exist)
+                    (-c, --config, -p, --ping, -x, --exist, --workers)
 
             load    load data into database
                     (-c, --config)
 
             ping    update url and file status in database
-                    (-c, --config)
+                    (-c, --config, --workers, --host-limit,
+                    --connect-timeout, --read-timeout, --retries,
+                    --ttl, --budget-time, --budget-requests,
+                    --host-failures, --worker, --batch, --lease,
+                    --sample, --confidence, --seed, --rescan)
 
             list<n> create a listing of the metadata
                     (-c, --config, [-m, --month])
                     -m, --month used only for list3
+                    list1 also: --by-year
+                    list2 also: --export
+                    list3 also: --from, --to, --export
+                    the content hashes of the files published are
+                    kept in ma_publish.json (also render, index)
+
+            render  create the listings of list1, list2 and list3
+                    with a single read of the database
+                    (-c, --config, [-m, --month])
+                    -m, --month for list3, several months separated
+                    by comma; also: --export
+
+            index   create the search index of the records of list2
+                    in folder ma_search (JSON files and .gz copies)
+                    (-c, --config)
 
             files   utility to check if files in database match
                     files in archive folder
-                    (-c, --config)
+                    (-c, --config, --rescan)
+
+            hash    compute content hashes of the files in archive
+                    folder, report identical files (duplicates)
+                    (-c, --config, --verify, --rescan, --workers)
 
             row     processes a single row from the media archive:
                     perform some checks, output a generated backup filename,
                     and create an HTML snippet suitable for inclusion in the
                     radelnohnealter.de/presse webpage.
+                    (-c, --config, --insert)
 
             help    outputs this text
 
@@ -40,10 +64,71 @@ Syntax:
     -c, --config        path and filename of configuration file
                         (defaults to ma_tools.ini)
     -m, --month         value format: YYYY-MM
-                        month to be reported (list3 only),
+                        month to be reported (list3 and render),
                         defaults to previous month
+    --from, --to        value format: YYYY-MM
+                        create a listing for each month of this range
+                        and an index page (list3 only), --to defaults
+                        to previous month
+    --by-year           one page per year and an index page
+                        (list1 only)
+    --export            value format: ndjson or json (defaults to ndjson
+                        if given without value); also write the records
+                        listed to a file of this format, and compressed
+                        copies (.gz) of all files written (list2, list3,
+                        render)
+    --insert            insert the entry into the existing listing
+                        ma_list2.htm without load and list2 (row only)
     -p, --ping          check if urls exist (check only)
     -x, --exist         check if files exist (check only)
+    --workers           number of urls checked concurrently
+                        (ping, defaults to 16), files hashed
+                        concurrently (hash, defaults to 4) or files
+                        checked concurrently (check -x, defaults to 8)
+    --host-limit        maximum number of concurrent requests to
+                        the same host (ping only, defaults to 2)
+    --connect-timeout   seconds to wait for a connection to a server
+                        (ping only, defaults to 10)
+    --read-timeout      seconds to wait for data from a server
+                        (ping only, defaults to 30)
+    --retries           number of repetitions if a server could not
+                        be reached or reported a temporary problem
+                        (ping only, defaults to 2)
+    --ttl               hours during which a link checked successfully
+                        is not checked again; 0 checks all links
+                        (ping only, defaults to 24)
+    --budget-time       stop checking links after the given number of
+                        minutes; the next ping continues the run
+                        (ping only, defaults to 0: no limit)
+    --budget-requests   stop after checking the given number of links;
+                        the next ping continues the run
+                        (ping only, defaults to 0: no limit)
+    --host-failures     skip the remaining links of a server which could
+                        not be reached for this number of links in a row
+                        (ping only, defaults to 5; 0 never skips)
+    --worker            help checking the links of the current run as an
+                        additional worker, e.g. on another machine
+                        sharing the database file (ping only)
+    --batch             number of links claimed by a worker at a time
+                        (ping only, defaults to 50)
+    --lease             seconds after which links claimed by a worker
+                        are claimed again if not yet checked
+                        (ping only, defaults to 600)
+    --sample            only estimate the share of dead links from a
+                        random sample (by region, media and year) sized
+                        for the given margin of error, e.g. 0.05 for
+                        +/- 5 percentage points (ping only, defaults to
+                        0.05 if given without value)
+    --confidence        confidence level of the estimates
+                        (ping --sample only, defaults to 0.95)
+    --seed              number selecting the random sample such that it
+                        can be repeated (ping --sample only)
+    --rescan            read all folders of the archive again instead of
+                        only those changed since the last run, e.g. to
+                        notice files replaced in place (files, hash,
+                        ping)
+    --verify            hash all files again and report files whose
+                        content changed unnoticed (hash only)
     -h, --help          outputs this text or specific information about
                         the selected tool
     -v, --version       reports the version of program
@@ -56,7 +141,8 @@ import sys
 
 LS_SUBCMD = [r'check', r'load', r'ping', r'list1',
              r'list2', r'list3', r'files', r'help',
-             r'row', r'makefn']
+             r'row', r'makefn', r'hash',
+             r'render', r'index']
 
 # versioning:   major.minor.intermediate
 #
@@ -76,6 +162,39 @@ class ArgumentParser(argparse.ArgumentParser):
         print(__doc__)
 
 
+def i_positive(s_value: str) -> int:
+    """
+    argument type: integer of at least 1
+    """
+    i_value = int(s_value)
+    if i_value < 1:
+        raise argparse.ArgumentTypeError(
+            'must be at least 1: {0}'.format(s_value))
+    return i_value
+
+
+def i_not_negative(s_value: str) -> int:
+    """
+    argument type: integer of at least 0
+    """
+    i_value = int(s_value)
+    if i_value < 0:
+        raise argparse.ArgumentTypeError(
+            'must not be negative: {0}'.format(s_value))
+    return i_value
+
+
+def f_share(s_value: str) -> float:
+    """
+    argument type: number between 0 and 1 (both excluded)
+    """
+    f_value = float(s_value)
+    if not 0.0 < f_value < 1.0:
+        raise argparse.ArgumentTypeError(
+            'must be between 0 and 1: {0}'.format(s_value))
+    return f_value
+
+
 def init_argparse() -> ArgumentParser():
     """
     Initialize argparse and return handle.
@@ -110,6 +229,94 @@ def init_argparse() -> ArgumentParser():
         r'-m', r'--month',
         default=None
     )
+    parser.add_argument(
+        r'--by-year', action=r'store_true',
+        default=False
+    )
+    parser.add_argument(
+        r'--export', choices=[r'ndjson', r'json'], nargs=r'?',
+        const=r'ndjson', default=None
+    )
+    parser.add_argument(
+        r'--insert', action=r'store_true',
+        default=False
+    )
+    parser.add_argument(
+        r'--from', dest=r'from_month',
+        default=None
+    )
+    parser.add_argument(
+        r'--to', dest=r'to_month',
+        default=None
+    )
+    parser.add_argument(
+        r'--workers', type=i_positive,
+        default=None
+    )
+    parser.add_argument(
+        r'--host-limit', type=i_positive,
+        default=2
+    )
+    parser.add_argument(
+        r'--connect-timeout', type=float,
+        default=10.0
+    )
+    parser.add_argument(
+        r'--read-timeout', type=float,
+        default=30.0
+    )
+    parser.add_argument(
+        r'--retries', type=i_not_negative,
+        default=2
+    )
+    parser.add_argument(
+        r'--ttl', type=float,
+        default=24.0
+    )
+    parser.add_argument(
+        r'--budget-time', type=float,
+        default=0.0
+    )
+    parser.add_argument(
+        r'--budget-requests', type=int,
+        default=0
+    )
+    parser.add_argument(
+        r'--host-failures', type=int,
+        default=5
+    )
+    parser.add_argument(
+        r'--worker', action=r'store_true',
+        default=False
+    )
+    parser.add_argument(
+        r'--batch', type=i_positive,
+        default=50
+    )
+    parser.add_argument(
+        r'--lease', type=float,
+        default=600.0
+    )
+    parser.add_argument(
+        r'--sample', type=f_share, nargs=r'?',
+        const=0.05, default=0.0
+    )
+    parser.add_argument(
+        r'--confidence', type=f_share,
+        default=0.95
+    )
+    parser.add_argument(
+        r'--seed', type=int,
+        default=None
+    )
+    parser.add_argument(
+        r'--rescan', action=r'store_true',
+        default=False
+    )
+    parser.add_argument(
+        r'--verify', action=r'store_true',
+        default=False
+    )
     return parser
 
 
@@ -127,11 +334,30 @@ def main():
 
     if args.tool == r'check':
         import lib.main_check
-        sys.exit(lib.main_check.main(args.config.name, args.ping, args.exist))
+        sys.exit(lib.main_check.main(
+            args.config.name, args.ping, args.exist,
+            8 if args.workers is None else args.workers))
 
     if args.tool == r'ping':
         import lib.main_ping
-        lib.main_ping.main(args.config.name)
+        lib.main_ping.main(
+            args.config.name,
+            n_workers=16 if args.workers is None else args.workers,
+            n_per_host=args.host_limit,
+            f_connect_timeout=args.connect_timeout,
+            f_read_timeout=args.read_timeout,
+            n_retries=args.retries,
+            f_ttl=args.ttl,
+            f_budget_time=args.budget_time,
+            n_budget_requests=args.budget_requests,
+            n_host_failures=args.host_failures,
+            b_worker=args.worker,
+            n_batch=args.batch,
+            f_lease=args.lease,
+            f_sample_margin=args.sample,
+            f_confidence=args.confidence,
+            i_seed=args.seed,
+            b_rescan=args.rescan)
         sys.exit(0)
 
     if args.tool == r'load':
@@ -141,26 +367,44 @@ def main():
 
     if args.tool == r'files':
         import lib.main_files
-        lib.main_files.main(args.config.name)
+        lib.main_files.main(args.config.name, args.rescan)
         sys.exit(0)
 
+    if args.tool == r'render':
+        import lib.main_render
+        sys.exit(lib.main_render.main(
+            args.config.name, args.month, args.export))
+
+    if args.tool == r'index':
+        import lib.main_index
+        lib.main_index.main(args.config.name)
+        sys.exit(0)
+
+    if args.tool == r'hash':
+        import lib.main_hash
+        sys.exit(lib.main_hash.main(
+            args.config.name, args.verify, args.rescan,
+            4 if args.workers is None else args.workers))
+
     if args.tool == r'list1':
         import lib.main_list1
-        lib.main_list1.main(args.config.name)
+        lib.main_list1.main(args.config.name, args.by_year)
         sys.exit(0)
 
     if args.tool == r'list2':
         import lib.main_list2
-        lib.main_list2.main(args.config.name)
+        lib.main_list2.main(args.config.name, args.export)
         sys.exit(0)
 
     if args.tool == r'list3':
         import lib.main_list3
-        sys.exit(lib.main_list3.main(args.config.name, args.month))
+        sys.exit(lib.main_list3.main(
+            args.config.name, args.month, args.from_month, args.to_month,
+            args.export))
 
     if args.tool == r'row':
         import lib.main_row
-        lib.main_row.main()
+        lib.main_row.main(args.config.name, args.insert)
         sys.exit(0)
 
     if args.tool == r'help':
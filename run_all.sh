@@ -24,10 +24,38 @@ pycodestyle $1 || exit 2
 #_do_syntax lib/metadata_list2_htm.py
 #_do_syntax lib/metadata_params.py
 #_do_syntax lib/class_tagstring.py
+#_do_syntax lib/class_pingengine.py
+#_do_syntax lib/class_urlstatus.py
+#_do_syntax lib/class_pingscheduler.py
+#_do_syntax lib/class_pingqueue.py
+#_do_syntax lib/class_httppool.py
+#_do_syntax lib/class_dnscache.py
+#_do_syntax lib/class_archiveindex.py
+#_do_syntax lib/class_archivemanifest.py
+#_do_syntax lib/class_atomicfile.py
+#_do_syntax lib/class_htmltemplate.py
+#_do_syntax lib/class_fragmentcache.py
+#_do_syntax lib/class_listsinks.py
+#_do_syntax lib/main_render.py
+#_do_syntax lib/class_searchindex.py
+#_do_syntax lib/class_publishmanifest.py
+#_do_syntax lib/main_index.py
+#_do_syntax lib/metadata_http_tools.py
+#_do_syntax lib/metadata_sample_tools.py
+#_do_syntax lib/metadata_hash_tools.py
+#_do_syntax lib/metadata_date_tools.py
+#_do_syntax lib/metadata_export_tools.py
+#_do_syntax lib/main_hash.py
 #_do_syntax ma_tools.py
 #_do_syntax test/
 python3 -m lib.metadata_check_reports -v
 python3 -m lib.metadata_check_tools -v
 python3 -m lib.metadata_params -v
 python3 -m lib.metadata_list2_htm -v
+python3 -m lib.metadata_http_tools -v
+python3 -m lib.metadata_sample_tools -v
+python3 -m lib.metadata_hash_tools -v
+python3 -m lib.metadata_date_tools -v
+python3 -m lib.metadata_export_tools -v
+python3 -m lib.class_searchindex -v
 python3 -m unittest -v
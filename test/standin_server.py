@@ -0,0 +1,374 @@
+"""
+local HTTP server standing in for the sites checked by ping, used by
+tests and benchmarks (see bench/bench_ping.py) without internet access
+
+The behaviour of the server is selected by query parameters of the
+requested url (any path), which may be combined:
+
+    status=<code>       answer with this status code (default 200)
+    delay=<seconds>     wait before answering
+    size=<bytes>        length of the body (default 5)
+    redirect=<n>        redirect n times (302) before answering
+    nohead=1            answer HEAD with 405
+    norange=1           ignore Range headers and send the whole body
+    etag=<value>        send ETag "<value>" and answer 304 if the request
+                        contains it in If-None-Match
+    close=1             close the connection after the response
+    reset=1             reset the connection without an answer
+
+Example:
+
+    with StandinServer() as o_server:
+        s_url = o_server.s_url('/page?status=404&delay=0.5')
+
+A Recording holds the responses of real servers for a list of urls;
+a StandinServer created with a recording answers requests for
+o_server.s_url_for(<recorded url>) as the real server did, such that
+checks can be repeated offline:
+
+    o_recording = Recording()
+    o_recording.record(['https://www.example.com/'])
+    o_recording.save('recording.json')
+"""
+
+import http.client
+import http.server
+import json
+import socket
+import struct
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs, urljoin, quote
+
+# response headers kept in a recording
+
+_TS_RECORDED_HEADERS = (
+    'Location', 'ETag', 'Last-Modified', 'Content-Length', 'Content-Range',
+    'Content-Type')
+
+# maximum size of a body sent in replay
+
+_N_MAX_REPLAY_BODY = 1 << 20
+
+
+def _reset(o_handler):
+    """ let the connection be closed with RST instead of FIN """
+    o_handler.connection.setsockopt(
+        socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    o_handler.close_connection = True
+
+
+class _StandinHandler(http.server.BaseHTTPRequestHandler):
+    """
+    answers requests as selected by the query parameters, or from the
+    recording of the server
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_HEAD(self):
+        """ answer HEAD """
+        self._answer(False)
+
+    def do_GET(self):
+        """ answer GET """
+        self._answer(True)
+
+    def log_message(self, *_):
+        """ no output """
+
+    def _answer(self, b_body: bool):
+        """ log request and send response """
+        s_range = self.headers.get('Range')
+        self.server.log_request(self.command, self.path, s_range)
+        if self.path.startswith('/replay/'):
+            self._replay(b_body, s_range)
+            return
+
+        o_url = urlsplit(self.path)
+        ds_params = {
+            s_key: ls_values[-1]
+            for s_key, ls_values in parse_qs(o_url.query).items()}
+        time.sleep(float(ds_params.get('delay', 0)))
+        if 'reset' in ds_params:
+            _reset(self)
+            return
+
+        i_redirects = int(ds_params.get('redirect', 0))
+        if i_redirects > 0:
+            ds_params['redirect'] = str(i_redirects - 1)
+            self._send(302, {'Location': o_url.path + '?' + '&'.join(
+                '{0}={1}'.format(s_key, quote(s_value))
+                for s_key, s_value in ds_params.items())}, 0, False)
+            return
+
+        if not b_body and 'nohead' in ds_params:
+            self._send(405, {}, 0, False)
+            return
+
+        ds_headers = dict()
+        if 'etag' in ds_params:
+            ds_headers['ETag'] = '"{0}"'.format(ds_params['etag'])
+            if self.headers.get('If-None-Match') == ds_headers['ETag']:
+                self._send(304, ds_headers, None, False)
+                return
+        if 'close' in ds_params:
+            ds_headers['Connection'] = 'close'
+            self.close_connection = True
+
+        i_status = int(ds_params.get('status', 200))
+        i_size = int(ds_params.get('size', 5))
+        if s_range == 'bytes=0-0' and i_status == 200 \
+                and 'norange' not in ds_params:
+            if i_size == 0:
+                self._send(416, ds_headers, 0, b_body)
+                return
+            ds_headers['Content-Range'] = 'bytes 0-0/{0}'.format(i_size)
+            i_status = 206
+            i_size = 1
+        self._send(i_status, ds_headers, i_size, b_body)
+
+    def _replay(self, b_body: bool, s_range: str):
+        """ answer as recorded """
+        d_response = self.server.d_get_recorded(
+            self.path, self.command, s_range)
+        if d_response is None:
+            self._send(404, {}, 0, b_body)
+            return
+        if 'error' in d_response:
+            _reset(self)
+            return
+
+        ds_headers = dict(d_response['headers'])
+        i_size = int(ds_headers.pop('Content-Length', 0) or 0)
+        if 'Location' in ds_headers:
+            ds_headers['Location'] = self.server.s_local_path(urljoin(
+                d_response['url'], ds_headers['Location']))
+        if d_response['status'] in (200, 206) and 'ETag' in ds_headers \
+                and self.headers.get('If-None-Match') == ds_headers['ETag']:
+            self._send(304, {'ETag': ds_headers['ETag']}, None, False)
+            return
+        self._send(
+            d_response['status'], ds_headers,
+            min(i_size, _N_MAX_REPLAY_BODY) if i_size else i_size, b_body)
+
+    def _send(self, i_status: int, ds_headers: dict, i_size, b_body: bool):
+        """ send status, headers, and a body of i_size bytes """
+        self.send_response(i_status)
+        for s_key, s_value in ds_headers.items():
+            self.send_header(s_key, s_value)
+        if i_size is not None:
+            self.send_header('Content-Length', str(i_size))
+        self.end_headers()
+        if b_body and i_size:
+            b_chunk = b'x' * min(i_size, 65536)
+            n_left = i_size
+            try:
+                while n_left > 0:
+                    n_sent = min(n_left, len(b_chunk))
+                    self.wfile.write(b_chunk[:n_sent])
+                    self.server.count_bytes(n_sent)
+                    n_left -= n_sent
+            except OSError:
+                self.close_connection = True
+
+
+class StandinServer(http.server.ThreadingHTTPServer):
+    """ Local HTTP server running in a thread of its own.
+
+        o_recording         responses to replay (or None)
+
+        lt_requests         (method, path, range) of all requests
+
+        n_connects          number of connections accepted
+
+        n_bytes_sent        number of body bytes sent
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, o_recording=None):
+        """ create server on a free port of the loopback interface """
+        super().__init__(('127.0.0.1', 0), _StandinHandler)
+        self.o_recording = o_recording
+        self.lt_requests = []
+        self.n_connects = 0
+        self.n_bytes_sent = 0
+        self._o_lock = threading.Lock()
+        self._o_thread = None
+
+    def __enter__(self):
+        """ start serving """
+        self._o_thread = threading.Thread(
+            target=self.serve_forever, daemon=True)
+        self._o_thread.start()
+        return self
+
+    def __exit__(self, *_):
+        """ stop serving """
+        self.shutdown()
+        self.server_close()
+        self._o_thread.join()
+
+    def process_request(self, request, client_address):
+        """ count connections """
+        with self._o_lock:
+            self.n_connects += 1
+        super().process_request(request, client_address)
+
+    def log_request(self, s_method: str, s_path: str, s_range):
+        """ record a request """
+        with self._o_lock:
+            self.lt_requests.append((s_method, s_path, s_range))
+
+    def count_bytes(self, n_bytes: int):
+        """ count body bytes sent """
+        with self._o_lock:
+            self.n_bytes_sent += n_bytes
+
+    def reset_counts(self):
+        """ clear requests and counts """
+        with self._o_lock:
+            self.lt_requests = []
+            self.n_connects = 0
+            self.n_bytes_sent = 0
+
+    def s_url(self, s_path: str) -> str:
+        """
+        return the url for the given path (and query) on this server
+        """
+        return 'http://127.0.0.1:{0}{1}'.format(
+            self.server_address[1], s_path)
+
+    def s_local_path(self, s_url: str) -> str:
+        """
+        return the path replaying the given recorded url, or the url
+        itself if it was not recorded
+        """
+        i_index = self.o_recording.i_get_index(s_url)
+        if i_index is None:
+            return s_url
+        return '/replay/{0}'.format(i_index)
+
+    def s_url_for(self, s_url: str) -> str:
+        """
+        return the url on this server replaying the given recorded url
+        """
+        return self.s_url(self.s_local_path(s_url))
+
+    def d_get_recorded(self, s_path: str, s_method: str, s_range):
+        """
+        return the recorded response for a replay path or None
+        """
+        try:
+            i_index = int(s_path.split('/')[2])
+        except (IndexError, ValueError):
+            return None
+        return self.o_recording.d_get_response(i_index, s_method, s_range)
+
+
+class Recording:
+    """ Responses of real servers for a list of urls.
+
+        ls_urls             the urls recorded (including the targets of
+                            redirections)
+
+        ld_responses        per url: dictionary of the responses to
+                            HEAD, GET and ranged GET requests
+    """
+
+    def __init__(self):
+        """ create empty recording """
+        self.ls_urls = []
+        self.ld_responses = []
+        self._di_index = dict()
+
+    def i_get_index(self, s_url: str):
+        """ return the index of a recorded url or None """
+        return self._di_index.get(s_url)
+
+    def d_get_response(self, i_index: int, s_method: str, s_range):
+        """ return the recorded response or None """
+        if not 0 <= i_index < len(self.ld_responses):
+            return None
+        s_key = 'RANGE' if s_method == 'GET' and s_range else s_method
+        return self.ld_responses[i_index].get(s_key)
+
+    def record(self, ls_urls: list, f_timeout=30.0):
+        """
+        request all urls from their servers (HEAD, GET and ranged GET)
+        and record the responses, following redirections
+        """
+        ls_queue = list(ls_urls)
+        while ls_queue:
+            s_url = ls_queue.pop(0)
+            if s_url in self._di_index:
+                continue
+            self._di_index[s_url] = len(self.ls_urls)
+            self.ls_urls.append(s_url)
+            d_responses = dict()
+            for s_key, s_method, ds_headers in (
+                    ('HEAD', 'HEAD', {}),
+                    ('GET', 'GET', {}),
+                    ('RANGE', 'GET', {'Range': 'bytes=0-0'})):
+                d_response = _d_fetch(s_url, s_method, ds_headers, f_timeout)
+                d_responses[s_key] = d_response
+                s_location = d_response.get('headers', {}).get('Location')
+                if s_location:
+                    ls_queue.append(urljoin(s_url, s_location))
+            self.ld_responses.append(d_responses)
+
+    def save(self, s_filename: str):
+        """ write recording to a JSON file """
+        with open(s_filename, 'w', encoding='utf-8') as o_file:
+            json.dump(
+                {'urls': self.ls_urls, 'responses': self.ld_responses},
+                o_file, indent=1)
+
+    @classmethod
+    def o_load(cls, s_filename: str):
+        """ read recording from a JSON file """
+        with open(s_filename, encoding='utf-8') as o_file:
+            d_data = json.load(o_file)
+        o_recording = cls()
+        o_recording.ls_urls = d_data['urls']
+        o_recording.ld_responses = d_data['responses']
+        o_recording._di_index = {
+            s_url: i_index
+            for i_index, s_url in enumerate(o_recording.ls_urls)}
+        return o_recording
+
+
+def _d_fetch(s_url: str, s_method: str, ds_headers: dict, f_timeout):
+    """
+    send a single request (without following redirections) and
+    return the response as recorded
+    """
+    o_url = urlsplit(s_url)
+    s_path = quote((o_url.path or '/') + (
+        '?' + o_url.query if o_url.query else ''), "/%:@!$&'()*+,;=-._~?")
+    if o_url.scheme == 'https':
+        o_connection = http.client.HTTPSConnection(
+            o_url.hostname, o_url.port, timeout=f_timeout)
+    else:
+        o_connection = http.client.HTTPConnection(
+            o_url.hostname, o_url.port, timeout=f_timeout)
+    ds_headers = dict(ds_headers)
+    ds_headers['User-Agent'] = 'Mozilla/5.0 (X11; Linux x86_64)'
+    try:
+        o_connection.request(s_method, s_path, headers=ds_headers)
+        with o_connection.getresponse() as o_response:
+            ds_recorded = {
+                s_key: o_response.getheader(s_key)
+                for s_key in _TS_RECORDED_HEADERS
+                if o_response.getheader(s_key) is not None}
+            if s_method == 'GET' and 'Content-Length' not in ds_recorded:
+                ds_recorded['Content-Length'] = str(len(
+                    o_response.read(_N_MAX_REPLAY_BODY)))
+        return {
+            'url': s_url, 'status': o_response.status,
+            'headers': ds_recorded}
+    except (OSError, http.client.HTTPException, ValueError) as u_error:
+        return {'url': s_url, 'error': str(u_error)}
+    finally:
+        o_connection.close()
@@ -3,11 +3,27 @@ test functions in metadata_check_tools
 """
 
 import os
+import random
+import re
+import time
 import unittest
 from unittest.mock import patch
 
 import lib
 
+# former regular expression for domains, kept as reference for the
+# hand-written scanner in b_is_valid_domain
+
+_DOMAIN_FORMAT = re.compile(
+    r"(?:^(\w{1,255}):(.{1,255})@|^)"
+    r"(?:(?:(?=\S{0,253}(?:$|:))"
+    r"((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+"
+    r"(?:[a-z0-9]{1,63})))"
+    r"|localhost)"
+    r"(:\d{1,5})?",
+    re.IGNORECASE
+)
+
 
 class TestImportValidStringValues(unittest.TestCase):
     """
@@ -229,5 +245,79 @@ class TestImportValidStringValues(unittest.TestCase):
         self.assertEqual(lib.s_check_date('2000-01-01'), 'too early')
 
 
+class TestCheckUrl(unittest.TestCase):
+    """
+    test class
+    """
+
+    _LS_DOMAINS = [
+        'www.example.com', 'example.com:8080', 'localhost',
+        'LOCALHOST:80', 'locahost', 'user:pw@localhost', 'a.b',
+        'user:p@ss@www.example.com', 'user:pw@', '@example.com',
+        ':pw@example.com', 'us er:pw@example.com', 'a@b:pw',
+        'example.com:', 'example.com:123456', 'example.com:80:80',
+        '-a.com', 'a-.com', 'a--b.com', 'a.c-m', 'a..com', '.a.com',
+        'a.com.', 'example.com\n', 'a' * 63 + '.com', 'a' * 64 + '.com',
+        'a.' + 'b' * 63, 'a.' + 'b' * 64, ('a' * 50 + '.') * 5 + 'com',
+        ('a' * 50 + '.') * 4 + 'a' * 49, 'u' * 255 + ':p@a.com',
+        'u' * 256 + ':p@a.com', 'u:' + 'p' * 255 + '@a.com',
+        'u:' + 'p' * 256 + '@a.com', 'u:p\n@a.com', 'b\u00fccher.de',
+        'xn--bcher-kva.de', 'loca\u017fhost', 'locahoſt', 'ſ.de',
+        'K.de', '\u0130.com', 'a.\u0131', 'a.com:\u0661\u0662',
+        '\u00e4:pw@a.com', '\u00b2:pw@a.com', 'a.com:\u00b2']
+
+    def test_domain_reference(self):
+        """
+        scanner must give identical results as the former regex
+        """
+        for s_domain in self._LS_DOMAINS:
+            self.assertEqual(
+                lib.b_is_valid_domain(s_domain),
+                _DOMAIN_FORMAT.fullmatch(s_domain) is not None,
+                repr(s_domain))
+
+    def test_domain_random(self):
+        """
+        compare scanner and former regex on random strings
+        """
+        o_random = random.Random(4711)
+        s_chars = 'ab0-.:@_ \n\u017f\u0130\u00e4\u0661'
+        for _ in range(20000):
+            s_domain = ''.join(o_random.choices(
+                s_chars, k=o_random.randint(0, 12)))
+            self.assertEqual(
+                lib.b_is_valid_domain(s_domain),
+                _DOMAIN_FORMAT.fullmatch(s_domain) is not None,
+                repr(s_domain))
+
+    def test_s_check_url(self):
+        """
+        Test procedure
+        """
+        self.assertIsNone(lib.s_check_url('https://www.example.com/a'))
+        self.assertIsNone(lib.s_check_url('http://localhost:8080/'))
+        self.assertEqual(
+            lib.s_check_url('https://-bad.example.com/'),
+            'Invalid domain given (domain=-bad.example.com)')
+        self.assertEqual(
+            lib.s_check_url('www.example.com'),
+            'No scheme (http(s), ftp(s), etc.) specified.')
+
+    def test_pathological_domains(self):
+        """
+        garbled input near the maximum url length must be rejected
+        quickly; see bench/bench_check_url.py for the full benchmark
+        """
+        f_start = time.perf_counter()
+        for s_domain in (
+                'u:' + '@a' * 1000,
+                ('a' + '-' * 61 + 'a.') * 32,
+                'a.' * 1000 + '-',
+                'u' * 255 + ':' + '@' * 1700 + 'a.com'):
+            lib.b_is_valid_domain.cache_clear()
+            self.assertFalse(lib.b_is_valid_domain(s_domain))
+        self.assertLess(time.perf_counter() - f_start, 0.5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,53 @@
+"""
+test class ArchiveIndex
+"""
+
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+
+from lib import ArchiveIndex
+
+
+class TestArchiveIndex(unittest.TestCase):
+    """
+    test class
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.s_root = tempfile.mkdtemp() + os.sep
+        for s_name in (
+                '20200101_a.pdf', '20200101_b.pdf', '202001_c.pdf',
+                '2020_d.pdf', '20210305_e.htm', '.hidden.pdf',
+                'sub/20220101_f.pdf'):
+            os.makedirs(
+                os.path.dirname(cls.s_root + s_name), exist_ok=True)
+            with open(cls.s_root + s_name, 'w', encoding='utf-8'):
+                pass
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.s_root)
+
+    def test_same_as_glob(self):
+        """
+        results match glob, the folder is read once
+        """
+        o_index = ArchiveIndex(self.s_root)
+        for s_file in (
+                '20200101_a.pdf', '20200101_x.pdf', '2020*', '2020_*',
+                '202001??_?.pdf', '2021*.pdf', '2022*', '*.htm', '*',
+                '.hidden*', '*hidden*', '[12]0200101_b.pdf', 'sub',
+                'sub/', 'sub/2022*', 'sub/x', 's*/2022*', 'none/',
+                '2020010'):
+            self.assertEqual(
+                o_index.b_files_exist(s_file),
+                len(glob.glob(self.s_root + s_file)) > 0, s_file)
+        self.assertEqual(o_index.n_get_scans(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
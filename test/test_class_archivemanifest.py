@@ -0,0 +1,113 @@
+"""
+test class ArchiveManifest
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from lib import ArchiveManifest
+from lib.metadata_hash_tools import it_hash_files
+
+
+def _age(s_root: str):
+    """ set modification time of all folders to one minute ago """
+    f_past = time.time() - 60.0
+    for s_folder, _, _ in os.walk(s_root):
+        os.utime(s_folder, (f_past, f_past))
+
+
+class TestArchiveManifest(unittest.TestCase):
+    """
+    test class
+    """
+
+    def setUp(self):
+        self.s_root = tempfile.mkdtemp() + os.sep
+        for s_name in ('a.pdf', 'empty.pdf', '2020/b.pdf', '2020/x/c.pdf'):
+            os.makedirs(
+                os.path.dirname(self.s_root + s_name), exist_ok=True)
+            with open(self.s_root + s_name, 'w', encoding='utf-8') as o_file:
+                if s_name != 'empty.pdf':
+                    o_file.write(s_name)
+        _age(self.s_root)
+
+    def tearDown(self):
+        shutil.rmtree(self.s_root)
+
+    def test_refresh(self):
+        """
+        only changed folders are read again
+        """
+        o_dbconn = sqlite3.connect(':memory:')
+        o_manifest = ArchiveManifest(o_dbconn, self.s_root)
+        self.assertEqual(o_manifest.refresh(), (3, 6))
+        self.assertEqual(
+            o_manifest.ls_get_files(),
+            ['2020/b.pdf', '2020/x/c.pdf', 'a.pdf', 'empty.pdf'])
+
+        # the manifest is kept in the database
+
+        o_manifest = ArchiveManifest(o_dbconn, self.s_root)
+        self.assertEqual(o_manifest.refresh(), (0, 0))
+        self.assertEqual(o_manifest.refresh(True), (3, 0))
+
+        with open(self.s_root + '2020/x/d.pdf', 'w', encoding='utf-8'):
+            pass
+        shutil.rmtree(self.s_root + '2020/x')
+        os.remove(self.s_root + 'a.pdf')
+        _age(self.s_root)
+        self.assertEqual(o_manifest.refresh(), (2, 2))
+        self.assertEqual(
+            o_manifest.ls_get_files(), ['2020/b.pdf', 'empty.pdf'])
+        self.assertEqual(
+            o_dbconn.execute(
+                'SELECT COUNT(*) FROM archive_manifest;').fetchone()[0], 4)
+        o_dbconn.close()
+
+    def test_lookup(self):
+        """
+        entries and the index match the archive folder
+        """
+        o_dbconn = sqlite3.connect(':memory:')
+        self.addCleanup(o_dbconn.close)
+        o_manifest = ArchiveManifest(o_dbconn, self.s_root)
+        o_manifest.refresh()
+        self.assertEqual(o_manifest.t_get_entry('2020/x')[:2], (True, 0))
+
+        o_index = o_manifest.o_get_index()
+        self.assertTrue(o_index.b_files_exist('2020/x/c*'))
+        self.assertTrue(o_index.b_files_exist('2020/x/'))
+        self.assertFalse(o_index.b_files_exist('2021/*'))
+        self.assertEqual(o_index.n_get_scans(), 0)
+
+    def test_hashes(self):
+        """
+        hashes are stored unless the file changed since the refresh
+        """
+        o_dbconn = sqlite3.connect(':memory:')
+        self.addCleanup(o_dbconn.close)
+        o_manifest = ArchiveManifest(o_dbconn, self.s_root)
+        o_manifest.refresh()
+        with open(self.s_root + 'a.pdf', 'a', encoding='utf-8') as o_file:
+            o_file.write('changed')
+
+        ls_files = o_manifest.ls_get_files()
+        lt_results = list(it_hash_files(self.s_root, ls_files, 2))
+        self.assertEqual([t_result[0] for t_result in lt_results], ls_files)
+        self.assertEqual(o_manifest.set_hashes(
+            [(s_path, s_hash, t_stat)
+             for s_path, s_hash, _, t_stat in lt_results]), 3)
+        self.assertIsNone(o_manifest.t_get_entry('a.pdf')[3])
+        self.assertEqual(
+            o_manifest.t_get_entry('empty.pdf')[3][:8], 'e3b0c442')
+        self.assertEqual(
+            o_dbconn.execute(
+                'SELECT COUNT(hash) FROM archive_manifest;').fetchone()[0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
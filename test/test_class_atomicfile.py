@@ -0,0 +1,64 @@
+"""
+test class AtomicFile
+"""
+
+import os
+import tempfile
+import unittest
+
+from lib import AtomicFile
+
+
+class TestAtomicFile(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_write(self):
+        """
+        file is replaced only if its content changes, no temporary
+        files are left
+        """
+        with tempfile.TemporaryDirectory() as s_folder:
+            s_filename = os.path.join(s_folder, 'a.htm')
+            lb_written = []
+            for b_data in [b'abc', b'abc', b'abcd']:
+                o_atomic = AtomicFile(s_filename)
+                with o_atomic as o_file:
+                    o_file.write(b_data)
+                lb_written.append(o_atomic.b_get_written())
+            self.assertEqual(lb_written, [True, False, True])
+            with open(s_filename, 'rb') as o_file:
+                self.assertEqual(o_file.read(), b'abcd')
+
+            # an exception keeps the file
+
+            with self.assertRaises(ValueError):
+                with AtomicFile(s_filename) as o_file:
+                    o_file.write(b'x')
+                    raise ValueError()
+            with open(s_filename, 'rb') as o_file:
+                self.assertEqual(o_file.read(), b'abcd')
+            self.assertEqual(os.listdir(s_folder), ['a.htm'])
+
+    def test_mode(self):
+        """
+        a new file gets the permissions of open (umask), a replaced file
+        keeps its permissions
+        """
+        with tempfile.TemporaryDirectory() as s_folder:
+            s_filename = os.path.join(s_folder, 'a.htm')
+            with open(os.path.join(s_folder, 'b.htm'), 'wb'):
+                pass
+            i_mode = os.stat(os.path.join(s_folder, 'b.htm')).st_mode
+            with AtomicFile(s_filename) as o_file:
+                o_file.write(b'abc')
+            self.assertEqual(os.stat(s_filename).st_mode, i_mode)
+            os.chmod(s_filename, 0o640)
+            with AtomicFile(s_filename) as o_file:
+                o_file.write(b'abcd')
+            self.assertEqual(os.stat(s_filename).st_mode & 0o777, 0o640)
+
+
+if __name__ == '__main__':
+    unittest.main()
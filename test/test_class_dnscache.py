@@ -0,0 +1,72 @@
+"""
+test class DnsCache
+"""
+
+import socket
+import unittest
+from unittest.mock import patch
+
+from lib import DnsCache, HttpPool, t_probe_url, b_is_dead
+from lib import I_STATUS_UNKNOWN_HOST
+
+
+class TestDnsCache(unittest.TestCase):
+    """
+    test class
+    """
+
+    @patch('lib.class_dnscache.socket.getaddrinfo')
+    def test_resolve(self, mock_getaddrinfo):
+        """
+        each host is looked up once, failures are cached as well
+        """
+        l_result = [(
+            socket.AF_INET, socket.SOCK_STREAM, 6, '',
+            ('127.0.0.1', 80))]
+        mock_getaddrinfo.return_value = l_result
+        o_cache = DnsCache()
+        self.assertEqual(o_cache.l_resolve('a.de', 80), l_result)
+        self.assertEqual(o_cache.l_resolve('A.de', 80), l_result)
+        self.assertEqual(o_cache.n_get_lookups(), 1)
+        o_cache.l_resolve('a.de', 443)
+        self.assertEqual(o_cache.n_get_lookups(), 2)
+
+        mock_getaddrinfo.side_effect = socket.gaierror('no such host')
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror):
+                o_cache.l_resolve('b.de', 80)
+        self.assertEqual(o_cache.n_get_lookups(), 3)
+
+    @patch('lib.class_dnscache.socket.getaddrinfo')
+    def test_expiry(self, mock_getaddrinfo):
+        """
+        entries older than their time to live are looked up again
+        """
+        mock_getaddrinfo.return_value = []
+        o_cache = DnsCache(f_ttl=0.0)
+        o_cache.l_resolve('a.de', 80)
+        o_cache.l_resolve('a.de', 80)
+        self.assertEqual(o_cache.n_get_lookups(), 2)
+        with self.assertRaises(OSError):
+            o_cache.o_create_connection(('a.de', 80))
+
+    @patch('lib.class_dnscache.socket.getaddrinfo')
+    def test_unknown_host(self, mock_getaddrinfo):
+        """
+        a url of a host name which does not exist is dead for good,
+        a failed lookup is temporary otherwise
+        """
+        o_pool = HttpPool()
+        for i_error, i_status in [
+                (socket.EAI_NONAME, I_STATUS_UNKNOWN_HOST),
+                (socket.EAI_AGAIN, 0)]:
+            mock_getaddrinfo.side_effect = socket.gaierror(
+                i_error, 'lookup failed')
+            t_result = t_probe_url(
+                'http://{0}.de/'.format(i_error), o_pool=o_pool)
+            self.assertEqual(t_result[0], i_status)
+            self.assertEqual(b_is_dead(t_result[0]), i_status != 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
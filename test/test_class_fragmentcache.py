@@ -0,0 +1,46 @@
+"""
+test class FragmentCache
+"""
+
+import sqlite3
+import unittest
+
+from lib import FragmentCache
+
+
+class TestFragmentCache(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_fragments(self):
+        """
+        fragments are rendered again if their hash changes, unused
+        fragments are removed
+        """
+        o_dbconn = sqlite3.connect(':memory:')
+        o_cache = FragmentCache(o_dbconn, 'list2')
+        self.assertEqual(o_cache.s_get_fragment('a', '1', lambda: 'A'), 'A')
+        self.assertEqual(o_cache.s_get_fragment('b', '1', lambda: 'B'), 'B')
+        o_cache.save()
+
+        o_cache = FragmentCache(o_dbconn, 'list2')
+        self.assertEqual(o_cache.s_get_fragment('a', '1', lambda: 'X'), 'A')
+        self.assertEqual(o_cache.s_get_fragment('c', '1', lambda: 'C'), 'C')
+        self.assertEqual(o_cache.t_get_counts(), (1, 1))
+        o_cache.save()
+        self.assertEqual(
+            o_dbconn.execute(
+                'SELECT key, fragment FROM list_fragments '
+                'ORDER BY key;').fetchall(),
+            [('a', 'A'), ('c', 'C')])
+
+        o_cache = FragmentCache(o_dbconn, 'list2')
+        self.assertEqual(o_cache.s_get_fragment('a', '2', lambda: 'Y'), 'Y')
+        self.assertEqual(FragmentCache(o_dbconn, 'other').t_get_counts(),
+                         (0, 0))
+        o_dbconn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+test class HtmlTemplate
+"""
+
+import os
+import tempfile
+import unittest
+
+from lib import HtmlTemplate
+
+
+class TestHtmlTemplate(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_render(self):
+        """
+        placeholders on their own line replace the line, others are
+        replaced within the line
+        """
+        o_template = HtmlTemplate(
+            '<head> \n'
+            '  <base href="<{base}>" />\n'
+            '<h1><{heading}> (<{date}>)</h1>\n'
+            '<{body}>\n'
+            '</html> ')
+        self.assertEqual(
+            o_template.ls_get_names(), ['base', 'heading', 'date', 'body'])
+        self.assertEqual(
+            ''.join(o_template.ls_render({
+                'base': 'x/',
+                'heading': 'Liste',
+                'date': 'Mai 2020',
+                'body': ['<p>\n', 'a\n', '</p>']})),
+            '<head>\n'
+            '  <base href="x/" />\n'
+            '<h1>Liste (Mai 2020)</h1>\n'
+            '<p>\na\n</p>'
+            '</html>\n')
+        with self.assertRaises(KeyError):
+            o_template.ls_render({'base': ''})
+
+    def test_load(self):
+        """
+        compiled templates are cached until the file is modified
+        """
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.htm', delete=False) as o_file:
+            o_file.write('<{body}>\n')
+        o_template = HtmlTemplate.o_load(o_file.name)
+        self.assertIs(HtmlTemplate.o_load(o_file.name), o_template)
+
+        with open(o_file.name, 'w', encoding='utf-8') as o_out:
+            o_out.write('<p><{body}></p>\n')
+        os.utime(o_file.name, ns=(0, 0))
+        o_template = HtmlTemplate.o_load(o_file.name)
+        self.assertEqual(
+            o_template.ls_render({'body': 'a'}), ['<p>', 'a', '</p>\n'])
+
+        self.assertTrue(o_template.b_write(o_file.name, {'body': ['a', 'b']}))
+        with open(o_file.name, 'r', encoding='utf-8') as o_in:
+            self.assertEqual(o_in.read(), '<p>ab</p>\n')
+        self.assertFalse(o_template.b_write(o_file.name, {'body': 'ab'}))
+        os.remove(o_file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""
+test class HttpPool
+"""
+
+import unittest
+from urllib.parse import urlsplit
+
+import lib
+from lib import HttpPool
+from lib.metadata_http_tools import ds_conditional_headers
+from test.standin_server import StandinServer
+
+
+class TestHttpPool(unittest.TestCase):
+    """
+    test class
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.o_server = StandinServer().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.o_server.__exit__(None, None, None)
+
+    def test_reuse(self):
+        """
+        several urls of the same host use a single connection
+        """
+        o_pool = HttpPool()
+        for i_page in range(5):
+            t_result = lib.t_probe_url(
+                self.o_server.s_url('/{0}'.format(i_page)), o_pool=o_pool)
+            self.assertEqual(t_result[:2], (200, None))
+        self.assertEqual(o_pool.n_get_connects(), 1)
+        o_pool.close_all()
+
+    def test_no_reuse(self):
+        """
+        connection closed by server is not reused
+        """
+        o_pool = HttpPool()
+        for _ in range(3):
+            t_result = lib.t_probe_url(
+                self.o_server.s_url('/?close=1'), o_pool=o_pool)
+            self.assertEqual(t_result[:2], (200, None))
+        self.assertEqual(o_pool.n_get_connects(), 3)
+        o_pool.close_all()
+
+    def test_head_fallback(self):
+        """
+        HEAD first, ranged GET only if HEAD is rejected
+        """
+        o_pool = HttpPool()
+        self.o_server.reset_counts()
+        for s_path in ('/page', '/nohead?nohead=1', '/empty?nohead=1&size=0'):
+            t_result = lib.t_probe_url(
+                self.o_server.s_url(s_path), o_pool=o_pool)
+            self.assertIsNone(t_result[1])
+        self.assertEqual(self.o_server.lt_requests, [
+            ('HEAD', '/page', None),
+            ('HEAD', '/nohead?nohead=1', None),
+            ('GET', '/nohead?nohead=1', 'bytes=0-0'),
+            ('HEAD', '/empty?nohead=1&size=0', None),
+            ('GET', '/empty?nohead=1&size=0', 'bytes=0-0'),
+            ('GET', '/empty?nohead=1&size=0', None)])
+        self.assertEqual(o_pool.n_get_connects(), 1)
+        o_pool.close_all()
+
+    def test_large_body(self):
+        """
+        a large body is not read, the connection is closed instead
+        """
+        o_pool = HttpPool()
+        self.o_server.reset_counts()
+        t_result = lib.t_probe_url(
+            self.o_server.s_url('/?nohead=1&norange=1&size=10000000'),
+            o_pool=o_pool)
+        self.assertEqual(t_result[:2], (200, None))
+        self.assertLess(self.o_server.n_bytes_sent, 10000000)
+        o_pool.close_all()
+
+    def test_errors(self):
+        """
+        redirections, errors, reset connections, conditional requests
+        """
+        o_pool = HttpPool()
+        self.assertEqual(lib.t_probe_url(
+            self.o_server.s_url('/?redirect=3'), o_pool=o_pool)[:2],
+            (200, None))
+        self.assertEqual(lib.t_probe_url(
+            self.o_server.s_url('/?status=404'), o_pool=o_pool)[0], 404)
+        self.assertEqual(lib.t_probe_url(
+            self.o_server.s_url('/?reset=1'), o_pool=o_pool)[0], 0)
+        self.assertEqual(lib.t_probe_url(
+            self.o_server.s_url('/?delay=2'), f_read_timeout=0.2,
+            o_pool=o_pool)[0], 0)
+        t_result = lib.t_probe_url(
+            self.o_server.s_url('/?etag=v1'), o_pool=o_pool)
+        self.assertEqual(t_result[:3], (200, None, '"v1"'))
+        self.assertEqual(lib.t_probe_url(
+            self.o_server.s_url('/?etag=v1'),
+            ds_headers=ds_conditional_headers('"v1"', None),
+            o_pool=o_pool)[:2], (304, None))
+        o_pool.close_all()
+
+    def test_stale_connection(self):
+        """
+        idle connection closed meanwhile is replaced
+        """
+        o_pool = HttpPool()
+        o_url = urlsplit(self.o_server.s_url('/'))
+        o_connection, b_reused = o_pool.t_acquire(o_url, 5.0, 5.0)
+        self.assertFalse(b_reused)
+        o_connection.sock.close()
+        o_pool.release(o_url, o_connection, True)
+        o_connection, b_reused = o_pool.t_acquire(o_url, 5.0, 5.0)
+        self.assertFalse(b_reused)
+        self.assertEqual(o_pool.n_get_connects(), 2)
+        o_pool.release(o_url, o_connection, False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+"""
+test classes List1Sink, List2Sink, List3Sink
+"""
+# pylint: disable=W0212
+
+import datetime
+import gzip
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from lib import FragmentCache, List1Sink, List2Sink, List3Sink, n_scan
+from lib import List1YearSink
+from lib.class_listsinks import ListSink
+
+
+def _o_make_db() -> sqlite3.Connection:
+    """ return database with many records of equal sort keys """
+    o_dbconn = sqlite3.connect(':memory:')
+    o_dbconn.execute(
+        'CREATE TABLE regions (country_name TEXT, region_name TEXT, '
+        'region_code TEXT PRIMARY KEY NOT NULL);')
+    o_dbconn.execute(
+        'CREATE TABLE metadata (ID INT PRIMARY KEY NOT NULL, date TEXT, '
+        'region TEXT, title TEXT, rating TEXT, region_label TEXT, '
+        'region_level INT, url_ok BOOLEAN DEFAULT 0 NOT NULL);')
+    o_dbconn.execute(
+        "INSERT INTO regions VALUES ('Deutschland', 'Bayern', 'DE-BY');")
+    o_random = random.Random(1)
+    for i_id in range(400):
+        o_dbconn.execute(
+            'INSERT INTO metadata VALUES (?, ?, ?, ?, ?, ?, ?, ?);', (
+                i_id,
+                o_random.choice([None, '2020', '2020-05', '2020-05-01']),
+                o_random.choice([None, 'DE-BY', 'AT']),
+                o_random.choice([None, 'a']),
+                o_random.choice([None, '1', '3', '4', '6']),
+                o_random.choice([None, 'Bayern', 'Berlin']),
+                o_random.choice([None, 1, 2]),
+                o_random.choice([0, 1])))
+    return o_dbconn
+
+
+class TestListSinks(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_scan(self):
+        """
+        records are selected and sorted as by the former queries
+        """
+        o_dbconn = _o_make_db()
+        o_list1 = List1Sink('')
+        o_list2 = List2Sink()
+        o_list3 = List3Sink(datetime.date(2020, 5, 1))
+        self.assertEqual(
+            n_scan(o_dbconn, [o_list1, o_list2, o_list3]), 400)
+
+        for o_sink, s_request in [
+                (o_list1, 'SELECT m.ID FROM metadata m LEFT OUTER JOIN '
+                 'regions r ON m.region = r.region_code ORDER BY m.date;'),
+                (o_list2, 'SELECT m.ID FROM metadata m '
+                 'WHERE (m.title IS NOT NULL) AND '
+                 '(SUBSTR(m.region, 1, 2)=="DE") AND (m.url_ok) '
+                 'AND (m.rating IN ("1","2","3")) ORDER BY '
+                 'm.region_level ASC, m.region_label ASC, m.date DESC;'),
+                (o_list3, 'SELECT m.ID FROM metadata m '
+                 'WHERE (m.title IS NOT NULL) AND (m.url_ok) '
+                 'AND (m.rating IN ("1","2","3","4")) '
+                 'AND (m.date LIKE "2020-05%") ORDER BY '
+                 'm.region_level ASC, m.region_label ASC, m.date;')]:
+            self.assertEqual(
+                [o_row['ID'] for o_row in o_sink._lo_sorted()],
+                [t_row[0] for t_row in o_dbconn.execute(s_request)])
+
+        # records of a range of dates only
+
+        o_list3_range = List3Sink(datetime.date(2020, 5, 1))
+        self.assertEqual(
+            n_scan(o_dbconn, [o_list3_range], ('2020-05', '2020-06')),
+            o_dbconn.execute(
+                "SELECT COUNT(*) FROM metadata WHERE date LIKE '2020-05%';"
+            ).fetchone()[0])
+        self.assertEqual(
+            o_list3_range._lo_sorted(), o_list3._lo_sorted())
+        o_dbconn.close()
+
+    def test_list2_cache(self):
+        """
+        sections taken from the cache give the same body
+        """
+        o_dbconn = _o_make_db()
+        o_dbconn.executescript(
+            'ALTER TABLE metadata ADD COLUMN subtitle TEXT; '
+            'ALTER TABLE metadata ADD COLUMN url TEXT; '
+            'ALTER TABLE metadata ADD COLUMN media TEXT; '
+            'ALTER TABLE metadata ADD COLUMN notes TEXT; '
+            "UPDATE metadata SET date = '2021' WHERE date IS NULL;")
+        ls_bodies = []
+        for _ in range(2):
+            o_cache = FragmentCache(o_dbconn, 'list2')
+            o_sink = List2Sink(o_cache=o_cache)
+            n_scan(o_dbconn, [o_sink])
+            ls_bodies.append(
+                ''.join(o_sink._ls_body(o_sink._lo_sorted())))
+            o_cache.save()
+        self.assertEqual(o_cache.t_get_counts()[1], 0)
+        self.assertGreater(o_cache.t_get_counts()[0], 1)
+
+        o_sink = List2Sink()
+        n_scan(o_dbconn, [o_sink])
+        ls_bodies.append(''.join(o_sink._ls_body(o_sink._lo_sorted())))
+        self.assertEqual(ls_bodies[0], ls_bodies[1])
+        self.assertEqual(ls_bodies[0], ls_bodies[2])
+        o_dbconn.close()
+
+    def test_list1_by_year(self):
+        """
+        pages of unchanged years are not rendered or written again,
+        pages of years without records are removed
+        """
+        o_dbconn = _o_make_db()
+        o_dbconn.executescript(
+            'ALTER TABLE metadata ADD COLUMN ' + ' TEXT; '
+            'ALTER TABLE metadata ADD COLUMN '.join((
+                'author', 'subtitle', 'url', 'media', 'type', 'place',
+                'contact', 'notes', 'ref_copy', 'ref_ok')) + ' TEXT;')
+        s_cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as s_folder:
+            ln_pages = []
+            for _ in range(2):
+                o_cache = FragmentCache(o_dbconn, 'list1')
+                o_sink = List1YearSink('', o_cache)
+                n_scan(o_dbconn, [o_sink])
+                os.chdir(s_folder)
+                try:
+                    self.assertEqual(o_sink.n_write(), 400)
+                finally:
+                    os.chdir(s_cwd)
+                o_cache.save()
+                ln_pages.append(o_sink.n_get_pages_written())
+            self.assertEqual(ln_pages, [2, 0])
+            self.assertEqual(o_cache.t_get_counts(), (2, 0))
+            self.assertEqual(sorted(os.listdir(s_folder)), [
+                'ma_list1_2020.htm', 'ma_list1_index.htm',
+                'ma_list1_undated.htm'])
+            with open(os.path.join(s_folder, 'ma_list1_2020.htm'),
+                      encoding='utf-8') as o_file:
+                s_page = o_file.read()
+            n_dated = o_dbconn.execute(
+                'SELECT COUNT(*) FROM metadata WHERE date NOT NULL;'
+                ).fetchone()[0]
+            self.assertEqual(s_page.count('<p>'), n_dated)
+            self.assertNotIn('<tr', s_page)
+
+            o_dbconn.execute('DELETE FROM metadata WHERE date IS NULL;')
+            o_sink = List1YearSink('', FragmentCache(o_dbconn, 'list1'))
+            n_scan(o_dbconn, [o_sink])
+            os.chdir(s_folder)
+            try:
+                self.assertEqual(o_sink.n_write(), n_dated)
+            finally:
+                os.chdir(s_cwd)
+            self.assertEqual(
+                (o_sink.n_get_pages_written(), o_sink.n_get_pages_removed()),
+                (0, 1))
+            self.assertEqual(sorted(os.listdir(s_folder)), [
+                'ma_list1_2020.htm', 'ma_list1_index.htm'])
+        o_dbconn.close()
+
+    def test_abstract(self):
+        """
+        a sink lacking the rendering of its body cannot be created
+        """
+
+        class NoBodySink(ListSink):
+            """ sink without body """
+
+            def _dx_values(self) -> dict:
+                """ no values """
+                return dict()
+
+        self.assertRaises(
+            TypeError, NoBodySink, 'ma_list.htm', 'htm/main_list1.htm')
+
+    def test_export(self):
+        """
+        records are exported in the order of the listing
+        """
+        o_dbconn = _o_make_db()
+        o_dbconn.executescript(
+            'ALTER TABLE metadata ADD COLUMN ' + ' TEXT; '
+            'ALTER TABLE metadata ADD COLUMN '.join((
+                'subtitle', 'url', 'media', 'notes')) + ' TEXT;')
+        o_dbconn.execute("UPDATE metadata SET notes = '#paywall';")
+        with tempfile.TemporaryDirectory() as s_folder:
+            o_sink = List3Sink(
+                datetime.date(2020, 5, 1),
+                os.path.join(s_folder, 'ma_list3.htm'))
+            n_scan(o_dbconn, [o_sink])
+            for s_format in ['ndjson', 'json']:
+                s_filename = o_sink.s_get_export_filename(s_format)
+                self.assertEqual(
+                    s_filename,
+                    os.path.join(s_folder, 'ma_list3.' + s_format))
+                n_count = o_sink.n_export(s_format)
+                with open(s_filename, encoding='utf-8') as o_file:
+                    s_text = o_file.read()
+                with gzip.open(s_filename + '.gz', 'rt') as o_file:
+                    self.assertEqual(o_file.read(), s_text)
+                if s_format == 'ndjson':
+                    ldx_records = [
+                        json.loads(s_line) for s_line in s_text.splitlines()]
+                else:
+                    ldx_records = json.loads(s_text)
+                self.assertEqual(n_count, len(ldx_records))
+                self.assertEqual(
+                    [dx_record['ID'] for dx_record in ldx_records],
+                    [o_row['ID'] for o_row in o_sink._lo_sorted()])
+                self.assertEqual(
+                    ldx_records[0]['tags'], ['#paywall', '#other'])
+        o_dbconn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
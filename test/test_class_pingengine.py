@@ -0,0 +1,121 @@
+"""
+test class PingEngine
+"""
+
+import unittest
+from unittest.mock import patch
+
+import lib
+from lib.class_pingengine import ls_interleave_by_host, s_host_key
+
+
+class TestPingEngine(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_interleave(self):
+        """
+        test procedure
+        """
+        ls_urls = [
+            'http://a.de/1', 'http://a.de/2', 'http://a.de/3',
+            'http://b.de/1', 'https://B.de/2', 'http://c.de/1']
+        self.assertEqual(ls_interleave_by_host(ls_urls), [
+            'http://a.de/1', 'http://b.de/1', 'http://c.de/1',
+            'http://a.de/2', 'https://B.de/2', 'http://a.de/3'])
+        self.assertEqual(ls_interleave_by_host([]), [])
+        self.assertEqual(
+            ls_interleave_by_host(
+                ls_urls, lambda s_url: int(s_url.endswith('1'))), [
+                'http://a.de/2', 'https://B.de/2', 'http://a.de/3',
+                'http://a.de/1', 'http://b.de/1', 'http://c.de/1'])
+        self.assertEqual(s_host_key('https://B.de:8080/x'), 'b.de')
+        self.assertEqual(s_host_key('no url'), '')
+
+    def test_limits(self):
+        """
+        invalid limits are rejected
+        """
+        self.assertRaises(ValueError, lib.PingEngine, 0)
+        self.assertRaises(ValueError, lib.PingEngine, 4, 0)
+        self.assertRaises(ValueError, lib.PingEngine, 4, 2, n_retries=-1)
+
+    @patch('lib.class_pingengine.t_probe_url')
+    def test_retries(self, mock_probe):
+        """
+        temporary failures are repeated, permanent ones are not
+        """
+        o_engine = lib.PingEngine(n_retries=2, f_backoff=0.0)
+
+        mock_probe.return_value = (503, 'error', None, None)
+        self.assertEqual(
+            o_engine.t_probe('http://a.de/'), (503, 'error', None, None))
+        self.assertEqual(mock_probe.call_count, 3)
+
+        mock_probe.reset_mock()
+        mock_probe.return_value = (404, 'error', None, None)
+        self.assertEqual(
+            o_engine.t_probe('http://a.de/'), (404, 'error', None, None))
+        self.assertEqual(mock_probe.call_count, 1)
+
+        mock_probe.reset_mock()
+        mock_probe.side_effect = [
+            (0, 'timeout', None, None), (200, None, '"x"', None)]
+        self.assertEqual(
+            o_engine.t_probe('http://a.de/'), (200, None, '"x"', None))
+        self.assertEqual(mock_probe.call_count, 2)
+
+    @patch('lib.class_pingengine.t_probe_url')
+    def test_probe_all(self, mock_probe):
+        """
+        every url is reported exactly once
+        """
+        mock_probe.side_effect = lambda s_url, *_: \
+            (200, None, None, None) if s_url.endswith('ok') \
+            else (404, 'error', None, None)
+        o_engine = lib.PingEngine(n_workers=4, n_retries=0)
+        ls_urls = ['http://a.de/{0}/ok'.format(i) for i in range(20)]
+        ls_urls.append('http://b.de/bad')
+        dt_result = {
+            t_result[0]: t_result[1:3]
+            for t_result in o_engine.it_probe_all(ls_urls)}
+        self.assertEqual(len(dt_result), 21)
+        self.assertEqual(dt_result['http://a.de/7/ok'], (200, None))
+        self.assertEqual(dt_result['http://b.de/bad'], (404, 'error'))
+
+    @patch('lib.class_pingengine.t_probe_url')
+    def test_host_failures(self, mock_probe):
+        """
+        urls of a host not reached repeatedly are skipped
+        """
+        mock_probe.return_value = (0, 'timeout', None, None)
+        o_engine = lib.PingEngine(n_retries=0, n_host_failures=3)
+        for i_url in range(3):
+            self.assertEqual(
+                o_engine.t_probe('http://a.de/{0}'.format(i_url))[0], 0)
+        self.assertEqual(mock_probe.call_count, 3)
+        self.assertEqual(o_engine.ss_failing_hosts(), {'a.de'})
+
+        self.assertEqual(
+            o_engine.t_probe('http://A.de/x')[0], lib.I_STATUS_SKIPPED)
+        self.assertEqual(mock_probe.call_count, 3)
+        self.assertEqual(o_engine.t_probe('http://b.de/x')[0], 0)
+        self.assertEqual(mock_probe.call_count, 4)
+
+        # any answer of the host resets the count
+
+        mock_probe.reset_mock()
+        mock_probe.return_value = None
+        mock_probe.side_effect = [
+            (0, 'timeout', None, None), (404, 'error', None, None),
+            (0, 'timeout', None, None), (0, 'timeout', None, None)]
+        o_engine = lib.PingEngine(n_retries=0, n_host_failures=2)
+        for s_path in ('1', '2', '3', '4', '5'):
+            o_engine.t_probe('http://a.de/' + s_path)
+        self.assertEqual(mock_probe.call_count, 4)
+        self.assertEqual(o_engine.ss_failing_hosts(), {'a.de'})
+
+
+if __name__ == '__main__':
+    unittest.main()
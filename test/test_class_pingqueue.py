@@ -0,0 +1,103 @@
+"""
+test class PingQueue
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import lib
+
+
+class TestPingQueue(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_claim(self):
+        """
+        urls are claimed in order, once per lease, again after expiry
+        """
+        s_folder = tempfile.mkdtemp()
+        s_filename = os.path.join(s_folder, 'queue.db')
+        o_dbconn_a = sqlite3.connect(s_filename)
+        o_dbconn_b = sqlite3.connect(s_filename)
+        o_queue_a = lib.PingQueue(o_dbconn_a, 1, 'a')
+        o_queue_b = lib.PingQueue(o_dbconn_b, 1, 'b')
+
+        o_queue_a.fill(['u1', 'u2', 'u3', 'u4', 'u5'])
+        self.assertEqual(o_queue_b.n_count(), 5)
+        self.assertEqual(o_queue_a.ls_claim(2, 10.0, 100.0), ['u1', 'u2'])
+        self.assertEqual(o_queue_b.ls_claim(2, 10.0, 100.0), ['u3', 'u4'])
+        self.assertEqual(o_queue_b.f_next_expiry(), 110.0)
+
+        with o_dbconn_b:
+            o_queue_b.complete(['u3', 'u4'])
+        self.assertEqual(o_queue_a.ss_open_urls(), {'u1', 'u2', 'u5'})
+
+        # worker a crashed: its urls are claimed after lease expired
+
+        self.assertEqual(o_queue_b.ls_claim(5, 10.0, 105.0), ['u5'])
+        self.assertEqual(
+            o_queue_b.ls_claim(5, 10.0, 111.0), ['u1', 'u2'])
+        o_queue_b.release()
+        self.assertEqual(
+            o_queue_a.ls_claim(5, 10.0, 111.0), ['u1', 'u2', 'u5'])
+
+        with o_dbconn_a:
+            o_queue_a.complete(['u1', 'u2', 'u5'])
+        self.assertEqual(o_queue_b.n_count(True), 0)
+        o_queue_a.clear()
+        self.assertEqual(o_queue_b.n_count(), 0)
+
+        o_dbconn_a.close()
+        o_dbconn_b.close()
+        os.remove(s_filename)
+        os.rmdir(s_folder)
+
+    def test_skip(self):
+        """
+        urls skipped are left for other workers and for the next
+        process continuing the run
+        """
+        s_folder = tempfile.mkdtemp()
+        s_filename = os.path.join(s_folder, 'queue.db')
+        o_dbconn = sqlite3.connect(s_filename)
+        o_queue_a = lib.PingQueue(o_dbconn, 1, 'a')
+        o_queue_b = lib.PingQueue(o_dbconn, 1, 'b')
+
+        o_queue_a.fill(['u1', 'u2', 'u3', 'u4'])
+        self.assertEqual(
+            o_queue_a.ls_claim(3, 10.0, 100.0), ['u1', 'u2', 'u3'])
+        with o_dbconn:
+            o_queue_a.complete(['u1'])
+            o_queue_a.skip(['u2', 'u3'])
+        self.assertEqual(o_queue_a.n_count_pending(), 1)
+        self.assertEqual(o_queue_a.ls_claim(3, 10.0, 100.0), ['u4'])
+        self.assertEqual(o_queue_b.ls_claim(1, 10.0, 100.0), ['u2'])
+        with o_dbconn:
+            o_queue_a.complete(['u4'])
+        self.assertEqual(o_queue_a.n_count_pending(), 1)
+        with o_dbconn:
+            o_queue_b.complete(['u2'])
+        self.assertEqual(o_queue_a.n_count_pending(), 0)
+        self.assertEqual(o_queue_a.ls_claim(3, 10.0, 100.0), [])
+        o_queue_a.release()
+
+        # the run is continued: the url skipped is checked
+
+        o_queue_c = lib.PingQueue(o_dbconn, 1, 'c')
+        self.assertEqual(o_queue_c.ss_open_urls(), {'u3'})
+        self.assertEqual(o_queue_c.ls_claim(3, 10.0, 200.0), ['u3'])
+        with o_dbconn:
+            o_queue_c.complete(['u3'])
+        self.assertEqual(o_queue_c.n_count(True), 0)
+
+        o_dbconn.close()
+        os.remove(s_filename)
+        os.rmdir(s_folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
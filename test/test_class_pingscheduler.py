@@ -0,0 +1,88 @@
+"""
+test class PingScheduler
+"""
+
+import sqlite3
+import unittest
+
+import lib
+
+
+def o_make_database():
+    """ create database with a minimal metadata table """
+    o_dbconn = sqlite3.connect(':memory:')
+    o_dbconn.execute(
+        'CREATE TABLE metadata (ID INT, title TEXT, url TEXT, rating TEXT);')
+    o_dbconn.executemany(
+        'INSERT INTO metadata VALUES (?, ?, ?, ?);', [
+            (1, 'a', 'http://a.de/listed', '2'),
+            (2, 'b', 'http://a.de/other', '6'),
+            (3, 'c', 'http://b.de/listed', '4'),
+            (4, None, 'http://b.de/untitled', '1')])
+    return o_dbconn
+
+
+class TestPingScheduler(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_schedule(self):
+        """
+        listed urls first, then failed, never checked, oldest
+        """
+        o_dbconn = o_make_database()
+        o_cache = lib.UrlStatusCache(o_dbconn)
+        o_scheduler = lib.PingScheduler(o_dbconn)
+        self.assertFalse(o_scheduler.b_start_run())
+
+        o_cache.set_status('http://a.de/listed', 200, None, None, None, 10.0)
+        o_cache.set_status('http://b.de/listed', 404, 'bad', None, None, 90.)
+        o_cache.set_status('http://a.de/other', 200, None, None, None, 95.0)
+
+        ls_urls = [
+            'http://a.de/listed', 'http://a.de/other',
+            'http://b.de/listed', 'http://b.de/untitled']
+        self.assertEqual(
+            o_scheduler.ls_schedule(ls_urls, o_cache, 50.0, 100.0),
+            ['http://b.de/listed', 'http://a.de/listed',
+             'http://b.de/untitled'])
+        self.assertEqual(o_scheduler.i_get_rank('http://a.de/listed'), 0)
+        self.assertEqual(o_scheduler.i_get_rank('http://b.de/untitled'), 1)
+        o_dbconn.close()
+
+    def test_resume(self):
+        """
+        unfinished run is continued without urls already checked
+        """
+        o_dbconn = o_make_database()
+        o_cache = lib.UrlStatusCache(o_dbconn)
+        o_scheduler = lib.PingScheduler(o_dbconn)
+        self.assertFalse(o_scheduler.b_start_run())
+        i_run = o_scheduler.i_get_run()
+
+        o_scheduler.add_result('http://a.de/listed', 500, 'error')
+        o_scheduler.write_pending()
+        o_dbconn.commit()
+
+        o_scheduler = lib.PingScheduler(o_dbconn)
+        self.assertTrue(o_scheduler.b_start_run())
+        self.assertEqual(o_scheduler.i_get_run(), i_run)
+        self.assertEqual(
+            o_scheduler.ls_schedule(
+                ['http://a.de/listed', 'http://a.de/other'], o_cache, 0.0),
+            ['http://a.de/other'])
+
+        o_scheduler.finish_run()
+        o_scheduler = lib.PingScheduler(o_dbconn)
+        self.assertFalse(o_scheduler.b_start_run())
+        self.assertEqual(o_scheduler.i_get_run(), i_run + 1)
+        self.assertEqual(
+            o_dbconn.execute(
+                'SELECT run, url, status FROM ping_history;').fetchall(),
+            [(i_run, 'http://a.de/listed', 500)])
+        o_dbconn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+test class PublishManifest
+"""
+
+import os
+import tempfile
+import unittest
+
+from lib import PublishManifest
+
+
+class TestPublishManifest(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_update(self):
+        """
+        new, changed and removed files are reported, other files are
+        not part of the manifest
+        """
+        with tempfile.TemporaryDirectory() as s_folder:
+
+            def write(s_path: str, s_text: str):
+                with open(os.path.join(s_folder, s_path), 'w') as o_file:
+                    o_file.write(s_text)
+
+            os.mkdir(os.path.join(s_folder, 'ma_search'))
+            write('ma_list2.htm', 'a')
+            write('ma_list2.htm.gz', 'b')
+            write(os.path.join('ma_search', 'r.json'), 'c')
+            write('notes.txt', 'd')
+
+            o_manifest = PublishManifest(s_folder)
+            o_manifest.update()
+            self.assertEqual(o_manifest.ls_get_changed(), [
+                'ma_list2.htm', 'ma_list2.htm.gz',
+                os.path.join('ma_search', 'r.json')])
+            o_manifest.save()
+
+            # rewritten with the same content, changed, removed
+
+            write('ma_list2.htm', 'a')
+            write('ma_list2.htm.gz', 'x')
+            os.remove(os.path.join(s_folder, 'ma_search', 'r.json'))
+
+            o_manifest = PublishManifest(s_folder)
+            o_manifest.update()
+            self.assertEqual(o_manifest.ls_get_changed(), ['ma_list2.htm.gz'])
+            self.assertEqual(
+                o_manifest.ls_get_removed(),
+                [os.path.join('ma_search', 'r.json')])
+            self.assertEqual(
+                o_manifest.s_get_report(),
+                'ma_list2.htm.gz changed,\n'
+                + os.path.join('ma_search', 'r.json') + ' removed')
+            o_manifest.save()
+
+            o_manifest = PublishManifest(s_folder)
+            o_manifest.update()
+            self.assertEqual(
+                o_manifest.s_get_report(), 'no published files changed')
+
+
+if __name__ == '__main__':
+    unittest.main()
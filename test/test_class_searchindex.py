@@ -0,0 +1,118 @@
+"""
+test class SearchIndex
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from lib import SearchIndex
+
+
+class _AllRows:
+    """ listing accepting all rows """
+
+    @staticmethod
+    def b_accept(_) -> bool:
+        """ all rows """
+        return True
+
+
+def _d_row(i_id: int, s_title: str) -> dict:
+    """ return a record with the given ID and title """
+    return {
+        'ID': i_id, 'title': s_title, 'subtitle': None, 'media': 'Presse',
+        'date': '2020-05', 'url': None, 'region_label': 'Bayern'}
+
+
+class TestSearchIndex(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_index(self):
+        """
+        only shards of changed records are written again, shards
+        without words are removed
+        """
+        o_dbconn = sqlite3.connect(':memory:')
+        with tempfile.TemporaryDirectory() as s_folder:
+
+            def dl_read(s_shard: str) -> dict:
+                with open(os.path.join(
+                        s_folder, s_shard + '.json'), encoding='utf-8') \
+                        as o_file:
+                    return json.load(o_file)
+
+            o_index = SearchIndex(o_dbconn, _AllRows())
+            for d_row in [_d_row(1, 'Räder'), _d_row(2, 'Rikscha Ausfahrt')]:
+                self.assertTrue(o_index.b_accept(d_row))
+                o_index.add(d_row)
+            self.assertEqual(o_index.t_get_counts(), (2, 2, 0))
+            self.assertEqual(o_index.n_write(s_folder), 6)
+            o_index.save()
+            self.assertEqual(
+                dl_read('r'), {'rader': [1], 'rikscha': [2]})
+            self.assertEqual(dl_read('b'), {'bayern': [1, 2]})
+            self.assertEqual(
+                sorted(os.listdir(s_folder)), sorted(
+                    s_shard + s_ext for s_shard in [
+                        'a', 'b', 'p', 'r', 'docs-0', 'index']
+                    for s_ext in ['.json', '.json.gz']))
+
+            # unchanged records
+
+            o_index = SearchIndex(o_dbconn, _AllRows())
+            o_index.add(_d_row(1, 'Räder'))
+            o_index.add(_d_row(2, 'Rikscha Ausfahrt'))
+            self.assertEqual(o_index.t_get_counts(), (2, 0, 0))
+            self.assertEqual(o_index.n_write(s_folder), 0)
+            o_index.save()
+
+            # record 2 changed (documents), a shard without words (list
+            # of shards)
+
+            o_index = SearchIndex(o_dbconn, _AllRows())
+            o_index.add(_d_row(1, 'Räder'))
+            o_index.add(_d_row(2, 'Rikscha'))
+            self.assertEqual(o_index.t_get_counts(), (2, 1, 0))
+            self.assertEqual(o_index.n_write(s_folder), 2)
+            o_index.save()
+            self.assertFalse(
+                os.path.exists(os.path.join(s_folder, 'a.json')))
+
+            # record 1 removed
+
+            o_index = SearchIndex(o_dbconn, _AllRows())
+            o_index.add(_d_row(2, 'Rikscha'))
+            self.assertEqual(o_index.t_get_counts(), (1, 0, 1))
+            self.assertEqual(o_index.n_write(s_folder), 4)
+            o_index.save()
+            self.assertEqual(dl_read('r'), {'rikscha': [2]})
+            self.assertEqual(dl_read('docs-0'), {'2': [
+                'Rikscha', None, 'Presse', 'Mai 2020', None, 'Bayern']})
+            self.assertEqual(
+                o_dbconn.execute('SELECT ID FROM search_words;').fetchall(),
+                [(2,)])
+
+            # documents sharded by ID, shards without documents removed
+
+            for li_ids, li_docs in [([2, 300], [0, 1]), ([300], [1])]:
+                o_index = SearchIndex(o_dbconn, _AllRows())
+                for i_id in li_ids:
+                    o_index.add(_d_row(i_id, 'Rikscha'))
+                o_index.n_write(s_folder)
+                o_index.save()
+                self.assertEqual(dl_read('index')['docs'], li_docs)
+                self.assertEqual(
+                    [os.path.exists(os.path.join(
+                        s_folder, 'docs-{0}.json'.format(i_docs)))
+                     for i_docs in [0, 1]], [0 in li_docs, True])
+            self.assertEqual(list(dl_read('docs-1')), ['300'])
+        o_dbconn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+test class UrlStatusCache
+"""
+
+import sqlite3
+import unittest
+
+import lib
+
+
+class TestUrlStatusCache(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_fresh_and_headers(self):
+        """
+        test procedure
+        """
+        o_dbconn = sqlite3.connect(':memory:')
+        o_cache = lib.UrlStatusCache(o_dbconn)
+
+        self.assertIsNone(o_cache.t_get_status('http://a.de/'))
+        self.assertFalse(o_cache.b_is_fresh('http://a.de/', 3600.0))
+        self.assertEqual(o_cache.ds_get_headers('http://a.de/'), {})
+
+        o_cache.set_status(
+            'http://a.de/', 200, None, '"v1"', 'Mon, 01 Jan 2024', 1000.0)
+        o_cache.set_status(
+            'http://b.de/', 404, 'error', None, None, 1000.0)
+
+        self.assertTrue(o_cache.b_is_fresh('http://a.de/', 100.0, 1050.0))
+        self.assertFalse(o_cache.b_is_fresh('http://a.de/', 100.0, 1100.0))
+        self.assertFalse(o_cache.b_is_fresh('http://b.de/', 100.0, 1050.0))
+        self.assertEqual(
+            o_cache.ds_get_headers('http://a.de/'),
+            {'If-None-Match': '"v1"',
+             'If-Modified-Since': 'Mon, 01 Jan 2024'})
+
+        # not modified keeps validators
+
+        o_cache.set_status('http://a.de/', 304, None, None, None, 2000.0)
+        self.assertEqual(
+            o_cache.t_get_status('http://a.de/'),
+            (304, None, '"v1"', 'Mon, 01 Jan 2024', 2000.0))
+
+        # status is saved and loaded again
+
+        o_cache.write_pending()
+        o_cache = lib.UrlStatusCache(o_dbconn)
+        self.assertEqual(
+            o_cache.t_get_status('http://a.de/'),
+            (304, None, '"v1"', 'Mon, 01 Jan 2024', 2000.0))
+        self.assertEqual(
+            o_cache.t_get_status('http://b.de/'),
+            (404, 'error', None, None, 1000.0))
+        o_dbconn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+test functions in metadata_date_tools
+"""
+
+import datetime
+import unittest
+
+import lib
+
+
+class TestDateTools(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_s_check_date(self):
+        """
+        explicit zero month or day is invalid, year 0 too early
+        """
+        self.assertEqual(lib.s_check_date('2020-00'), 'invalid')
+        self.assertEqual(lib.s_check_date('2020-02-00'), 'invalid')
+        self.assertEqual(lib.s_check_date('2012-13'), 'too early')
+        self.assertEqual(lib.s_check_date('0000'), 'too early')
+        self.assertEqual(lib.s_check_date('2020-2'), '00000000')
+
+    def test_format(self):
+        """
+        German month names without setting a locale
+        """
+        self.assertEqual(
+            [lib.s_format_month(datetime.date(2020, i_month, 1))[:3]
+             for i_month in range(1, 13)],
+            ['Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun', 'Jul', 'Aug',
+             'Sep', 'Okt', 'Nov', 'Dez'])
+        self.assertEqual(
+            lib.s_format_day(datetime.date(2021, 10, 3)), '03. Oktober 2021')
+        self.assertEqual(
+            lib.ls_format_dates(['2020-03-01', '2020-03', '', 'x', None]),
+            ['01. März 2020', 'März 2020', None, None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,8 @@
 test class ErrorReports in metadata_check_reports
 """
 
+import os
+import tempfile
 import unittest
 import lib
 
@@ -44,6 +46,97 @@ class TestMetadataList2(unittest.TestCase):
         result = lib.s_icons(['#audio', '#paywall'])
         self.assertEqual(result, s_output('&#xf130;&nbsp;&#xf023;&nbsp;'))
 
+    def test_insert_entry(self):
+        """
+        entries are inserted in the order of dates, sections in the
+        order of levels and labels (records of unknown regions first)
+        """
+
+        def s_entry(s_title: str, s_date: str) -> str:
+            """ entry of list2 with the given title and date """
+            return lib.s_format_entry(
+                s_title, None, None, 'HNA (Kassel)', s_date)
+
+        ls_page = [
+            '<body>\n<h1>Medienbeiträge</h1>\n',
+            '<h3>None</h3>\n<p>\n',
+            s_entry('z', '2020') + '</p>\n',
+            '<h3>Deutschland</h3>\n<p>\n',
+            s_entry('a', '2021-03-13') + '</p>\n',
+            '<h3>Bayern</h3>\n<p>\n',
+            s_entry('b', '2022') + '<br />\n',
+            s_entry('c', '2021-09-03') + '<br />\n',
+            s_entry('d', None) + '</p>\n',
+            '<h3>Kassel</h3>\n<p>\n',
+            s_entry('e', '2019') + '</p>\n',
+            '</body>\n']
+        di_levels = {'Deutschland': 1, 'Bayern': 2, 'Hessen': 2}
+        with tempfile.TemporaryDirectory() as s_folder:
+            s_filename = os.path.join(s_folder, 'ma_list2.htm')
+            with open(s_filename, 'w', encoding='utf-8') as o_file:
+                o_file.writelines(ls_page)
+            for t_section, s_date, b_new in [
+                    ((1, 'Deutschland'), '2021-03-13', False),
+                    ((2, 'Bayern'), '2021-09', False),
+                    ((2, 'Bayern'), '2021-09-03', False),
+                    ((2, 'Bayern'), None, False),
+                    ((2, 'Hessen'), '2020', True),
+                    ((3, 'Würzburg'), '2020', True)]:
+                self.assertEqual(lib.b_insert_entry(
+                    s_filename, t_section, s_date,
+                    s_entry(t_section[1] + str(s_date), s_date),
+                    di_levels), b_new)
+            with open(s_filename, encoding='utf-8') as o_file:
+                s_page = o_file.read()
+        self.assertEqual(s_page, ''.join(ls_page[:4] + [
+            s_entry('a', '2021-03-13') + '<br />\n',
+            s_entry('Deutschland2021-03-13', '2021-03-13') + '</p>\n',
+            '<h3>Bayern</h3>\n<p>\n',
+            s_entry('b', '2022') + '<br />\n',
+            s_entry('c', '2021-09-03') + '<br />\n',
+            s_entry('Bayern2021-09-03', '2021-09-03') + '<br />\n',
+            s_entry('Bayern2021-09', '2021-09') + '<br />\n',
+            s_entry('d', None) + '<br />\n',
+            s_entry('BayernNone', None) + '</p>\n',
+            '<h3>Hessen</h3>\n<p>\n',
+            s_entry('Hessen2020', '2020') + '</p>\n',
+            '<h3>Kassel</h3>\n<p>\n',
+            s_entry('e', '2019') + '</p>\n',
+            '<h3>Würzburg</h3>\n<p>\n',
+            s_entry('Würzburg2020', '2020') + '</p>\n',
+            '</body>\n']))
+
+    def test_insert_duplicate(self):
+        """
+        an entry already listed in its section (or its url) is not
+        inserted again, the file is not changed
+        """
+        s_entry = lib.s_format_entry(
+            'a', None, 'https://a.de/1', 'HNA (Kassel)', '2021')
+        ls_page = [
+            '<body>\n<h3>Hessen</h3>\n<p>\n', s_entry + '</p>\n',
+            '</body>\n']
+        with tempfile.TemporaryDirectory() as s_folder:
+            s_filename = os.path.join(s_folder, 'ma_list2.htm')
+            with open(s_filename, 'w', encoding='utf-8') as o_file:
+                o_file.writelines(ls_page)
+            for s_other in [s_entry, lib.s_format_entry(
+                    'b', None, 'https://a.de/1', 'HNA', '2022')]:
+                self.assertIsNone(lib.b_insert_entry(
+                    s_filename, (2, 'Hessen'), '2022', s_other,
+                    {'Hessen': 2}))
+            with open(s_filename, encoding='utf-8') as o_file:
+                self.assertEqual(o_file.read(), ''.join(ls_page))
+
+            # the same url in another section or another url is inserted
+
+            self.assertTrue(lib.b_insert_entry(
+                s_filename, (3, 'Kassel'), '2021', s_entry, {'Hessen': 2}))
+            self.assertFalse(lib.b_insert_entry(
+                s_filename, (2, 'Hessen'), '2021', lib.s_format_entry(
+                    'a', None, 'https://a.de/10', 'HNA', '2021'),
+                {'Hessen': 2}))
+
 
 if __name__ == '__main__':
     unittest.main()
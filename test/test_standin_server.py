@@ -0,0 +1,52 @@
+"""
+test record and replay of the stand-in server
+"""
+
+import os
+import tempfile
+import unittest
+
+import lib
+from test.standin_server import StandinServer, Recording
+
+
+class TestRecording(unittest.TestCase):
+    """
+    test class
+    """
+
+    def test_replay(self):
+        """
+        replayed urls are checked with the same results as recorded
+        """
+        o_pool = lib.HttpPool()
+        self.addCleanup(o_pool.close_all)
+        o_recording = Recording()
+        with StandinServer() as o_server:
+            ls_urls = [o_server.s_url(s_path) for s_path in (
+                '/?etag=v1', '/?redirect=2', '/?status=404',
+                '/?nohead=1&size=1000', '/?reset=1')]
+            lt_expected = [
+                lib.t_probe_url(s_url, o_pool=o_pool)[:3]
+                for s_url in ls_urls]
+            o_recording.record(ls_urls)
+        self.assertEqual(len(o_recording.ls_urls), 7)
+
+        s_filename = os.path.join(tempfile.mkdtemp(), 'recording.json')
+        o_recording.save(s_filename)
+        o_recording = Recording.o_load(s_filename)
+        os.remove(s_filename)
+        os.rmdir(os.path.dirname(s_filename))
+
+        with StandinServer(o_recording) as o_server:
+            self.assertEqual(
+                [lib.t_probe_url(o_server.s_url_for(s_url), o_pool=o_pool)[:3]
+                 for s_url in ls_urls],
+                lt_expected)
+            self.assertEqual(lib.t_probe_url(
+                o_server.s_url_for(ls_urls[0]),
+                ds_headers={'If-None-Match': '"v1"'}, o_pool=o_pool)[0], 304)
+
+
+if __name__ == '__main__':
+    unittest.main()